@@ -1,13 +1,10 @@
 from dotenv import load_dotenv
 import os
+import tempfile
+from functools import partial
+from typing import Optional
 import streamlit as st
-from core.runner import run_plugin
-import plugins.youtube
-import plugins.video
-import plugins.audio
-import plugins.image
-import plugins.text
-from openai import OpenAI
+from core.jobs import Job, JobManager
 
 import logging
 
@@ -17,17 +14,124 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s %(name)s | %(message)s",
 )
 
-# .env 로드 및 OpenAI 키 설정
+# .env 로드
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # Streamlit 페이지 설정
 st.set_page_config(page_title="Universal File Converter", layout="wide")
 st.title("Universal File Converter")
 
-# YouTube 탭 결과를 세션에 저장할 공간 초기화
-if "yt_outputs" not in st.session_state:
-    st.session_state.yt_outputs = {}
+POLL_SECONDS = 1.0
+TEXT_OUTPUTS = {"summary": "Summary", "text": "OCR Result", "transcript": "Transcript"}   # 화면에 텍스트로 보여줄 출력
+
+
+@st.cache_resource
+def job_manager() -> JobManager:
+    # 프로세스에 하나: 모든 세션이 같은 작업 스레드 풀을 쓴다
+    return JobManager()
+
+
+@st.cache_resource
+def shared_resources():
+    # Whisper 모델 레지스트리와 LLM 게이트웨이(클라이언트)를 한 벌만 두고 모든 세션이 같이 쓴다
+    from core.llm import get_gateway
+    from core.models import whisper_registry
+    return whisper_registry(), get_gateway()
+
+
+shared_resources()
+
+
+def submit_job(tab: str, plugin: str, payload: dict) -> None:
+    # 세션에는 job id만 저장한다 (결과는 JobManager가 경로/텍스트 핸들로 들고 있음)
+    st.session_state[f"{tab}_job"] = job_manager().submit(plugin, payload)
+
+
+def submit_transcript(tab: str, path: str) -> None:
+    st.session_state[f"{tab}_job"] = job_manager().submit_transcript(path)
+
+
+def current_job(tab: str) -> Optional[Job]:
+    return job_manager().get(st.session_state.get(f"{tab}_job"))
+
+
+def job_running(tab: str) -> bool:
+    job = current_job(tab)
+    return job is not None and job.running
+
+
+def save_upload(tab: str, uploaded) -> Optional[str]:
+    """
+    업로드 파일을 세션마다 따로 만든 임시 폴더에 새 업로드(file_id)일 때만 쓴다.
+    rerun(진행률 폴링 포함)마다 다시 쓰지 않으므로 백그라운드 작업이 읽는 중인 파일을 건드리지 않고,
+    같은 이름의 파일을 올린 다른 세션과도 경로가 겹치지 않는다.
+    """
+    if uploaded is None:
+        return None
+    saved = st.session_state.get(f"{tab}_upload")
+    if saved and saved[0] == uploaded.file_id and os.path.exists(saved[1]):
+        return saved[1]
+    path = os.path.join(tempfile.mkdtemp(prefix=f"uc-{tab}-"), os.path.basename(uploaded.name))
+    with open(path, "wb") as out:
+        out.write(uploaded.getbuffer())
+    st.session_state[f"{tab}_upload"] = (uploaded.file_id, path)
+    return path
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def download_button(label: str, path: Optional[str], key: str, name: str) -> None:
+    if not path or not os.path.exists(path):
+        st.warning(f"No file generated for '{name}'.")
+        return
+    # 내용은 사용자가 버튼을 눌렀을 때만 읽는다 (rerun마다 파일을 열지 않음)
+    st.download_button(label, data=partial(read_file, path), file_name=os.path.basename(path), key=key)
+
+
+def render_outputs(tab: str, outputs: dict) -> None:
+    for name, value in outputs.items():
+        if name in TEXT_OUTPUTS:
+            st.subheader(TEXT_OUTPUTS[name])
+            st.text_area(name, value, height=200, key=f"{tab}_{name}_text", label_visibility="collapsed")
+            continue
+        # to-image는 쪽 이미지 목록, fan-out은 {규격: 경로}를 돌려준다
+        if isinstance(value, dict):
+            files = [(f"Download {name}[{spec}]", p) for spec, p in value.items()]
+        elif isinstance(value, list):
+            files = [(f"Download {os.path.basename(p) if len(value) > 1 and p else name}", p) for p in value]
+        else:
+            files = [(f"Download {name}", value)]
+        for i, (label, path) in enumerate(files):
+            download_button(label, path, key=f"dl_{tab}_{name}_{i}", name=name)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def job_progress(tab: str) -> None:
+    # 진행 중인 작업만 주기적으로 다시 그린다 (나머지 화면은 그대로)
+    job = current_job(tab)
+    if job is None or not job.running:
+        st.rerun()   # 끝났으면 전체를 다시 그려 결과를 보여주고 폴링을 멈춘다
+    steps = f" ({job.done_steps}/{job.total_steps})" if job.total_steps else ""
+    label = f"Running {job.plugin}: {job.step}{steps}" if job.step else f"{job.plugin}: {job.status}"
+    st.progress(job.progress, text=label)
+    if job.segments:
+        st.text_area("Transcript", job.transcript(), height=300)   # 실시간 전사: 지금까지 나온 세그먼트
+
+
+def show_job(tab: str) -> None:
+    job = current_job(tab)
+    if job is None:
+        return
+    if job.running:
+        job_progress(tab)
+    elif job.status == "failed":
+        st.error(f"Error: {job.error}")
+    else:
+        render_outputs(tab, job.outputs)
+
 
 tabs = st.tabs(["YouTube", "Video", "Audio", "Image", "Text"])
 
@@ -42,193 +146,84 @@ with tabs[0]:
     audio_format = st.selectbox("Audio Format", ["mp3", "wav", "flac"], index=0)
     summary_length = st.selectbox("Summary Length", ["short", "detailed"], index=0)
 
-    if st.button("Run YouTube"):
-        payload = {
+    if st.button("Run YouTube", disabled=job_running("yt")):
+        submit_job("yt", "youtube", {
             "url": url,
             "actions": actions,
             "video_quality": video_quality,
             "audio_format": audio_format,
             "summary_length": summary_length,
-        }
-        result = run_plugin("youtube", payload)
-        if result.success:
-            st.session_state.yt_outputs = result.outputs
-        else:
-            st.error(f"Error: {result.outputs}")
-
-    # YouTube 탭 결과 렌더링
-    for name, path in st.session_state.yt_outputs.items():
-        if name == "summary":
-            st.subheader("Summary")
-            st.text_area("", path, height=200)
-        else:
-            if not path or not os.path.exists(path):
-                st.warning(f"No file generated for '{name}'.")
-                continue
-            file_name = os.path.basename(path)
-            with open(path, "rb") as f:
-                st.download_button(f"Download {name}", data=f, file_name=file_name, key=f"yt_{name}")
+        })
+    show_job("yt")
 
 # --- Video 탭 ---
 with tabs[1]:
     st.header("Video Converter")
     video_file = st.file_uploader("Upload Video", type=["mp4", "mov", "avi"])
-    if video_file:
-        st.session_state.video_path = f"temp_video_{video_file.name}"
-        with open(st.session_state.video_path, "wb") as out:
-            out.write(video_file.getbuffer())
+    video_path = save_upload("video", video_file)
 
     actions_v = st.multiselect("Actions", ["audio", "summary"], default=["audio"])
     audio_format_v = st.selectbox("Audio Format", ["mp3", "wav"], key="afv")
     summary_length_v = st.selectbox("Summary Length", ["short", "detailed"], key="slv")
 
-        # 1) 실행 결과를 세션에 저장하도록 변경
-    if st.button("Run Video") and video_file:
-        payload = {
-            "input_path": st.session_state.video_path,
+    if st.button("Run Video", disabled=job_running("video")) and video_path:
+        submit_job("video", "video", {
+            "input_path": video_path,
             "actions": actions_v,
             "audio_format": audio_format_v,
             "summary_length": summary_length_v,
-        }
-        result = run_plugin("video", payload)
-        if result.success:
-            st.session_state.video_outputs = result.outputs
-        else:
-            st.error(f"Error: {result.outputs}")
-
-    # 2) 저장된 결과를 렌더링 (파일 vs 텍스트 구분)
-    if "video_outputs" in st.session_state:
-        outputs = st.session_state.video_outputs
-
-        # Summary 텍스트
-        if "summary" in outputs:
-            st.subheader("Summary")
-            st.text_area("", outputs["summary"], height=200)
-
-        # Audio / 기타 파일
-        if "audio" in outputs:
-            audio_path = outputs["audio"]
-            if os.path.exists(audio_path):
-                with open(audio_path, "rb") as f:
-                    st.download_button("Download audio", data=f, file_name=os.path.basename(audio_path))
-            else:
-                st.warning("No audio file generated.")
+        })
+    show_job("video")
+
+    if st.button("Live Transcript", key="live_video", disabled=job_running("video_live")) and video_path:
+        submit_transcript("video_live", video_path)
+    show_job("video_live")
 
 # --- Audio 탭 ---
 with tabs[2]:
     st.header("Audio Converter")
     audio_file = st.file_uploader("Upload Audio", type=["mp3", "wav", "flac"])
-    if audio_file:
-        st.session_state.audio_path = f"temp_audio_{audio_file.name}"
-        with open(st.session_state.audio_path, "wb") as out:
-            out.write(audio_file.getbuffer())
+    audio_path = save_upload("audio", audio_file)
 
     actions_a = st.multiselect("Actions", ["convert", "summary"], default=["convert"])
     target_format_a = st.selectbox("Target Format", ["mp3", "wav", "flac"], key="tfa")
     summary_length_a = st.selectbox("Summary Length", ["short", "detailed"], key="sla")
 
-        # 1) Run Audio 를 누르면 결과를 세션에 저장
-    if st.button("Run Audio") and audio_file:
-        payload = {
-            "input_path": st.session_state.audio_path,
+    if st.button("Run Audio", disabled=job_running("audio")) and audio_path:
+        submit_job("audio", "audio", {
+            "input_path": audio_path,
             "actions": actions_a,
             "target_format": target_format_a,
             "summary_length": summary_length_a,
-        }
-        result = run_plugin("audio", payload)
-        if result.success:
-            st.session_state.audio_outputs = result.outputs
-        else:
-            st.error(f"Error: {result.outputs}")
-
-    # 2) 저장된 결과를 렌더링 (Summary → TextArea, 나머지 → Download Button)
-    if "audio_outputs" in st.session_state:
-        outputs = st.session_state.audio_outputs
-
-        # Summary 텍스트
-        if "summary" in outputs:
-            st.subheader("Summary")
-            st.text_area("", outputs["summary"], height=200)
-
-        # 변환된 오디오 파일 등 다운로드 버튼
-        for name, path in outputs.items():
-            if name == "summary":
-                continue
-
-            if path and os.path.exists(path):
-                with open(path, "rb") as f:
-                    st.download_button(
-                        f"Download {name}",
-                        data=f,
-                        file_name=os.path.basename(path),
-                        key=f"dl_audio_{name}"
-                    )
-            else:
-                st.warning(f"No file generated for '{name}'.")
+        })
+    show_job("audio")
+
+    if st.button("Live Transcript", key="live_audio", disabled=job_running("audio_live")) and audio_path:
+        submit_transcript("audio_live", audio_path)
+    show_job("audio_live")
 
 # --- Image 탭 ---
 with tabs[3]:
     st.header("Image Converter")
     image_file = st.file_uploader("Upload Image", type=["png", "jpg", "jpeg", "webp"])
-    if image_file:
-        st.session_state.image_path = f"temp_image_{image_file.name}"
-        with open(st.session_state.image_path, "wb") as out:
-            out.write(image_file.getbuffer())
+    image_path = save_upload("image", image_file)
 
     actions_i = st.multiselect("Actions", ["ocr", "to-pdf", "to-docx", "convert"], default=["ocr"])
     target_format_i = st.selectbox("Target Format", ["png", "jpeg", "webp"], key="tfi")
 
-    if st.button("Run Image") and image_file:
-        # 1) 실행 후 결과를 세션에 저장
-        payload = {
-            "input_path": st.session_state.image_path,
+    if st.button("Run Image", disabled=job_running("image")) and image_path:
+        submit_job("image", "image", {
+            "input_path": image_path,
             "actions": actions_i,
             "target_format": target_format_i,
-        }
-        result = run_plugin("image", payload)
-        if result.success:
-            st.session_state.image_outputs = result.outputs
-        else:
-            st.error(f"Error: {result.outputs}")
-
-        # 2) 저장된 결과 렌더링
-    if "image_outputs" in st.session_state:
-        outputs = st.session_state.image_outputs
-
-        # 2-1) OCR 결과(text) 출력 (plugin이 "text" 키를 쓰는 경우)
-        if "text" in outputs:
-            st.subheader("OCR Result")
-            st.text_area("", outputs["text"], height=200)
-        # 만약 plugin이 outputs["ocr"] 키를 쓴다면, 아래 주석을 해제하세요.
-        # elif "ocr" in outputs:
-        #     st.subheader("OCR Result")
-        #     st.text_area("", outputs["ocr"], height=200)
-
-        # 2-2) 나머지 파일들 다운로드 버튼
-        for name, path in outputs.items():
-            if name in ("text", "ocr"):
-                # 이미 텍스트로 처리했으니 건너뜁니다
-                continue
-
-            if path and os.path.exists(path):
-                with open(path, "rb") as f:
-                    st.download_button(
-                        f"Download {name}",
-                        data=f,
-                        file_name=os.path.basename(path),
-                        key=f"dl_image_{name}"
-                    )
-            else:
-                st.warning(f"No file generated for '{name}'.")
+        })
+    show_job("image")
 
 # --- Text 탭 ---
 with tabs[4]:
     st.header("Text Converter")
     text_file = st.file_uploader("Upload Text File", type=["txt", "md"])
-    if text_file:
-        st.session_state.text_path = f"temp_text_{text_file.name}"
-        with open(st.session_state.text_path, "wb") as out:
-            out.write(text_file.getbuffer())
+    text_path = save_upload("text", text_file)
 
     actions_t = st.multiselect(
         "Actions", ["summarize", "tts", "to-pdf", "to-image"], default=["summarize"]
@@ -236,40 +231,11 @@ with tabs[4]:
     summary_length_t = st.selectbox("Summary Length", ["short", "detailed"], key="slt")
     tts_format_t = st.selectbox("TTS Format", ["mp3", "wav"], key="tft")
 
-    if st.button("Run Text") and text_file:
-        # 1) 실행 후 결과를 세션에 저장
-        payload = {
-            "input_path": st.session_state.text_path,
+    if st.button("Run Text", disabled=job_running("text")) and text_path:
+        submit_job("text", "text", {
+            "input_path": text_path,
             "actions": actions_t,
             "summary_length": summary_length_t,
             "tts_format": tts_format_t,
-        }
-        result = run_plugin("text", payload)
-        if result.success:
-            st.session_state.text_outputs = result.outputs
-        else:
-            st.error(f"Error: {result.outputs}")
-
-        # 2) 저장된 결과 렌더링
-    if "text_outputs" in st.session_state:
-        outputs = st.session_state.text_outputs
-
-        # summary 키로 바뀌었으니 여기서 잡아줍니다
-        if "summary" in outputs:
-            st.subheader("Summary")
-            st.text_area("", outputs["summary"], height=200)
-
-        # 나머지(‘audio’, ‘pdf’, ‘image’) 파일 다운로드
-        for name, path in outputs.items():
-            if name == "summary":
-                continue
-            if path and os.path.exists(path):
-                with open(path, "rb") as f:
-                    st.download_button(
-                        f"Download {name}",
-                        data=f,
-                        file_name=os.path.basename(path),
-                        key=f"dl_text_{name}"
-                    )
-            else:
-                st.warning(f"No file generated for '{name}'.")
+        })
+    show_job("text")
@@ -0,0 +1,61 @@
+# benchmarks/bench_startup.py
+"""
+서브커맨드별 콜드 스타트(프로세스 시작 → 플러그인 준비) 시간 측정.
+
+  eager : 예전 방식 — cli가 다섯 플러그인과 그 무거운 의존성을 모두 import
+  lazy  : 현재 방식 — 해당 서브커맨드의 플러그인 모듈만 import
+
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 플러그인 모듈들이 예전에 최상단에서 import 하던 라이브러리들 (설치되지 않은 것은 건너뜀)
+LEGACY_IMPORTS = [
+    "torch", "whisper", "openai", "yt_dlp", "streamlit",
+    "PIL.Image", "pytesseract", "cv2", "img2pdf", "docx", "gtts", "fpdf",
+]
+SUBCOMMANDS = ["youtube", "video", "audio", "image", "text"]
+
+
+def _snippet(sub: str, eager: bool) -> str:
+    lines = ["import cli", "from core.runner import load_plugin"]
+    if eager:
+        lines.append("import importlib")
+        lines.append(f"for m in {LEGACY_IMPORTS!r}:\n    try:\n        importlib.import_module(m)\n    except ImportError:\n        pass")
+        lines.append(f"for p in {SUBCOMMANDS!r}:\n    load_plugin(p)")
+    else:
+        lines.append(f"load_plugin({sub!r})")
+    return "\n".join(lines)
+
+
+def _time(code: str, repeat: int) -> float:
+    env = dict(os.environ, OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "bench"))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'subcommand':<10} {'eager (s)':>10} {'lazy (s)':>10} {'speedup':>8}")
+    for sub in SUBCOMMANDS:
+        eager = _time(_snippet(sub, eager=True), args.repeat)
+        lazy = _time(_snippet(sub, eager=False), args.repeat)
+        print(f"{sub:<10} {eager:>10.3f} {lazy:>10.3f} {eager / lazy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_text_pdf.py
+"""
+큰 텍스트 파일 -> PDF 변환 속도와 메모리: 쪽 수, 쪽/초, 최대 RSS 증가량을 출력한다.
+입력은 짧은 줄/긴 줄/한글이 섞인 로그 형태의 합성 텍스트.
+
+    python benchmarks/bench_text_pdf.py [--mb 50] [--font /path/to/font.ttf]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.textpdf import render_text_pdf  # noqa: E402
+
+LINES = [
+    "2024-05-01 12:00:{:02d} INFO request handled in 12ms path=/api/items/{}",
+    "2024-05-01 12:00:{:02d} WARN 재시도 {} 회: 연결이 끊어졌습니다",
+    "2024-05-01 12:00:{:02d} DEBUG payload " + "lorem ipsum dolor sit amet " * 12 + "{}",
+    "",
+]
+
+
+def _write_input(path: str, mb: int) -> None:
+    target = mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        i = 0
+        while f.tell() < target:
+            f.write(LINES[i % len(LINES)].format(i % 60, i) + "\n")
+            i += 1
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # Linux: KB
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=50)
+    parser.add_argument("--font", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, out = os.path.join(tmp, "big.txt"), os.path.join(tmp, "big.pdf")
+        _write_input(src, args.mb)
+        before = _max_rss_mb()
+        with open(src, encoding="utf-8") as f:
+            stats = render_text_pdf(f, out, args.font)
+        print(f"input     {os.path.getsize(src) / 1e6:.1f} MB")
+        print(f"output    {os.path.getsize(out) / 1e6:.1f} MB, {stats['pages']} pages")
+        print(f"time      {stats['seconds']:.1f} s ({stats['pages_per_sec']:.0f} pages/s)")
+        print(f"max RSS   +{_max_rss_mb() - before:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
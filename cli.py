@@ -1,14 +1,10 @@
 # cli.py (프로젝트 최상단에 덮어쓰기)
 import os
 import typer
+from core.ytinfo import is_collection_url
 from core.runner import run_plugin
 
-# 플러그인 등록(import) — register_plugin() 실행을 위해
-import plugins.youtube
-import plugins.video
-import plugins.audio
-import plugins.image
-import plugins.text
+# 플러그인 모듈은 core.runner에 선언만 되어 있고, 해당 서브커맨드가 실행될 때 import 됩니다
 
 app = typer.Typer(help="Universal File Converter CLI", add_completion=False, no_args_is_help=False)
 
@@ -20,9 +16,12 @@ def main(
     video_quality: str      = typer.Option("720p", "--video-quality",  help="Video resolution"),
     audio_format:  str      = typer.Option("mp3",  "--audio-format",   help="Audio format"),
     summary_length:str      = typer.Option("short","--summary-length",help="Summary length: short or detailed"),
+    workers: int            = typer.Option(4, "--workers",          help="Playlist/channel URLs: videos processed concurrently (0 = one by one)"),
+    manifest: str           = typer.Option(None, "--manifest",      help="Playlist/channel URLs: progress file used to resume"),
 ):
     """
     YouTube URL로부터 비디오 다운로드, 오디오 추출, 자동 요약 수행
+    (재생목록/채널 URL이면 각 영상을 처리하고 결과를 JSON 한 줄씩 출력, 다시 실행하면 끝난 영상은 건너뜀)
     (서브커맨드 없이 호출될 때 실행됩니다)
     """
     # --- 서브커맨드(video/audio/image/text)가 지정된 경우, 여기서 빠져나갑니다 ---
@@ -40,6 +39,20 @@ def main(
         "audio_format":   audio_format,
         "summary_length": summary_length,
     }
+    if is_collection_url(url):
+        import json
+        from core.batch import BatchStats
+        from plugins.youtube import ingest_playlist
+
+        del payload["url"]
+        stats = BatchStats()
+        for record in ingest_playlist(url, payload, manifest, workers=workers, stats=stats):
+            typer.echo(json.dumps(record, ensure_ascii=False))
+        typer.echo(json.dumps({"report": stats.report()}), err=True)
+        if stats.failed:
+            raise typer.Exit(code=1)
+        return
+
     result = run_plugin("youtube", payload)
     if result.success:
         for name, path in result.outputs.items():
@@ -95,9 +108,12 @@ def audio(
 
 @app.command("image")
 def image(
-    input_path: str = typer.Option(..., help="Path to local image file"),
-    actions: list[str] = typer.Option(..., "--actions", help="Select one or more: ocr, to-pdf, to-docx, convert"),
+    input_path: str = typer.Option(..., help="Path to local image file, PDF/TIFF, or a folder of images to bundle"),
+    actions: list[str] = typer.Option(..., "--actions", help="Select one or more: ocr, to-pdf, to-docx, convert, fan-out"),
+    inputs: list[str] = typer.Option([], "--input", help="More images bundled after --input-path into one PDF/DOCX, repeatable"),
     target_format: str = typer.Option("png", help="Target image format, e.g. png, jpeg, webp"),
+    outputs: list[str] = typer.Option([], "--output", help="fan-out outputs: fmt, fmt@N (longest side) or fmt@WxH, repeatable"),
+    quality: int = typer.Option(85, help="JPEG/WebP quality for fan-out outputs"),
 ):
     """
     로컬 이미지 파일의 OCR, 문서 변환, 포맷 변환 수행
@@ -105,12 +121,19 @@ def image(
     payload = {
         "input_path":    input_path,
         "actions":       actions,
+        "inputs":        inputs,
         "target_format": target_format,
+        "outputs":       outputs,
+        "quality":       quality,
     }
     result = run_plugin("image", payload)
     if result.success:
         for name, path in result.outputs.items():
-            typer.echo(f"{name}: {path}")
+            if isinstance(path, dict):
+                for spec, out in path.items():
+                    typer.echo(f"{name}[{spec}]: {out}")
+            else:
+                typer.echo(f"{name}: {path}")
     else:
         typer.secho(f"❌ Error: {result.outputs}", fg=typer.colors.RED)
 
@@ -133,10 +156,110 @@ def text(
     result = run_plugin("text", payload)
     if result.success:
         for name, path in result.outputs.items():
-            typer.echo(f"{name}: {path}")
+            if isinstance(path, list):
+                for page in path:
+                    typer.echo(f"{name}: {page}")
+            else:
+                typer.echo(f"{name}: {path}")
     else:
         typer.secho(f"❌ Error: {result.outputs}", fg=typer.colors.RED)
 
+@app.command("transcribe")
+def transcribe(
+    input_path: str = typer.Option(..., help="Path to local audio or video file"),
+    model: str = typer.Option("base", help="Whisper model name, e.g. tiny, base, small"),
+    window: float = typer.Option(30.0, help="Decode window length in seconds"),
+):
+    """
+    로컬 오디오/비디오 파일을 Whisper로 전사하면서 세그먼트를 실시간으로 출력
+    """
+    from core.transcribe import format_timestamp, stream_transcript
+
+    try:
+        for seg in stream_transcript(input_path, model_name=model, window_seconds=window):
+            typer.echo(f"[{format_timestamp(seg.start)} → {format_timestamp(seg.end)}] {seg.text}")
+    except Exception as e:
+        typer.secho(f"❌ Error: {e}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+@app.command("batch")
+def batch(
+    plugin: str = typer.Option(..., "--plugin", help="youtube, video, audio, image, text"),
+    source: str = typer.Option(..., "--source", help="Directory, glob pattern or JSONL manifest of payloads"),
+    actions: list[str] = typer.Option(None, "--actions", help="Default actions for every item"),
+    option: list[str] = typer.Option(None, "--option", help="Extra payload option as key=value, e.g. target_format=png"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", help="Worker processes (0 = run in this process)"),
+    max_pending: int = typer.Option(0, "--max-pending", help="Max queued items (0 = workers x 2)"),
+    timeout: float = typer.Option(0, "--timeout", help="Per-item timeout in seconds (0 = none)"),
+):
+    """
+    디렉터리 / glob / JSONL 매니페스트의 여러 항목을 워커 프로세스 풀에서 일괄 처리
+    (항목별 결과는 JSON 한 줄씩 stdout으로, 전체 처리량 요약은 stderr로 출력)
+    """
+    import json
+    from core.batch import BatchStats, collect_items, run_batch
+
+    options: dict = {"actions": actions} if actions else {}
+    for pair in option or []:
+        k, sep, v = pair.partition("=")
+        if not sep:
+            typer.secho(f"❌ Invalid --option '{pair}', expected key=value", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+        options[k] = v
+
+    stats = BatchStats()
+    records = run_batch(
+        collect_items(plugin, source, options),
+        workers=workers,
+        max_pending=max_pending or None,
+        timeout=timeout or None,
+        stats=stats,
+        warm=[plugin],
+    )
+    for record in records:
+        typer.echo(json.dumps(record, ensure_ascii=False))
+    typer.echo(json.dumps({"report": stats.report()}), err=True)
+    if stats.failed:
+        raise typer.Exit(code=1)
+
+@app.command("ocr")
+def ocr(
+    source: str = typer.Option(..., "--source", help="Directory or glob pattern of images"),
+    workers: int = typer.Option(os.cpu_count() or 1, "--workers", help="OCR worker processes"),
+    lang: str = typer.Option("eng+kor", "--lang", help="Tesseract languages"),
+    max_pending: int = typer.Option(0, "--max-pending", help="Max queued images (0 = workers x 2)"),
+):
+    """
+    여러 이미지를 OCR 워커 풀에서 처리 (워커마다 언어 모델을 한 번만 로드)
+    (이미지별 텍스트와 소요 시간은 JSON 한 줄씩 stdout으로, 전체 처리량은 stderr로 출력)
+    """
+    import json
+    import time
+    from core.batch import collect_items
+    from core.ocr import OcrPool
+
+    start = time.perf_counter()
+    pages = failed = 0
+    busy = 0.0
+    paths = (item.payload["input_path"] for item in collect_items("image", source, {}))
+    with OcrPool(workers=workers, lang=lang, max_pending=max_pending or None) as pool:
+        for result in pool.map(paths):
+            pages += 1
+            failed += result.error is not None
+            busy += result.seconds
+            typer.echo(json.dumps(result._asdict(), ensure_ascii=False))
+    elapsed = time.perf_counter() - start
+    report = {
+        "pages": pages,
+        "failed": failed,
+        "elapsed": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 3) if elapsed > 0 else 0.0,
+        "mean_page_seconds": round(busy / pages, 4) if pages else 0.0,
+    }
+    typer.echo(json.dumps({"report": report}), err=True)
+    if failed:
+        raise typer.Exit(code=1)
+
 def main():
     app()
 
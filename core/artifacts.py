@@ -0,0 +1,205 @@
+# core/artifacts.py
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:   # Windows: 프로세스 간 잠금 없이 스레드 잠금만
+    fcntl = None
+
+INDEX_NAME = ".yt-artifacts.json"
+LOCK_NAME = ".yt-artifacts.lock"
+
+
+class ArtifactStore:
+    """
+    YouTube에서 받은 스트림과 그로부터 만든 파일을 (video id, 포맷 셀렉터) 키로 보관하는 로컬 저장소.
+    - 같은 키는 한 번만 만든다 (동시에 요청돼도 한 스레드만 다운로드)
+    - ttl초가 지난 항목은 없는 것으로 보고 다시 받는다
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 지운다
+    인덱스는 root의 JSON 파일 하나이고, 파일 이름은 `<id>.<셀렉터>.<확장자>` 이다.
+    """
+
+    def __init__(self, root: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        self.root = os.path.abspath(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, str], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    # --- 인덱스 -------------------------------------------------------------
+    def _index_path(self) -> str:
+        return os.path.join(self.root, INDEX_NAME)
+
+    @contextmanager
+    def _index_lock(self):
+        # 인덱스 읽기-수정-쓰기는 배치 워커/재생목록 처리 프로세스들과 겹치지 않게 파일 잠금 안에서 한다
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, LOCK_NAME), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self) -> dict:
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, index: dict) -> None:
+        tmp = f"{self._index_path()}.{uuid.uuid4().hex}.part"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._index_path())
+
+    def _fresh(self, entry: dict) -> bool:
+        if not os.path.isfile(os.path.join(self.root, entry["file"])):
+            return False
+        return self.ttl is None or self._clock() - entry["created"] <= self.ttl
+
+    # --- 조회 / 저장 --------------------------------------------------------
+    def get(self, video_id: str, selector: str) -> Optional[str]:
+        with self._index_lock():
+            index = self._load()
+            entry = index.get(video_id, {}).get(selector)
+            if entry is None or not self._fresh(entry):
+                self.misses += 1
+                return None
+            entry["used"] = self._clock()
+            self._save(index)
+            self.hits += 1
+            return os.path.join(self.root, entry["file"])
+
+    def entries(self, video_id: str) -> dict[str, str]:
+        """video_id로 저장된 (만료되지 않은) 항목들: 셀렉터 -> 파일 경로"""
+        with self._index_lock():
+            index = self._load()
+        return {
+            selector: os.path.join(self.root, entry["file"])
+            for selector, entry in index.get(video_id, {}).items()
+            if self._fresh(entry)
+        }
+
+    def put(self, video_id: str, selector: str, path: str) -> str:
+        """path의 파일을 저장소로 옮기고 저장된 경로를 돌려준다."""
+        ext = os.path.splitext(path)[1]
+        name = f"{video_id}.{selector.replace(':', '-')}{ext}"
+        target = os.path.join(self.root, name)
+        if os.path.abspath(path) != target:
+            shutil.move(path, target)
+        now = self._clock()
+        with self._index_lock():
+            index = self._load()
+            index.setdefault(video_id, {})[selector] = {
+                "file": name, "created": now, "used": now, "size": os.path.getsize(target),
+            }
+            self._save(index)
+        self.evict()
+        return target
+
+    def fetch(self, video_id: str, selector: str, produce: Callable[[], str]) -> str:
+        """저장된 파일이 있으면 그대로, 없으면 produce()로 만든 파일을 저장해 돌려준다."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault((video_id, selector), threading.Lock())
+        with key_lock:
+            path = self.get(video_id, selector)
+            if path is not None:
+                return path
+            return self.put(video_id, selector, produce())
+
+    def staging_dir(self) -> str:
+        # 다운로드/변환 중인 파일은 여기 만들었다가 put()으로 옮긴다
+        path = os.path.join(self.root, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(path)
+        return path
+
+    # --- 정리 ---------------------------------------------------------------
+    def evict(self) -> None:
+        with self._index_lock():
+            index = self._load()
+            items = []
+            for vid, selectors in index.items():
+                for selector, entry in selectors.items():
+                    items.append((entry["used"], vid, selector, entry))
+            total = sum(entry["size"] for *_, entry in items if self._fresh(entry))
+            newest = max((used for used, *_ in items), default=None)
+            changed = False
+            for used, vid, selector, entry in sorted(items, key=lambda i: i[0]):
+                expired = not self._fresh(entry)
+                # 방금 저장/조회한 항목은 혼자 한도를 넘더라도 남긴다
+                over = self.max_bytes is not None and total > self.max_bytes and used != newest
+                if not (expired or over):
+                    continue
+                try:
+                    os.remove(os.path.join(self.root, entry["file"]))
+                except FileNotFoundError:
+                    pass
+                if not expired:
+                    total -= entry["size"]
+                del index[vid][selector]
+                if not index[vid]:
+                    del index[vid]
+                self.evictions += 1
+                changed = True
+            if changed:
+                self._save(index)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def default_store_dir() -> str:
+    # 저장소는 만료/용량 초과 때 파일을 지우므로 사용자 폴더가 아닌 캐시 폴더에 둔다
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.abspath(os.getenv("UC_YT_STORE") or os.path.join(base, "universal-converter", "yt"))
+
+
+def export(path: str, dest_dir: Optional[str] = None) -> str:
+    """
+    저장소의 파일을 dest_dir(기본: 현재 폴더)에 하드 링크(안 되면 복사)해 그 경로를 돌려준다.
+    사용자에게 돌려주는 결과는 저장소가 나중에 지워도 남아 있어야 한다.
+    """
+    target = os.path.abspath(os.path.join(dest_dir or os.getcwd(), os.path.basename(path)))
+    if os.path.exists(target) and os.path.samefile(path, target):
+        return target
+    tmp = f"{target}.{uuid.uuid4().hex}.part"
+    try:
+        os.link(path, tmp)
+    except OSError:
+        shutil.copyfile(path, tmp)   # 다른 파일 시스템 등
+    os.replace(tmp, target)
+    return target
+
+
+_stores: dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def artifact_store() -> ArtifactStore:
+    root = default_store_dir()
+    with _stores_lock:
+        if root not in _stores:
+            ttl_hours = float(os.getenv("UC_YT_STORE_TTL_HOURS", "24"))
+            max_mb = int(os.getenv("UC_YT_STORE_MB", "4096"))
+            _stores[root] = ArtifactStore(root, ttl=ttl_hours * 3600 or None, max_bytes=max_mb * 1024 * 1024)
+        return _stores[root]
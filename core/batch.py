@@ -0,0 +1,251 @@
+# core/batch.py
+
+import glob
+import json
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, NamedTuple, Optional
+from core.runner import SPECS, load_plugin, run_plugin
+
+
+class BatchItem(NamedTuple):
+    index: int
+    plugin: str
+    payload: dict
+    error: Optional[str] = None   # 항목을 만들 수 없었던 이유 (예: 깨진 JSONL 줄) — 실행하지 않고 실패로 기록
+
+
+class BatchStats:
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def add(self, record: dict) -> None:
+        self.total += 1
+        if record["success"]:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            if record.get("timeout"):
+                self.timed_out += 1
+
+    def report(self) -> dict:
+        elapsed = self.elapsed
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "elapsed": round(elapsed, 3),
+            "items_per_sec": round(self.total / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+
+def collect_items(plugin: str, source: str, options: dict) -> Iterator[BatchItem]:
+    """
+    source가 디렉터리면 그 안의 파일들, .jsonl 파일이면 한 줄당 payload 하나,
+    그 외에는 glob 패턴으로 보고 항목을 만든다. options는 모든 항목의 기본값이다.
+    읽을 수 없는 JSONL 줄은 error가 채워진 항목이 되어 실패 레코드로 남고, 나머지 줄은 계속 처리된다.
+    """
+    if os.path.isfile(source) and source.endswith(".jsonl"):
+        with open(source, encoding="utf-8") as f:
+            lines = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+            for i, (n, line) in enumerate(lines):
+                try:
+                    entry = json.loads(line)
+                except ValueError as e:
+                    yield BatchItem(i, plugin, {}, f"{source}:{n}: invalid JSON: {e}")
+                    continue
+                if not isinstance(entry, dict):
+                    yield BatchItem(i, plugin, {}, f"{source}:{n}: expected a JSON object")
+                    continue
+                name = entry.pop("plugin", plugin)
+                yield BatchItem(i, name, {**options, **entry})
+        return
+    if os.path.isdir(source):
+        paths = (e.path for e in sorted(os.scandir(source), key=lambda e: e.name) if e.is_file())
+    else:
+        paths = iter(sorted(glob.glob(source, recursive=True)))
+    for i, path in enumerate(paths):
+        yield BatchItem(i, plugin, {**options, "input_path": path})
+
+
+class Manifest:
+    """
+    처리한 항목의 결과 레코드를 JSONL로 이어 쓴다.
+    같은 매니페스트로 다시 실행하면 이미 성공한 입력은 건너뛴다 (실패한 항목은 다시 시도).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: set[str] = set()
+        self.skipped = 0
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # 중단되면서 잘린 마지막 줄
+                    if record.get("success") and record.get("input"):
+                        self.completed.add(record["input"])
+            with open(path, "rb+") as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")  # 잘린 줄 뒤에 이어 쓰지 않도록
+
+    def pending(self, items: Iterable[BatchItem]) -> Iterator[BatchItem]:
+        for item in items:
+            if _source(item) in self.completed:
+                self.skipped += 1
+                continue
+            yield item
+
+    def write(self, record: dict) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if record.get("success") and record.get("input"):
+                self.completed.add(record["input"])
+
+
+def _warm_worker(plugins: Iterable[str], ffmpeg_threads: int) -> None:
+    # 워커 프로세스마다 한 번만 플러그인을 import 한다 (모델은 core.models 레지스트리에 남는다)
+    # 워커들이 동시에 ffmpeg를 돌리므로 ffmpeg 스레드는 코어를 나눠 쓴다
+    os.environ.setdefault("FFMPEG_THREADS", str(ffmpeg_threads))
+    for name in plugins:
+        try:
+            load_plugin(name)
+        except Exception:
+            pass  # 실패는 항목 실행 시 run_plugin이 에러 결과로 돌려준다
+
+
+class _ItemTimeout(BaseException):
+    # run_plugin의 `except Exception`에 잡히지 않도록 BaseException을 상속
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _ItemTimeout()
+
+
+def run_item(plugin: str, payload: dict, timeout: Optional[float] = None) -> dict:
+    start = time.perf_counter()
+    timed_out = False
+    if timeout and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread():
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            result = run_plugin(plugin, payload)
+        except _ItemTimeout:
+            result, timed_out = None, True
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    elif timeout:
+        # SIGALRM이 없는 플랫폼: 결과만 포기하고 작업 스레드는 끝날 때까지 둔다
+        box = []
+        worker = threading.Thread(target=lambda: box.append(run_plugin(plugin, payload)), daemon=True)
+        worker.start()
+        worker.join(timeout)
+        result, timed_out = (box[0], False) if box else (None, True)
+    else:
+        result = run_plugin(plugin, payload)
+    seconds = round(time.perf_counter() - start, 3)
+    if timed_out:
+        return {"success": False, "outputs": {"error": f"Timed out after {timeout}s"}, "timeout": True, "seconds": seconds}
+    return {"success": result.success, "outputs": result.outputs, "seconds": seconds}
+
+
+def _source(item: BatchItem) -> Optional[str]:
+    return item.payload.get("input_path") or item.payload.get("url")
+
+
+def _record(item: BatchItem, result: dict) -> dict:
+    return {"index": item.index, "plugin": item.plugin, "input": _source(item), **result}
+
+
+def _validate(item: BatchItem) -> Optional[str]:
+    if item.error:
+        return item.error
+    spec = SPECS.get(item.plugin)
+    if spec is None:
+        return f"No plugin '{item.plugin}'"
+    try:
+        spec.schema(**item.payload)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    workers: int = os.cpu_count() or 1,
+    max_pending: Optional[int] = None,
+    timeout: Optional[float] = None,
+    stats: Optional[BatchStats] = None,
+    warm: Iterable[str] = (),
+) -> Iterator[dict]:
+    """
+    항목을 워커 프로세스 풀에 나눠 실행하고, 끝나는 순서대로 결과 레코드를 내보낸다.
+    동시에 제출된 항목 수는 max_pending(기본 workers*2)을 넘지 않는다.
+    warm에 준 플러그인은 워커 시작 시 미리 import 한다.
+    workers=0이면 현재 프로세스에서 순서대로 실행한다.
+    """
+    stats = stats or BatchStats()
+
+    def emit(item: BatchItem, result: dict) -> dict:
+        record = _record(item, result)
+        stats.add(record)
+        return record
+
+    def invalid(item: BatchItem) -> Optional[dict]:
+        error = _validate(item)
+        if error is None:
+            return None
+        return emit(item, {"success": False, "outputs": {"error": error}, "seconds": 0.0})
+
+    if workers <= 0:
+        for item in items:
+            yield invalid(item) or emit(item, run_item(item.plugin, item.payload, timeout))
+        stats.finished = time.perf_counter()
+        return
+
+    max_pending = max_pending or workers * 2
+    pending: dict[Future, BatchItem] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(list(warm), max(1, (os.cpu_count() or 1) // workers))) as pool:
+        for item in items:
+            record = invalid(item)
+            if record is not None:
+                yield record
+                continue
+            while len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield emit(pending.pop(fut), _future_result(fut))
+            pending[pool.submit(run_item, item.plugin, item.payload, timeout)] = item
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield emit(pending.pop(fut), _future_result(fut))
+    stats.finished = time.perf_counter()
+
+
+def _future_result(fut: Future) -> dict:
+    try:
+        return fut.result()
+    except Exception as e:  # 워커 프로세스가 죽은 경우 등
+        return {"success": False, "outputs": {"error": str(e)}, "seconds": 0.0}
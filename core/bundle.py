@@ -0,0 +1,108 @@
+# core/bundle.py
+
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Iterable, Iterator, Optional
+from core.document import PageResult, in_order, merge_pdfs
+from core.ocr import OcrPool, ocr_file, worker_engine
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff")
+# img2pdf가 한 번에 메모리에 올리는 쪽 수 (이 단위로 중간 PDF를 만들고 이어 붙임)
+PDF_GROUP = 32
+
+
+def _natural_key(name: str):
+    # page2.jpg가 page10.jpg보다 앞에 오도록 숫자는 숫자로 비교
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def bundle_inputs(path: str, extra: Iterable[str] = ()) -> Optional[list[str]]:
+    """
+    묶음으로 처리할 이미지 목록. 폴더면 그 안의 이미지를 이름순(숫자는 자연 순서)으로,
+    extra가 있으면 [path, *extra] 순서 그대로. 이미지 하나면 None.
+    """
+    if os.path.isdir(path):
+        names = sorted((n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTS)), key=_natural_key)
+        if not names:
+            raise ValueError(f"No images in {path}")
+        return [os.path.join(path, n) for n in names]
+    extra = list(extra)
+    return [path, *extra] if extra else None
+
+
+def bundle_base(path: str) -> str:
+    # 폴더 scans/ -> scans (폴더 옆에 scans.pdf), 이미지 목록 -> <첫 이미지>_bundle
+    if os.path.isdir(path):
+        return os.path.normpath(path)
+    return os.path.splitext(path)[0] + "_bundle"
+
+
+def bundle_pdf(images: list[str], out: str, group: int = PDF_GROUP) -> str:
+    """
+    이미지들을 한 PDF로. img2pdf는 JPEG을 다시 인코딩하지 않고 그대로 넣는다 (무손실).
+    group장씩 중간 PDF를 만들고 merge_pdfs로 이어 붙이므로 메모리에는 group장 분량만 올라간다.
+    """
+    import img2pdf
+    if len(images) <= group:
+        with open(out, "wb") as f:
+            img2pdf.convert(images, outputstream=f)
+        return os.path.abspath(out)
+    workdir = tempfile.mkdtemp(prefix="uc-bundle-")
+    try:
+        parts = []
+        for i in range(0, len(images), group):
+            part = os.path.join(workdir, f"{i:06d}.pdf")
+            with open(part, "wb") as f:
+                img2pdf.convert(images[i:i + group], outputstream=f)
+            parts.append(part)
+        merge_pdfs(parts, out, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return os.path.abspath(out)
+
+
+def _ocr_image(item: tuple[int, str]) -> PageResult:
+    # OcrPool 워커에서 실행
+    index, path = item
+    start = time.perf_counter()
+    try:
+        return PageResult(index, ocr_file(path, worker_engine()).text, None, round(time.perf_counter() - start, 4))
+    except Exception as e:
+        return PageResult(index, "", None, round(time.perf_counter() - start, 4), str(e))
+
+
+def ocr_images(images: list[str], workers: Optional[int] = None, pool: Optional[OcrPool] = None) -> Iterator[str]:
+    """이미지들을 OCR 워커 풀에서 병렬로 인식하고 텍스트를 입력 순서대로 내보낸다."""
+    owned = pool is None
+    pool = pool or OcrPool(workers=workers)
+    try:
+        for page in in_order(pool.map(enumerate(images), _ocr_image)):
+            if page.error is not None:
+                raise RuntimeError(f"OCR failed on {images[page.index]}: {page.error}")
+            yield page.text
+    finally:
+        if owned:
+            pool.shutdown()
+
+
+def write_text(texts: Iterable[str], out: str) -> str:
+    # 쪽 구분: form feed (여러 쪽 문서 OCR과 같은 형식)
+    with open(out, "w", encoding="utf-8") as f:
+        for text in texts:
+            f.write(text.rstrip() + "\n\f")
+    return os.path.abspath(out)
+
+
+def bundle_docx(texts: Iterable[str], out: str) -> str:
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+    doc = Document()
+    for i, text in enumerate(texts):
+        if i:
+            doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+        doc.add_paragraph(text.strip())
+    doc.save(out)
+    return os.path.abspath(out)
@@ -0,0 +1,220 @@
+# core/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel
+from core.schemas import ExecutionResult
+from core.ytinfo import video_id_from_url
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _dir_digest(path: str) -> str:
+    # 폴더 입력: 안에 든 파일들의 (이름, 내용 해시). 이름도 넣어 순서/구성 변경을 잡는다
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(path)):
+        member = os.path.join(path, name)
+        if os.path.isfile(member):
+            h.update(f"{name}\0{file_digest(member)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_key(plugin: str, payload: dict, schema: type[BaseModel], version: str) -> Optional[str]:
+    """
+    (플러그인, 입력 내용 해시 또는 YouTube video id, 정규화된 옵션, 플러그인 버전)으로 키를 만든다.
+    폴더 입력은 안의 파일들을, inputs(묶음 이미지 목록)는 각 파일 내용을 함께 해시한다.
+    입력을 식별할 수 없으면 None (캐시하지 않음).
+    """
+    try:
+        options = schema(**payload).model_dump()
+    except Exception:
+        return None
+    if "input_path" in options:
+        path = options.pop("input_path")
+        if os.path.isdir(path):
+            source = "dir:" + _dir_digest(path)
+        elif os.path.isfile(path):
+            source = "sha256:" + file_digest(path)
+        else:
+            return None
+        extra = options.pop("inputs", None) or []
+        if not all(os.path.isfile(p) for p in extra):
+            return None
+        if extra:
+            source += "".join(" sha256:" + file_digest(p) for p in extra)
+    elif "url" in options:
+        vid = video_id_from_url(options.pop("url"))
+        if vid is None:
+            return None
+        source = "youtube:" + vid
+    else:
+        return None
+    options["actions"] = sorted(set(options.get("actions") or []))
+    raw = json.dumps([plugin, version, source, options], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    ExecutionResult의 outputs와 산출 파일을 디스크에 저장하는 캐시.
+    전체 크기가 max_bytes를 넘으면 가장 오래 조회되지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 2 * 1024**3):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str, source: Optional[str] = None) -> Optional[ExecutionResult]:
+        """
+        source는 이번 요청의 입력 경로. 키는 입력 내용만 보므로, 같은 내용의 다른 파일(다른 세션의
+        임시 폴더 등)로 저장된 결과는 산출 파일 경로를 이번 입력의 폴더/이름 기준으로 옮겨서 되살린다.
+        """
+        meta_path = os.path.join(self._entry(key), "result.json")
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            artifacts = meta["artifacts"]
+            if isinstance(artifacts, dict):   # 예전 형식: {출력 이름: 저장 파일}
+                artifacts = [([name], stored) for name, stored in artifacts.items()]
+            outputs = meta["outputs"]
+            for where, stored, *digest in artifacts:
+                target = _rebase(_lookup(outputs, where), meta.get("source"), source)
+                outputs = _replace(outputs, where, target)
+                _restore(os.path.join(self._entry(key), stored), target, digest[0] if digest else None)
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        os.utime(meta_path)  # LRU 순서 갱신
+        with self._lock:
+            self.hits += 1
+        return ExecutionResult(success=True, outputs=outputs)
+
+    def put(self, key: str, result: ExecutionResult, source: Optional[str] = None) -> None:
+        if not result.success or not isinstance(result.outputs, dict):
+            return
+        final = self._entry(key)
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        artifacts = []
+        for i, (where, path) in enumerate(_artifact_paths(result.outputs)):
+            stored = f"{i}__{os.path.basename(path)}"
+            shutil.copyfile(path, os.path.join(tmp, stored))
+            artifacts.append([where, stored, file_digest(path)])
+        with open(os.path.join(tmp, "result.json"), "w", encoding="utf-8") as f:
+            json.dump({"outputs": result.outputs, "artifacts": artifacts,
+                       "source": os.path.abspath(source) if source else None}, f, ensure_ascii=False)
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # 다른 프로세스가 먼저 저장함
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for shard in os.scandir(self.root):
+            if not shard.is_dir() or shard.name.startswith(".tmp-"):
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    used = os.stat(os.path.join(entry.path, "result.json")).st_mtime
+                except OSError:
+                    used = 0.0
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                entries.append((used, size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _artifact_paths(value, where: tuple = ()):
+    # outputs 안의 산출 파일들과 그 위치. to-image의 쪽 목록, fan-out의 {규격: 경로} 안까지 들어간다
+    if isinstance(value, str):
+        if os.path.isfile(value):
+            yield list(where), value
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from _artifact_paths(item, where + (i,))
+    elif isinstance(value, dict):
+        for name, item in value.items():
+            yield from _artifact_paths(item, where + (name,))
+
+
+def _lookup(outputs, where: list):
+    for part in where:
+        outputs = outputs[part]
+    return outputs
+
+
+def _replace(outputs, where: list, value):
+    # outputs의 where 위치 값을 바꾼다 (json에서 새로 읽은 값이므로 제자리 수정해도 된다)
+    if not where:
+        return value
+    _lookup(outputs, where[:-1])[where[-1]] = value
+    return outputs
+
+
+def _rebase(path: str, old_source: Optional[str], new_source: Optional[str]) -> str:
+    """
+    old_source 옆에 old_source 이름으로 시작하게 만든 산출 파일(예: doc.txt -> doc.pdf, doc_001.png)을
+    new_source 옆, new_source 이름 기준으로 옮긴 경로. 그런 관계가 아니면 그대로 둔다.
+    """
+    if not old_source or not new_source:
+        return path
+    new_source = os.path.abspath(new_source)
+    old_dir, old_stem = os.path.split(os.path.splitext(old_source)[0])
+    new_dir, new_stem = os.path.split(os.path.splitext(new_source)[0])
+    name = os.path.basename(path)
+    if os.path.dirname(os.path.abspath(path)) != old_dir or not name.startswith(old_stem):
+        return path
+    return os.path.join(new_dir, new_stem + name[len(old_stem):])
+
+
+def _restore(stored: str, target: str, digest: Optional[str] = None) -> None:
+    # 원래 경로의 파일이 없거나 내용이 다르면 캐시 사본으로 되돌린다 (크기만이 아니라 해시로 비교)
+    if os.path.isfile(target) and os.path.getsize(target) == os.path.getsize(stored):
+        if file_digest(target) == (digest or file_digest(stored)):
+            return
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    tmp = f"{target}.{uuid.uuid4().hex}.part"
+    shutil.copyfile(stored, tmp)
+    os.replace(tmp, target)
+
+
+@lru_cache(maxsize=None)
+def default_cache() -> Optional[ResultCache]:
+    # UC_CACHE_DIR가 설정된 경우에만 캐시를 켠다
+    root = os.getenv("UC_CACHE_DIR")
+    if not root:
+        return None
+    return ResultCache(root, max_bytes=int(os.getenv("UC_CACHE_MB", "2048")) * 1024 * 1024)
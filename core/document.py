@@ -0,0 +1,177 @@
+# core/document.py
+
+import os
+import shutil
+import tempfile
+import time
+from functools import lru_cache, partial
+from typing import Iterable, Iterator, NamedTuple, Optional
+from core.ocr import OcrPool, worker_engine
+
+DOCUMENT_EXTS = (".pdf", ".tif", ".tiff")
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+
+
+class PageResult(NamedTuple):
+    index: int
+    text: str
+    pdf: Optional[str]       # 텍스트 레이어가 있는 1쪽짜리 PDF (임시 파일)
+    seconds: float
+    error: Optional[str] = None
+
+
+def is_document(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in DOCUMENT_EXTS
+
+
+def _is_pdf(path: str) -> bool:
+    return path.lower().endswith(".pdf")
+
+
+@lru_cache(maxsize=2)
+def _open_pdf(path: str):
+    # 워커 프로세스마다 문서를 한 번만 연다 (쪽마다 다시 파싱하지 않음)
+    import pypdfium2 as pdfium
+    return pdfium.PdfDocument(path)
+
+
+def page_count(path: str) -> int:
+    if _is_pdf(path):
+        # 캐시하지 않고 닫는다: 부모 프로세스의 열린 문서가 fork로 워커에 넘어가지 않게
+        import pypdfium2 as pdfium
+        doc = pdfium.PdfDocument(path)
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+    from PIL import Image
+    with Image.open(path) as img:
+        return getattr(img, "n_frames", 1)
+
+
+def render_page(path: str, index: int, dpi: int = OCR_DPI):
+    """index 쪽 하나만 회색조 PIL 이미지로 만든다 (PDF는 dpi로 래스터화, TIFF는 그 프레임만 디코딩)."""
+    if _is_pdf(path):
+        page = _open_pdf(path)[index]
+        try:
+            return page.render(scale=dpi / 72, grayscale=True).to_pil()
+        finally:
+            page.close()
+    from PIL import Image
+    with Image.open(path) as img:
+        img.seek(index)
+        return img.convert("L")
+
+
+def iter_pages(path: str, dpi: int = OCR_DPI) -> Iterator:
+    for index in range(page_count(path)):
+        yield render_page(path, index, dpi)
+
+
+def _ocr_page(path: str, dpi: int, workdir: Optional[str], index: int) -> PageResult:
+    # OcrPool 워커에서 실행: 쪽을 직접 래스터화하므로 이미지가 프로세스 사이를 오가지 않는다
+    start = time.perf_counter()
+    try:
+        image = render_page(path, index, dpi)
+        engine = worker_engine()
+        if workdir is None:
+            # 텍스트만 필요하면 전처리(deskew/denoise/crop)를 거친다. PDF는 원래 쪽 모습을 그대로 담는다
+            import numpy as np
+            from PIL import Image
+            from core.preprocess import preprocess
+            binary, _ = preprocess(np.asarray(image), dpi=dpi)
+            text, pdf = engine.recognize(Image.fromarray(binary)), None
+        else:
+            text, data = engine.recognize_pdf(image, dpi)
+            pdf = os.path.join(workdir, f"{index:06d}.pdf")
+            with open(pdf, "wb") as f:
+                f.write(data)
+        return PageResult(index, text, pdf, round(time.perf_counter() - start, 4))
+    except Exception as e:
+        return PageResult(index, "", None, round(time.perf_counter() - start, 4), str(e))
+
+
+def in_order(results: Iterable[PageResult]) -> Iterator[PageResult]:
+    # 끝나는 순서로 오는 결과를 쪽 순서대로 내보낸다 (먼저 끝난 뒤쪽 결과만 잠깐 보관)
+    waiting: dict[int, PageResult] = {}
+    expected = 0
+    for result in results:
+        waiting[result.index] = result
+        while expected in waiting:
+            yield waiting.pop(expected)
+            expected += 1
+
+
+def merge_pdfs(paths: list[str], out: str, workdir: str, group: int = 256) -> None:
+    """
+    PDF들을 순서대로 이어 붙인다. pikepdf는 저장할 때까지 원본 파일을 열어 두어야 하므로
+    group개씩 중간 파일로 합쳐 열린 파일 수를 제한한다 (쪽 이미지는 파일에서 필요할 때만 읽힘).
+    """
+    import pikepdf
+    while len(paths) > group:
+        parts = []
+        for i in range(0, len(paths), group):
+            part = os.path.join(workdir, f"part-{len(paths)}-{i:06d}.pdf")
+            merge_pdfs(paths[i:i + group], part, workdir, group)
+            parts.append(part)
+        paths = parts
+    sources = []
+    try:
+        with pikepdf.Pdf.new() as merged:
+            for p in paths:
+                src = pikepdf.open(p)
+                sources.append(src)
+                merged.pages.extend(src.pages)
+            merged.save(out)
+    finally:
+        for src in sources:
+            src.close()
+
+
+def ocr_document(
+    path: str,
+    outputs: Iterable[str] = ("text", "pdf", "docx"),
+    workers: Optional[int] = None,
+    dpi: int = OCR_DPI,
+    pool: Optional[OcrPool] = None,
+) -> dict[str, str]:
+    """
+    여러 쪽짜리 PDF/TIFF를 쪽 단위로 여러 프로세스에서 OCR 한다.
+    쪽은 워커가 하나씩 래스터화하고, 결과는 쪽 순서대로 바로 파일에 쓴다:
+      text -> <이름>.txt, docx -> <이름>.docx, pdf -> 텍스트 레이어가 있는 <이름>_ocr.pdf
+    반환값: {출력 종류: 절대 경로}
+    """
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    outputs = set(outputs)
+    base = os.path.splitext(path)[0]
+    paths = {"text": base + ".txt", "docx": base + ".docx", "pdf": base + "_ocr.pdf"}
+    workdir = tempfile.mkdtemp(prefix="uc-ocr-") if "pdf" in outputs else None
+    owned = pool is None
+    pool = pool or OcrPool(workers=workers)
+    doc = Document() if "docx" in outputs else None
+    page_pdfs: list[str] = []
+    try:
+        job = partial(_ocr_page, os.path.abspath(path), dpi, workdir)
+        with open(paths["text"], "w", encoding="utf-8") as txt:
+            for page in in_order(pool.map(range(page_count(path)), job)):
+                if page.error is not None:
+                    raise RuntimeError(f"OCR failed on page {page.index + 1} of {path}: {page.error}")
+                txt.write(page.text.rstrip() + "\n\f")   # 쪽 구분: form feed
+                if doc is not None:
+                    if page.index:
+                        doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+                    doc.add_paragraph(page.text.strip())
+                if page.pdf:
+                    page_pdfs.append(page.pdf)
+        if doc is not None:
+            doc.save(paths["docx"])
+        if workdir:
+            merge_pdfs(page_pdfs, paths["pdf"], workdir)
+    finally:
+        if owned:
+            pool.shutdown()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {kind: os.path.abspath(p) for kind, p in paths.items() if kind in outputs or kind == "text"}
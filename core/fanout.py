@@ -0,0 +1,121 @@
+# core/fanout.py
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+SPEC_RE = re.compile(r"^(?P<fmt>[a-z0-9]+)(?:@(?P<w>\d+)(?:x(?P<h>\d+))?)?$", re.IGNORECASE)
+# 알파 채널을 저장하지 못하는 포맷
+NO_ALPHA = {"JPEG", "BMP", "PPM"}
+
+
+class OutputSpec(NamedTuple):
+    label: str                   # 요청 문자열 그대로 ("webp@256")
+    fmt: str                     # Pillow 포맷 이름 ("WEBP")
+    ext: str                     # 파일 확장자 ("webp")
+    box: Optional[tuple[int, int]]  # 이 상자 안에 맞춰 줄임 (None이면 원본 크기)
+
+
+def parse_spec(spec: str) -> OutputSpec:
+    """
+    "png" (원본 크기), "webp@256" (긴 변 256), "jpeg@320x240" (320x240 상자에 맞춤).
+    비율은 유지하고 확대는 하지 않는다.
+    """
+    from PIL import Image
+    m = SPEC_RE.match(spec.strip())
+    if not m:
+        raise ValueError(f"Invalid output spec: {spec!r} (expected fmt, fmt@N or fmt@WxH)")
+    ext = m["fmt"].lower()
+    fmt = Image.registered_extensions().get(f".{ext}")
+    if fmt is None or fmt not in Image.SAVE:
+        raise ValueError(f"Unsupported output format: {ext}")
+    box = None
+    if m["w"]:
+        w = int(m["w"])
+        box = (w, int(m["h"]) if m["h"] else w)
+    return OutputSpec(spec.strip(), fmt, ext, box)
+
+
+def fit(size: tuple[int, int], box: Optional[tuple[int, int]]) -> tuple[int, int]:
+    # box 안에 들어가는 가장 큰 크기 (비율 유지, 확대 없음)
+    w, h = size
+    if box is None or (w <= box[0] and h <= box[1]):
+        return size
+    scale = min(box[0] / w, box[1] / h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def output_path(path: str, spec: OutputSpec) -> str:
+    # "webp@256"과 "webp@256x256"은 같은 파일이 된다. 입력과 같은 포맷의 원본 크기는 입력을 덮어쓰지 않게 _full을 붙인다
+    base = os.path.splitext(path)[0]
+    if spec.box is None:
+        out = os.path.abspath(f"{base}.{spec.ext}")
+        return out if out != os.path.abspath(path) else os.path.abspath(f"{base}_full.{spec.ext}")
+    suffix = f"{spec.box[0]}" if spec.box[0] == spec.box[1] else f"{spec.box[0]}x{spec.box[1]}"
+    return os.path.abspath(f"{base}_{suffix}.{spec.ext}")
+
+
+def decode(path: str, specs: list[OutputSpec]):
+    """
+    원본을 한 번만 디코딩한다. 모든 출력이 줄인 크기면 JPEG은 draft()로
+    가장 큰 출력보다 작지 않은 1/2, 1/4, 1/8 크기로 바로 디코딩한다 (DCT 단계에서 줄임).
+    """
+    from PIL import Image, ImageOps
+    img = Image.open(path)
+    orientation = img.getexif().get(0x0112, 1)
+    if all(s.box for s in specs) and img.format == "JPEG":
+        # EXIF 회전이 있으면 상자의 가로/세로가 바뀐다
+        sizes = [fit(img.size, s.box if orientation < 5 else s.box[::-1]) for s in specs]
+        img.draft(img.mode, (max(w for w, _ in sizes), max(h for _, h in sizes)))
+    img.load()
+    return ImageOps.exif_transpose(img)
+
+
+def _resize(img, size: tuple[int, int]):
+    from PIL import Image
+    if size == img.size:
+        return img
+    # reducing_gap: 큰 축소는 정수배 축소(reduce) 후 LANCZOS로 마무리해 빠르다
+    return img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def _encode(img, spec: OutputSpec, out: str, quality: int, icc: Optional[bytes]) -> str:
+    if spec.fmt in NO_ALPHA and img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+    options: dict = {}
+    if spec.fmt in ("JPEG", "WEBP", "AVIF"):
+        options["quality"] = quality
+    if spec.fmt == "WEBP":
+        options["method"] = 4
+    if icc and spec.fmt in ("JPEG", "PNG", "WEBP", "TIFF"):
+        options["icc_profile"] = icc
+    img.save(out, spec.fmt, **options)
+    return out
+
+
+def fan_out(path: str, outputs: list[str], quality: int = 85, workers: Optional[int] = None) -> dict[str, str]:
+    """
+    이미지 하나를 한 번 디코딩해 여러 포맷/크기로 저장한다 (썸네일 생성 경로).
+    크기별 축소와 포맷별 인코딩은 스레드 풀에서 동시에 실행된다
+    (Pillow의 resize/encode는 GIL을 놓고 C에서 돈다). 같은 크기는 한 번만 줄인다.
+    같은 파일이 되는 스펙(webp@256, webp@256x256)은 한 번만 인코딩한다.
+    반환값: {출력 스펙: 절대 경로}
+    """
+    specs = [parse_spec(s) for s in outputs]
+    if not specs:
+        return {}
+    img = decode(path, specs)
+    icc = img.info.get("icc_profile")
+    sizes = {s.label: fit(img.size, s.box) for s in specs}
+    paths = {s.label: output_path(path, s) for s in specs}
+    targets = {paths[s.label]: s for s in specs}
+    workers = workers or min(len(specs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # 축소 작업을 먼저 제출하므로 인코딩 작업이 기다리는 축소는 이미 실행 중이거나 끝나 있다
+        resized = {size: pool.submit(_resize, img, size) for size in dict.fromkeys(sizes.values())}
+        encoded = {
+            out: pool.submit(lambda s=s, out=out: _encode(resized[sizes[s.label]].result(), s, out, quality, icc))
+            for out, s in targets.items()
+        }
+        return {label: encoded[out].result() for label, out in paths.items()}
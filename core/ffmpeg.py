@@ -0,0 +1,211 @@
+# core/ffmpeg.py
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional, Sequence
+
+FFMPEG = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+
+class Progress(NamedTuple):
+    out_time: float          # 지금까지 인코딩한 길이(초)
+    speed: Optional[float]   # 실시간 대비 배속
+    done: bool
+
+
+class TranscodeResult(NamedTuple):
+    src: str
+    dst: str
+    seconds: float           # 걸린 시간
+    out_time: float          # 출력 길이(초)
+
+
+class TranscodeError(Exception):
+    """ffmpeg 실패. reason: failed | timeout | cancelled | missing"""
+
+    def __init__(self, src: str, dst: str, reason: str, returncode: Optional[int] = None, stderr: str = ""):
+        self.src = src
+        self.dst = dst
+        self.reason = reason
+        self.returncode = returncode
+        self.stderr = stderr
+        detail = f": {stderr.strip()}" if stderr.strip() else ""
+        super().__init__(f"ffmpeg {reason} converting {src} -> {dst} (exit {returncode}){detail}")
+
+
+def default_threads() -> int:
+    # 0이면 ffmpeg가 코어 수에 맞춰 정한다. 배치 워커처럼 여러 작업이 동시에 돌 때는 줄여서 쓴다.
+    return int(os.getenv("FFMPEG_THREADS", "0"))
+
+
+def _parse_progress(block: dict) -> Progress:
+    us = block.get("out_time_us") or block.get("out_time_ms") or "0"  # out_time_ms도 실제 단위는 µs
+    try:
+        out_time = int(us) / 1_000_000
+    except ValueError:
+        out_time = 0.0
+    try:
+        speed = float(block.get("speed", "").rstrip("x"))
+    except ValueError:
+        speed = None
+    return Progress(out_time, speed, block.get("progress") == "end")
+
+
+def transcode(
+    src: str,
+    dst: str,
+    args: Sequence[str] = (),
+    threads: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    input_args: Sequence[str] = (),
+) -> TranscodeResult:
+    """
+    ffmpeg로 src를 dst로 변환한다. 종료 코드를 확인하고, timeout이 지나거나 cancel이 set 되면
+    프로세스를 종료한 뒤 TranscodeError를 던진다. 실패하면 만들다 만 dst는 지운다.
+    input_args는 -i 앞에 들어가는 입력 옵션 (예: concat 목록 파일의 -f concat -safe 0)
+    """
+    threads = default_threads() if threads is None else threads
+    cmd = [FFMPEG, "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+           "-progress", "pipe:1", "-nostats", *input_args, "-i", src, "-threads", str(threads), *args, dst]
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        raise TranscodeError(src, dst, "missing", stderr=f"{FFMPEG} not found")
+
+    stderr_tail: deque[str] = deque(maxlen=20)
+    stopped: dict[str, str] = {}
+
+    def drain_stderr():
+        for line in proc.stderr:
+            stderr_tail.append(line.rstrip())
+
+    def watchdog():
+        deadline = start + timeout if timeout else None
+        while proc.poll() is None:
+            if cancel is not None and cancel.is_set():
+                stopped["reason"] = "cancelled"
+            elif deadline is not None and time.monotonic() > deadline:
+                stopped["reason"] = "timeout"
+            if stopped:
+                proc.kill()
+                return
+            time.sleep(0.05)
+
+    helpers = [threading.Thread(target=drain_stderr, daemon=True)]
+    if timeout or cancel is not None:
+        helpers.append(threading.Thread(target=watchdog, daemon=True))
+    for t in helpers:
+        t.start()
+
+    last = Progress(0.0, None, False)
+    block: dict[str, str] = {}
+    for line in proc.stdout:
+        key, _, value = line.strip().partition("=")
+        block[key] = value
+        if key == "progress":
+            last = _parse_progress(block)
+            block = {}
+            if on_progress is not None:
+                on_progress(last)
+    proc.wait()
+    for t in helpers:
+        t.join(timeout=1)
+
+    if stopped or proc.returncode != 0:
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise TranscodeError(src, dst, stopped.get("reason", "failed"), proc.returncode, "\n".join(stderr_tail))
+    return TranscodeResult(src, dst, time.monotonic() - start, last.out_time)
+
+
+class TranscodeJob:
+    def __init__(self, src: str, dst: str, future: Future, cancel_event: threading.Event):
+        self.src = src
+        self.dst = dst
+        self.future = future
+        self.cancel_event = cancel_event
+
+    def cancel(self) -> None:
+        # 대기 중이면 시작하지 않고, 실행 중이면 ffmpeg 프로세스를 종료한다
+        self.future.cancel()
+        self.cancel_event.set()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> TranscodeResult:
+        return self.future.result(timeout)
+
+
+class TranscodePool:
+    """
+    동시에 실행하는 ffmpeg 수를 workers(기본: 코어 수)로 제한하고,
+    작업마다 ffmpeg 스레드 수를 코어 수 / workers로 나눠 머신을 과하게 점유하지 않게 한다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads_per_job: Optional[int] = None):
+        cores = os.cpu_count() or 1
+        self.workers = workers or cores
+        self.threads_per_job = threads_per_job or max(1, cores // self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ffmpeg")
+        self._jobs: set[TranscodeJob] = set()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        src: str,
+        dst: str,
+        args: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[Progress], None]] = None,
+    ) -> TranscodeJob:
+        event = threading.Event()
+        future = self._executor.submit(
+            transcode, src, dst, args, self.threads_per_job, timeout, on_progress, event
+        )
+        job = TranscodeJob(src, dst, future, event)
+        with self._lock:
+            self._jobs.add(job)
+        future.add_done_callback(lambda f: self._forget(job))
+        return job
+
+    def _forget(self, job: TranscodeJob) -> None:
+        with self._lock:
+            self._jobs.discard(job)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self, cancel: bool = False) -> None:
+        if cancel:
+            self.cancel_all()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(cancel=exc_type is not None)
+
+
+_default_pool: Optional[TranscodePool] = None
+_pool_lock = threading.Lock()
+
+
+def default_pool() -> TranscodePool:
+    global _default_pool
+    with _pool_lock:
+        if _default_pool is None:
+            _default_pool = TranscodePool(threads_per_job=default_threads() or None)
+        return _default_pool
@@ -0,0 +1,133 @@
+# core/fonts.py
+
+import os
+import re
+import warnings
+from functools import lru_cache
+from typing import NamedTuple
+
+FONT_DIRS = [
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+]
+# 한글이 되는 폰트를 먼저, 없으면 라틴 폰트. .ttc/.otf(CFF)는 PDF에 넣을 수 없어 이미지에만 쓴다
+PREFERRED = (
+    "malgun.ttf", "NanumGothic.ttf", "NanumBarunGothic.ttf", "NotoSansKR-Regular.ttf",
+    "UnDotum.ttf", "AppleGothic.ttf", "DroidSansFallbackFull.ttf",
+    "NotoSansCJK-Regular.ttc", "NotoSansCJKkr-Regular.otf", "AppleSDGothicNeo.ttc",
+    "DejaVuSans.ttf", "LiberationSans-Regular.ttf", "Arial.ttf",
+)
+
+
+@lru_cache(maxsize=1)
+def _installed() -> dict[str, str]:
+    # 파일 이름(소문자) -> 경로. 폰트 폴더는 프로세스당 한 번만 훑는다
+    found: dict[str, str] = {}
+    for root in FONT_DIRS:
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                found.setdefault(name.lower(), os.path.join(dirpath, name))
+    return found
+
+
+def find_font(truetype_only: bool = False) -> str:
+    """
+    본문용 폰트 경로. TEXT_FONT 환경 변수가 있으면 그 파일, 없으면 PREFERRED 순서로 설치된 것.
+    truetype_only: PDF 임베딩용 (glyf 기반 단일 .ttf만)
+    """
+    override = os.getenv("TEXT_FONT")
+    if override:
+        if not os.path.isfile(override):
+            raise RuntimeError(f"TEXT_FONT not found: {override}")
+        return override
+    installed = _installed()
+    for name in PREFERRED:
+        if truetype_only and not name.endswith(".ttf"):
+            continue
+        if name.lower() in installed:
+            return installed[name.lower()]
+    raise RuntimeError(f"No usable font found in {', '.join(FONT_DIRS)}; set TEXT_FONT")
+
+
+class FontMetrics(NamedTuple):
+    path: str
+    name: str            # PostScript 이름 (공백/괄호 제거)
+    desc: dict           # FontDescriptor 항목 (Ascent, Descent, ... 1/1000 em)
+    widths: list[int]    # BMP 코드 포인트별 폭 (1/1000 em), 폰트에 없는 글자는 MissingWidth
+
+
+@lru_cache(maxsize=8)
+def load_metrics(path: str) -> FontMetrics:
+    """TTF를 한 번만 파싱해 둔다 (fpdf는 add_font마다 다시 파싱한다)."""
+    from fpdf.ttfonts import TTFontFile
+    ttf = TTFontFile()
+    ttf.getMetrics(path)
+    missing = int(round(ttf.defaultWidth))
+    desc = {
+        "Ascent": int(round(ttf.ascent)),
+        "Descent": int(round(ttf.descent)),
+        "CapHeight": int(round(ttf.capHeight)),
+        "Flags": (ttf.flags | 4) & ~32,   # 심볼 폰트가 아닌 비라틴(nonsymbolic) 글꼴
+        "FontBBox": "[%d %d %d %d]" % tuple(int(round(v)) for v in ttf.bbox),
+        "ItalicAngle": int(ttf.italicAngle),
+        "StemV": int(round(ttf.stemV)),
+        "MissingWidth": missing,
+    }
+    # charWidths: 0 = 글리프 없음, 65535 = 폭 0. [0]은 글자 수라서 버린다
+    widths = [missing if w == 0 else 0 if w == 65535 else w for w in ttf.charWidths[:65536]]
+    widths[0] = 0
+    return FontMetrics(path, re.sub(r"[ ()]", "", ttf.fullName), desc, widths)
+
+
+@lru_cache(maxsize=4)
+def subset_font(path: str, chars: frozenset) -> tuple[bytes, dict[int, int]]:
+    """쓰인 글자만 남긴 TTF와 {코드 포인트: 새 글리프 번호}."""
+    from fpdf.ttfonts import TTFontFile
+    ttf = TTFontFile()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")   # 일부 폰트의 cmap 경고 (결과에는 영향 없음)
+        data = ttf.makeSubset(path, sorted(chars))
+    return data, dict(ttf.codeToGlyph)
+
+
+@lru_cache(maxsize=16)
+def truetype(path: str, size: int):
+    from PIL import ImageFont
+    return ImageFont.truetype(path, size)
+
+
+class GlyphCache(dict):
+    """
+    코드 포인트 -> 글자 폭(px). 처음 보는 글자만 FreeType으로 재고 그려서
+    glyphs[code] = (x 오프셋, 기준선 기준 y 오프셋, 알파 마스크 또는 None)에 같이 넣어 둔다.
+    """
+
+    def __init__(self, font):
+        super().__init__()
+        self.font = font
+        self.glyphs: dict[int, tuple] = {}
+
+    def __missing__(self, code: int) -> float:
+        from PIL import Image, ImageDraw
+        ch = chr(code)
+        left, top, right, bottom = self.font.getbbox(ch, anchor="ls")
+        mask = None
+        if right > left and bottom > top:
+            mask = Image.new("L", (right - left, bottom - top), 0)
+            ImageDraw.Draw(mask).text((-left, -top), ch, font=self.font, fill=255, anchor="ls")
+        self.glyphs[code] = (left, top, mask)
+        width = self[code] = self.font.getlength(ch)
+        return width
+
+
+@lru_cache(maxsize=16)
+def glyph_cache(path: str, size: int) -> tuple[GlyphCache, int, int]:
+    """폰트/크기별 글리프 캐시, ascent, 줄 높이 (ascent + descent). 호출 사이에 재사용된다."""
+    font = truetype(path, size)
+    ascent, descent = font.getmetrics()
+    return GlyphCache(font), ascent, ascent + descent
@@ -0,0 +1,123 @@
+# core/jobs.py
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from core.runner import progress_hook, run_plugin
+
+JOB_WORKERS = int(os.getenv("UC_JOB_WORKERS", "2"))
+MAX_JOBS = 200   # 끝난 작업은 이 개수까지만 기억한다
+
+
+class Job:
+    """
+    백그라운드에서 도는 run_plugin 한 번(또는 실시간 전사 한 번). 상태는 queued -> running -> done | failed.
+    outputs에는 파일 경로/텍스트 같은 결과 핸들만 담긴다 (파일 내용은 읽지 않음).
+    segments에는 실시간 전사 작업의 세그먼트가 나오는 대로 쌓인다.
+    """
+
+    def __init__(self, plugin: str, payload: dict):
+        self.id = uuid.uuid4().hex
+        self.plugin = plugin
+        self.payload = payload
+        self.status = "queued"
+        self.done_steps = 0
+        self.total_steps = 0
+        self.step: Optional[str] = None
+        self.outputs: dict = {}
+        self.segments: list = []
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.finished: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self.status in ("queued", "running")
+
+    @property
+    def progress(self) -> float:
+        if self.status in ("done", "failed"):
+            return 1.0
+        return self.done_steps / self.total_steps if self.total_steps else 0.0
+
+    def transcript(self) -> str:
+        # 지금까지 나온 세그먼트를 타임스탬프와 함께 한 줄씩
+        from core.transcribe import format_timestamp
+        return "\n".join(f"[{format_timestamp(seg.start)}] {seg.text}" for seg in list(self.segments))
+
+    def _report(self, step: str, done: int, total: int) -> None:
+        self.step, self.done_steps, self.total_steps = step, done, total
+
+
+class JobManager:
+    """
+    웹 UI용 작업 큐. 한 프로세스에 하나만 만들어 (app.py의 st.cache_resource) 모든 세션이
+    같은 스레드 풀과 이미 로드된 모델/클라이언트를 공유한다. 세션에는 job id만 저장한다.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_jobs: int = MAX_JOBS):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="uc-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_jobs = max_jobs
+
+    def submit(self, plugin: str, payload: dict) -> str:
+        return self._enqueue(Job(plugin, payload), self._run)
+
+    def submit_transcript(self, path: str) -> str:
+        # Whisper 세그먼트를 Job.segments에 쌓는 작업 (UI는 폴링하면서 쌓인 만큼 보여준다)
+        return self._enqueue(Job("transcript", {"input_path": path}), self._run_transcript)
+
+    def _enqueue(self, job: Job, run) -> str:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_finished()
+        self._pool.submit(run, job)
+        return job.id
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        token = progress_hook.set(job._report)
+        try:
+            result = run_plugin(job.plugin, job.payload)
+        except Exception as e:   # run_plugin은 보통 에러를 결과로 돌려주지만, 워커 스레드가 죽지 않도록
+            job.error, job.status = str(e), "failed"
+        else:
+            if result.success:
+                job.outputs, job.status = result.outputs, "done"
+            else:
+                job.error, job.status = str(result.outputs.get("error", result.outputs)), "failed"
+        finally:
+            progress_hook.reset(token)
+            job.finished = time.time()
+
+    def _run_transcript(self, job: Job) -> None:
+        from core.transcribe import stream_transcript
+        job.status = "running"
+        try:
+            for seg in stream_transcript(job.payload["input_path"]):
+                job.segments.append(seg)
+        except Exception as e:
+            job.error, job.status = str(e), "failed"
+        else:
+            job.outputs = {"transcript": job.transcript()}
+            job.status = "done"
+        finally:
+            job.finished = time.time()
+
+    def _forget_finished(self) -> None:
+        # 오래된 완료 작업부터 잊는다 (진행 중인 작업은 남긴다)
+        excess = len(self._jobs) - self._max_jobs
+        for job_id in [j.id for j in self._jobs.values() if not j.running][:max(0, excess)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
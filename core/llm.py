@@ -0,0 +1,248 @@
+# core/llm.py
+
+import asyncio
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional
+from dotenv import load_dotenv
+from core.textsplit import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+# 응답 길이를 모를 때 TPM 예약에 쓰는 추정치 (응답 후 실제 사용량으로 보정)
+COMPLETION_ESTIMATE = 512
+# metrics()/지연 시간 통계에 남겨 두는 최근 호출 수 (호출 수/토큰 합계는 누적값으로 따로 센다)
+METRICS_KEPT = 1000
+
+
+class TokenBucket:
+    """
+    분당 rate_per_minute 만큼 채워지는 토큰 버킷.
+    reserve()는 토큰을 바로 차감하고 기다려야 할 시간을 돌려주므로
+    sync(time.sleep)와 async(asyncio.sleep) 양쪽에서 같이 쓸 수 있다.
+    """
+
+    def __init__(self, rate_per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        # 예약량과 실제 사용량의 차이를 반영 (양수면 추가 차감, 음수면 환급)
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class CallMetric(NamedTuple):
+    model: str
+    latency: float
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    ok: bool
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    return getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retryable(exc: Exception) -> bool:
+    import openai
+    if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status = _status_code(exc)
+    return status == 429 or (status is not None and status >= 500)
+
+
+class LLMGateway:
+    """
+    프로세스 전체가 공유하는 OpenAI 호출 창구.
+    - sync/async 클라이언트를 하나씩만 만들어 HTTP 커넥션 풀을 재사용
+    - 요청 수(RPM)와 토큰 수(TPM) 토큰 버킷으로 호출 속도 제한
+    - 429/5xx/연결 오류는 지터를 준 지수 백오프로 재시도하고, 429가 나면
+      잠시 모든 호출을 멈춰 동시에 몰리는 재시도를 막는다
+    - 호출별 지연 시간과 토큰 사용량 기록
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        timeout: float = 120.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._sync_client = None
+        self._async_client = None
+        self._client_lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()   # _cooldown_until
+        self._metrics: "deque[CallMetric]" = deque(maxlen=METRICS_KEPT)
+        self._totals = dict.fromkeys(("calls", "errors", "retries", "prompt_tokens", "completion_tokens"), 0)
+        self._metrics_lock = threading.Lock()
+
+    # --- clients -------------------------------------------------------
+    def sync_client(self):
+        with self._client_lock:
+            if self._sync_client is None:
+                from openai import OpenAI
+                self._sync_client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                           max_retries=0, timeout=self.timeout)
+            return self._sync_client
+
+    def async_client(self):
+        with self._client_lock:
+            if self._async_client is None:
+                from openai import AsyncOpenAI
+                self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                                 max_retries=0, timeout=self.timeout)
+            return self._async_client
+
+    # --- scheduling ----------------------------------------------------
+    def _reserve(self, estimate: int) -> float:
+        # 재시도마다 부른다: 요청 수(RPM)는 HTTP 요청마다, 토큰(TPM)은 estimate > 0일 때만 (논리적 요청당 한 번)
+        with self._lock:
+            wait = max(0.0, self._cooldown_until - time.monotonic())
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and estimate:
+            wait = max(wait, self.tokens.reserve(estimate))
+        return wait
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        after = _retry_after(exc)
+        if after is not None:
+            delay = max(delay, after)
+        if _status_code(exc) == 429:
+            with self._lock:
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    def _record(self, model: str, start: float, resp: Any, estimate: int, retries: int, ok: bool) -> None:
+        usage = getattr(resp, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        if self.tokens:
+            if ok and usage is not None:
+                self.tokens.adjust(prompt_tokens + completion_tokens - estimate)
+            elif not ok:
+                self.tokens.adjust(-estimate)   # 실패한 요청은 토큰을 쓰지 않았다: 예약분 환급
+        metric = CallMetric(model, time.monotonic() - start, prompt_tokens, completion_tokens, retries, ok)
+        with self._metrics_lock:
+            self._metrics.append(metric)
+            self._totals["calls"] += 1
+            self._totals["errors"] += not ok
+            self._totals["retries"] += retries
+            self._totals["prompt_tokens"] += prompt_tokens
+            self._totals["completion_tokens"] += completion_tokens
+        logger.debug("llm call model=%s latency=%.2fs tokens=%d+%d retries=%d ok=%s", *metric)
+
+    @staticmethod
+    def _estimate(messages: list[dict], kwargs: dict) -> int:
+        prompt = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        return prompt + int(kwargs.get("max_tokens") or COMPLETION_ESTIMATE)
+
+    # --- public API ----------------------------------------------------
+    def chat(self, messages: list[dict], model: str = DEFAULT_MODEL, **kwargs) -> str:
+        estimate = self._estimate(messages, kwargs)
+        start = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._reserve(estimate if attempt == 0 else 0))
+            try:
+                resp = self.sync_client().chat.completions.create(model=model, messages=messages, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    self._record(model, start, None, estimate, attempt, ok=False)
+                    raise
+                time.sleep(self._backoff(attempt, e))
+                continue
+            self._record(model, start, resp, estimate, attempt, ok=True)
+            return resp.choices[0].message.content.strip()
+
+    async def achat(self, messages: list[dict], model: str = DEFAULT_MODEL, **kwargs) -> str:
+        estimate = self._estimate(messages, kwargs)
+        start = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._reserve(estimate if attempt == 0 else 0))
+            try:
+                resp = await self.async_client().chat.completions.create(model=model, messages=messages, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    self._record(model, start, None, estimate, attempt, ok=False)
+                    raise
+                await asyncio.sleep(self._backoff(attempt, e))
+                continue
+            self._record(model, start, resp, estimate, attempt, ok=True)
+            return resp.choices[0].message.content.strip()
+
+    def metrics(self) -> list[CallMetric]:
+        # 최근 METRICS_KEPT 건만
+        with self._metrics_lock:
+            return list(self._metrics)
+
+    def stats(self) -> dict:
+        # 횟수/토큰은 프로세스 시작 이후 누적, 지연 시간은 최근 METRICS_KEPT 건 기준
+        with self._metrics_lock:
+            totals = dict(self._totals)
+            latencies = sorted(m.latency for m in self._metrics)
+        return {
+            **totals,
+            "latency_p50": statistics.median(latencies) if latencies else 0.0,
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+@lru_cache(maxsize=None)
+def get_gateway() -> LLMGateway:
+    # 플러그인들이 공유하는 게이트웨이 (첫 요약 요청 때 생성)
+    load_dotenv()
+    return LLMGateway(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL"),
+        rpm=_env_float("LLM_RPM"),
+        tpm=_env_float("LLM_TPM"),
+    )
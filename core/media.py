@@ -0,0 +1,35 @@
+# core/media.py
+
+import os
+import subprocess
+from typing import Iterator, Optional
+import numpy as np
+from core.ffmpeg import FFMPEG
+from core.transcribe import pcm_windows
+
+
+def demux_audio(path: str, fmt: Optional[str] = None, pcm: bool = True) -> tuple[Optional[str], Optional[Iterator[np.ndarray]]]:
+    """
+    ffmpeg 프로세스 하나로 오디오 트랙만 한 번 디코딩한다 (비디오 프레임은 디코딩하지 않음).
+    - fmt를 주면 원본 품질 그대로 `<입력 이름>.<fmt>` 파일로 인코딩
+    - pcm=True면 같은 디코딩 결과를 16 kHz mono PCM 윈도 이터레이터로 돌려준다 (Whisper 입력용).
+      PCM 전체를 메모리에 모으지 않으며, 이 경우 ffmpeg는 이터레이터를 읽을 때 돌고
+      출력 파일은 윈도를 끝까지 읽어야 완성된다.
+    반환값: (출력 파일 절대 경로 또는 None, PCM 윈도 이터레이터 또는 None)
+    """
+    if fmt is None and not pcm:
+        raise ValueError("Nothing to produce: pass fmt and/or pcm=True")
+    out = None
+    file_args = []
+    if fmt is not None:
+        out = os.path.splitext(path)[0] + f".{fmt}"
+        file_args = ["-map", "0:a:0", "-vn", out]
+    out = os.path.abspath(out) if out else None
+    if pcm:
+        return out, pcm_windows(path, outputs=file_args)
+    cmd = [FFMPEG, "-nostdin", "-y", "-loglevel", "error", "-i", path, *file_args]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        detail = proc.stderr.decode("utf-8", "replace").strip()[-500:]
+        raise RuntimeError(f"ffmpeg failed on {path} (exit {proc.returncode}): {detail}")
+    return out, None
@@ -0,0 +1,143 @@
+# core/models.py
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+
+class ModelKey(NamedTuple):
+    name: str
+    device: str
+    precision: str  # "fp16" | "fp32"
+
+
+def _model_bytes(model: Any) -> int:
+    # torch 모듈이면 파라미터/버퍼 크기 합, 아니면 0 (예산 계산에서 제외)
+    total = 0
+    for attr in ("parameters", "buffers"):
+        fn = getattr(model, attr, None)
+        if fn is None:
+            continue
+        for t in fn():
+            total += t.numel() * t.element_size()
+    return total
+
+
+class ModelRegistry:
+    """
+    (모델 이름, 디바이스, 정밀도) 키로 모델을 한 번만 로드해 공유하는 LRU 레지스트리.
+    budget_bytes를 넘으면 가장 오래 사용하지 않은 모델부터 내린다.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[ModelKey], Any],
+        budget_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = _model_bytes,
+    ):
+        self._loader = loader
+        self._budget = budget_bytes
+        self._sizeof = sizeof
+        self._models: "OrderedDict[ModelKey, tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+        self._use_locks: dict[ModelKey, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, key: ModelKey) -> Any:
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # 같은 키는 한 스레드만 로드하고, 다른 키의 로드는 막지 않는다
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+            model = self._loader(key)
+            size = self._sizeof(model)
+            with self._lock:
+                self._models[key] = (model, size)
+                self.loads += 1
+                self._evict(keep=key)
+                self._load_locks.pop(key, None)
+            return model
+
+    @contextmanager
+    def use(self, key: ModelKey) -> Iterator[Any]:
+        """
+        모델을 빌려 쓰는 동안 같은 모델의 다른 사용자를 기다리게 한다.
+        Whisper의 transcribe는 공유 디코더 모듈에 KV 캐시 hook을 달므로 한 모델을 동시에 돌리면 결과가 섞인다.
+        다른 키(다른 모델/디바이스)는 막지 않는다.
+        """
+        model = self.get(key)
+        with self._lock:
+            use_lock = self._use_locks.setdefault(key, threading.Lock())
+        with use_lock:
+            yield model
+
+    def _evict(self, keep: ModelKey) -> None:
+        if self._budget is None:
+            return
+        while self.total_bytes() > self._budget:
+            victim = next((k for k in self._models if k != keep), None)
+            if victim is None:
+                break  # 방금 로드한 모델 하나만 남았으면 예산을 넘어도 유지
+            del self._models[victim]
+            self.evictions += 1
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self._models.values())
+
+    def keys(self) -> list[ModelKey]:
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+def _load_whisper(key: ModelKey) -> Any:
+    from whisper import load_model
+    return load_model(key.name, device=key.device)
+
+
+def _budget_from_env() -> Optional[int]:
+    mb = os.getenv("WHISPER_CACHE_MB")
+    return int(mb) * 1024 * 1024 if mb else None
+
+
+_whisper_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def whisper_registry() -> ModelRegistry:
+    global _whisper_registry
+    with _registry_lock:
+        if _whisper_registry is None:
+            _whisper_registry = ModelRegistry(_load_whisper, budget_bytes=_budget_from_env())
+        return _whisper_registry
+
+
+def default_device() -> str:
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@contextmanager
+def whisper_model(name: str = "base", device: Optional[str] = None) -> Iterator[tuple[Any, bool]]:
+    """
+    공유 레지스트리의 Whisper 모델과 transcribe()에 넘길 fp16 플래그.
+    with 블록 동안 그 모델을 혼자 쓴다 (transcribe/decode 호출을 감쌀 것).
+    """
+    device = device or default_device()
+    fp16 = device == "cuda"
+    with whisper_registry().use(ModelKey(name, device, "fp16" if fp16 else "fp32")) as model:
+        yield model, fp16
@@ -0,0 +1,326 @@
+# core/ocr.py
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+OCR_LANG = os.getenv("OCR_LANG", "eng+kor")
+OEM = 1   # LSTM 엔진
+PSM = 3   # 자동 페이지 분할
+
+
+class OcrResult(NamedTuple):
+    path: str
+    text: str
+    seconds: float          # 전처리 + 인식에 걸린 시간
+    error: Optional[str] = None
+
+
+class TesserocrEngine:
+    """tesserocr(C API 바인딩): traineddata를 한 번 로드해 두고 이미지마다 재사용한다."""
+
+    def __init__(self, lang: str = OCR_LANG, oem: int = OEM, psm: int = PSM):
+        import tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=lang, oem=tesserocr.OEM(oem), psm=tesserocr.PSM(psm))
+        self._pdf = PytesseractEngine(lang, oem, psm)
+
+    def recognize(self, image) -> str:
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def recognize_pdf(self, image, dpi: int = 300) -> tuple[str, bytes]:
+        # 텍스트 레이어가 있는 PDF는 tesseract의 PDF 렌더러로만 만들 수 있다
+        return self._pdf.recognize_pdf(image, dpi)
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class PytesseractEngine:
+    """tesserocr가 없을 때: 이미지마다 tesseract 프로세스를 실행한다 (모델도 매번 로드)."""
+
+    def __init__(self, lang: str = OCR_LANG, oem: int = OEM, psm: int = PSM):
+        self.lang = lang
+        self.config = f"--oem {oem} --psm {psm}"
+
+    def recognize(self, image) -> str:
+        import pytesseract
+        return pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+    def recognize_pdf(self, image, dpi: int = 300) -> tuple[str, bytes]:
+        """한 번의 tesseract 실행으로 (텍스트, 텍스트 레이어가 있는 1쪽짜리 PDF)를 만든다."""
+        from pytesseract.pytesseract import run_tesseract, save
+        with save(image) as (base, filename):
+            run_tesseract(filename, base, "pdf txt", self.lang, f"{self.config} --dpi {dpi}")
+            with open(f"{base}.txt", encoding="utf-8") as f:
+                text = f.read()
+            with open(f"{base}.pdf", "rb") as f:
+                pdf = f.read()
+        return text, pdf
+
+    def close(self) -> None:
+        pass
+
+
+def make_engine(lang: str = OCR_LANG, oem: int = OEM, psm: int = PSM):
+    try:
+        return TesserocrEngine(lang, oem, psm)
+    except ImportError:
+        return PytesseractEngine(lang, oem, psm)
+
+
+_local = threading.local()
+
+
+def thread_engine(lang: str = OCR_LANG):
+    # tesserocr API 객체는 스레드 간에 공유할 수 없으므로 스레드마다 하나씩 둔다
+    engines = _local.__dict__.setdefault("engines", {})
+    if lang not in engines:
+        engines[lang] = make_engine(lang)
+    return engines[lang]
+
+
+def binarize(path: str):
+    """core.preprocess 단계(rescale/deskew/denoise/crop, OCR_PREPROCESS로 선택)와 Otsu 이진화를 거친 PIL 이미지."""
+    from PIL import Image
+    from core.preprocess import preprocess_file
+    binary, _ = preprocess_file(path)
+    return Image.fromarray(binary)
+
+
+def ocr_file(path: str, engine=None) -> OcrResult:
+    start = time.perf_counter()
+    if engine is None and TILE_PX and _height(path) > 2 * TILE_PX:
+        text = ocr_tiled(path)
+    else:
+        text = (engine or thread_engine()).recognize(binarize(path))
+    return OcrResult(path, text, round(time.perf_counter() - start, 4))
+
+
+# --- 큰 이미지: 가로 띠로 나눠 병렬 OCR ------------------------------------------
+TILE_PX = int(os.getenv("OCR_TILE_PX", "2000"))     # 띠 최대 높이 (0이면 나누지 않음)
+TILE_OVERLAP = 64                                    # 빈 줄을 못 찾아 글자를 자를 때 겹치는 높이
+
+
+def _height(path: str) -> int:
+    from PIL import Image
+    try:
+        with Image.open(path) as img:   # 헤더만 읽는다
+            return img.height
+    except Exception:
+        return 0
+
+
+def _row_ink(gray, threshold: float, chunk: int = 1024):
+    import numpy as np
+    # 행마다 글자(어두운) 픽셀 수. 임시 배열이 이미지 전체 크기가 되지 않도록 chunk 행씩 센다
+    return np.concatenate([
+        np.count_nonzero(gray[i:i + chunk] < threshold, axis=1) for i in range(0, gray.shape[0], chunk)
+    ])
+
+
+def text_bands(ink, max_height: int = TILE_PX, overlap: int = TILE_OVERLAP) -> list[tuple[int, int]]:
+    """
+    행별 잉크 양으로 이미지를 최대 max_height 높이의 가로 띠 (top, bottom) 들로 나눈다.
+    띠 후반부에서 글자가 없는 행을 찾아 자르고, 없으면 잉크가 가장 적은 행에서 overlap만큼 겹쳐 자른다.
+    글자가 하나도 없는 띠는 빼고 돌려준다.
+    """
+    height = len(ink)
+    bands, top = [], 0
+    while top < height:
+        limit = top + max_height
+        if limit >= height:
+            bottom, next_top = height, height
+        else:
+            lo = top + max_height // 2
+            window = ink[lo:limit]
+            cut = limit - 1 - int(window[::-1].argmin())   # 가장 아래쪽의 빈(잉크 최소) 행
+            bottom, next_top = (cut, cut) if ink[cut] == 0 else (min(cut + overlap, height), cut)
+        if ink[top:bottom].any():
+            bands.append((top, bottom))
+        top = next_top
+    return bands
+
+
+def _same_line(a: str, b: str) -> bool:
+    import difflib
+    a, b = " ".join(a.split()), " ".join(b.split())
+    if a == b:
+        return True
+    # 잘린 줄은 글자 몇 개가 다르게 읽힐 수 있다. 짧은 줄은 ("합계 12" / "합계 13") 정확히 같을 때만 같은 줄로 본다
+    return min(len(a), len(b)) >= 20 and difflib.SequenceMatcher(None, a, b).ratio() > 0.9
+
+
+def merge_band_texts(texts: list[str], window: int = 3) -> str:
+    """띠별 OCR 결과를 위에서부터 잇고, 겹친 영역에서 두 번 읽힌 줄은 한 번만 남긴다."""
+    lines: list[str] = []
+    for text in texts:
+        new = [line for line in text.splitlines() if line.strip()]
+        for k in range(min(window, len(lines), len(new)), 0, -1):
+            if all(_same_line(a, b) for a, b in zip(lines[-k:], new[:k])):
+                new = new[k:]
+                break
+        lines.extend(new)
+    return "\n".join(lines)
+
+
+class BandReader:
+    """
+    큰 이미지를 가로 띠 단위로 회색조 배열로 읽는다.
+    스트립/타일로 저장된 비압축 래스터(TIFF 등)는 요청한 행을 덮는 스트립만 디코딩하므로
+    메모리는 띠 크기에 비례한다. 중간부터 풀 수 없는 압축 스트림(PNG, JPEG, LZW/Deflate TIFF)은
+    처음에 한 번만 회색조(1바이트/픽셀)로 디코딩해 두고 잘라 쓴다.
+    """
+
+    def __init__(self, path: str):
+        from PIL import Image
+        self.path = path
+        try:
+            with Image.open(path) as img:
+                self.width, self.height = img.size
+                dpi = img.info.get("dpi", (None,))[0]
+                self.striped = len(img.tile) > 1 and all(t[0] == "raw" for t in img.tile)
+        except Exception:
+            raise ValueError(f"Cannot read image: {path}")
+        self.dpi = float(dpi) if dpi and dpi > 1 else None
+        self._gray = None
+        if not self.striped:
+            import cv2
+            self._gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if self._gray is None:
+                raise ValueError(f"Cannot read image: {path}")
+
+    def rows(self, top: int, bottom: int):
+        import numpy as np
+        from PIL import Image
+        if self._gray is not None:
+            return self._gray[top:bottom]
+        with Image.open(self.path) as img:
+            tiles = [t for t in img.tile if t[1][1] < bottom and t[1][3] > top]
+            y0, y1 = min(t[1][1] for t in tiles), max(t[1][3] for t in tiles)
+            # 겹치는 스트립만 남기고 이미지 높이를 그만큼으로 줄여서 디코딩한다
+            img.tile = [_shift_tile(t, y0) for t in tiles]
+            img._size = (self.width, y1 - y0)
+            return np.asarray(img.convert("L"))[top - y0:bottom - y0]
+
+    def regions(self, step: int):
+        for top in range(0, self.height, step):
+            yield self.rows(top, min(top + step, self.height))
+
+
+def _shift_tile(tile, dy: int):
+    x0, top, x1, bottom = tile[1]
+    extents = (x0, top - dy, x1, bottom - dy)
+    # Pillow 11+는 _Tile(namedtuple), 그 전은 tuple
+    return tile._replace(extents=extents) if hasattr(tile, "_replace") else (tile[0], extents, tile[2], tile[3])
+
+
+def ocr_tiled(path: str, tile_px: int = TILE_PX, workers: Optional[int] = None,
+              engine_for_thread: Callable = thread_engine, config=None) -> str:
+    """
+    큰 이미지를 가로 띠로 나눠 스레드 풀에서 동시에 OCR 한다 (tesseract는 GIL 밖에서 돈다).
+    띠 경계는 전체 Otsu 임계값으로 구한 행별 잉크 양으로 정하고 (띠 단위로 읽으며 두 번 훑음),
+    각 띠는 ocr_file과 같은 core.preprocess 단계를 거쳐 인식한다. 디코딩은 BandReader 참고.
+    """
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from PIL import Image
+    from core.preprocess import PreprocessConfig, preprocess
+    config = config or PreprocessConfig.from_env()
+    reader = BandReader(path)
+    hist = sum(np.bincount(region.ravel(), minlength=256) for region in reader.regions(tile_px))
+    threshold = _otsu_threshold(hist)
+    ink = np.concatenate([_row_ink(region, threshold) for region in reader.regions(tile_px)])
+    bands = text_bands(ink, tile_px)
+
+    def recognize(band: tuple[int, int]) -> str:
+        binary, _ = preprocess(reader.rows(*band), config, reader.dpi)
+        return engine_for_thread().recognize(Image.fromarray(binary))
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(bands), os.cpu_count() or 1) or 1) as pool:
+        return merge_band_texts(list(pool.map(recognize, bands)))
+
+
+def _otsu_threshold(hist) -> float:
+    import numpy as np
+    # cv2.threshold(THRESH_OTSU)와 같은 값 (픽셀 > t 이면 흰색)을 히스토그램만으로 계산
+    p = hist.ravel().astype(np.float64)
+    p /= p.sum()
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    return float(np.nanargmax(between)) + 1
+
+
+# --- 워커 프로세스 -------------------------------------------------------------
+_worker_engine = None
+
+
+def _init_worker(factory: Callable, lang: str) -> None:
+    # 워커마다 엔진(과 언어 모델)을 한 번만 만든다
+    global _worker_engine
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")  # tesseract 내부 스레드가 워커끼리 코어를 다투지 않게
+    _worker_engine = factory(lang)
+
+
+def worker_engine():
+    # OcrPool 워커 안이면 워커의 엔진, 아니면 현재 스레드의 엔진
+    return _worker_engine or thread_engine()
+
+
+def _worker_ocr(path: str) -> OcrResult:
+    start = time.perf_counter()
+    try:
+        return ocr_file(path, _worker_engine)
+    except Exception as e:
+        return OcrResult(path, "", round(time.perf_counter() - start, 4), str(e))
+
+
+class OcrPool:
+    """
+    OCR 엔진을 띄워 둔 워커 프로세스 풀. 언어 모델은 워커당 한 번만 로드된다.
+    map()은 입력을 필요한 만큼만 읽어 max_pending(기본 workers*2)개까지만 제출하고,
+    끝나는 순서대로 이미지별 결과와 소요 시간을 내보낸다.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        lang: str = OCR_LANG,
+        max_pending: Optional[int] = None,
+        factory: Optional[Callable] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(factory or make_engine, lang)
+        )
+
+    def submit(self, path: str, job: Callable = _worker_ocr) -> Future:
+        return self._executor.submit(job, path)
+
+    def map(self, paths: Iterable, job: Callable = _worker_ocr) -> Iterator:
+        """job은 워커에서 실행할 모듈 수준 함수 (기본: 이미지 파일 OCR). worker_engine()으로 엔진을 쓴다."""
+        pending: set[Future] = set()
+        for path in paths:
+            while len(pending) >= self.max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+            pending.add(self.submit(path, job))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,165 @@
+# core/preprocess.py
+
+import os
+import time
+from typing import NamedTuple, Optional
+import numpy as np
+
+STAGES = ("rescale", "deskew", "denoise", "crop")
+# 대문자 높이 기준: 10pt 본문은 300 dpi에서 약 30px
+GLYPH_PX_AT_300DPI = 30
+
+
+class PreprocessConfig(NamedTuple):
+    stages: tuple[str, ...] = STAGES
+    target_dpi: int = 300
+    max_skew: float = 5.0       # 탐색할 기울기 범위(도)
+    noise_threshold: float = 6.0  # 이 이상이면 노이즈 제거 (원본과 median 필터 결과의 평균 차이)
+    margin: int = 10            # 여백을 자를 때 남길 픽셀
+
+    @classmethod
+    def from_env(cls) -> "PreprocessConfig":
+        raw = os.getenv("OCR_PREPROCESS", ",".join(STAGES))
+        stages = tuple(s.strip() for s in raw.split(",") if s.strip() in STAGES)
+        return cls(stages=stages, target_dpi=int(os.getenv("OCR_TARGET_DPI", "300")))
+
+
+def otsu(gray: np.ndarray) -> np.ndarray:
+    import cv2
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def estimate_dpi(binary: np.ndarray) -> Optional[float]:
+    """글자(연결 요소) 높이의 중앙값으로 해상도를 추정한다. 글자가 너무 적으면 None."""
+    import cv2
+    h, w = binary.shape
+    if h * w > 4_000_000:
+        # 큰 페이지는 가운데 2000x2000 영역만 봐도 글자 크기를 알 수 있다
+        top, left = max((h - 2000) // 2, 0), max((w - 2000) // 2, 0)
+        binary = binary[top:top + 2000, left:left + 2000]
+    count, _, stats, _ = cv2.connectedComponentsWithStats(255 - binary, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    # 점 노이즈와 선/그림 같은 큰 요소는 뺀다
+    glyphs = heights[(heights >= 4) & (heights <= binary.shape[0] // 10) & (widths <= heights * 4)]
+    if glyphs.size < 10:
+        return None
+    return float(np.median(glyphs)) * 300 / GLYPH_PX_AT_300DPI
+
+
+def rescale(gray: np.ndarray, dpi: Optional[float], target_dpi: int) -> np.ndarray:
+    import cv2
+    if not dpi:
+        return gray
+    scale = float(np.clip(target_dpi / dpi, 0.25, 4.0))
+    if 0.85 <= scale <= 1.2:
+        return gray
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+
+
+def skew_angle(binary: np.ndarray, max_skew: float = 5.0, step: float = 0.25, samples: int = 50_000) -> float:
+    """
+    기울기(도, 반시계 양수). 글자 픽셀 좌표를 후보 각도들로 한꺼번에 회전시켜(브로드캐스트)
+    행 히스토그램의 분산이 가장 큰 각도를 고른다 (줄이 수평일 때 줄/줄 사이 대비가 가장 크다).
+    """
+    ys, xs = np.nonzero(binary == 0)
+    if ys.size < 100:
+        return 0.0
+    if ys.size > samples:
+        pick = np.random.default_rng(0).choice(ys.size, samples, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    angles = np.deg2rad(np.arange(-max_skew, max_skew + step / 2, step))
+    rows = ys[None, :] * np.cos(angles)[:, None] + xs[None, :] * np.sin(angles)[:, None]
+    rows = np.round(rows - rows.min(axis=1, keepdims=True)).astype(np.int64)
+    width = int(rows.max()) + 1
+    # 각도별 bincount를 한 번에: 각도마다 구간을 겹치지 않게 밀어 둔다
+    hist = np.bincount((rows + np.arange(len(angles))[:, None] * width).ravel(),
+                       minlength=len(angles) * width).reshape(len(angles), width)
+    return float(np.rad2deg(angles[int(hist.var(axis=1).argmax())]))
+
+
+def rotate(gray: np.ndarray, angle: float) -> np.ndarray:
+    import cv2
+    if abs(angle) < 0.1:
+        return gray
+    h, w = gray.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), -angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (w, h), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+
+
+def noise_level(gray: np.ndarray) -> float:
+    import cv2
+    return float(np.abs(gray.astype(np.int16) - cv2.medianBlur(gray, 3)).mean())
+
+
+def denoise(gray: np.ndarray, threshold: float) -> np.ndarray:
+    import cv2
+    return cv2.medianBlur(gray, 3) if noise_level(gray) >= threshold else gray
+
+
+def crop_margins(gray: np.ndarray, binary: np.ndarray, margin: int) -> tuple[np.ndarray, np.ndarray]:
+    ink = binary == 0
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0:
+        return gray, binary
+    top, bottom = max(rows[0] - margin, 0), rows[-1] + margin + 1
+    left, right = max(cols[0] - margin, 0), cols[-1] + margin + 1
+    return gray[top:bottom, left:right], binary[top:bottom, left:right]
+
+
+def preprocess(gray: np.ndarray, config: Optional[PreprocessConfig] = None, dpi: Optional[float] = None) -> tuple[np.ndarray, dict]:
+    """
+    회색조 이미지 -> Tesseract에 넣을 이진 이미지.
+    단계: rescale(목표 dpi로) → deskew → denoise(노이즈가 클 때만) → crop(빈 여백) → Otsu 이진화
+    해상도는 글자 크기로 추정하고, 글자가 너무 적어 추정할 수 없을 때만 dpi 인자를 쓴다
+    (파일 메타데이터의 dpi는 72 같은 기본값인 경우가 많다). 반환값: (이진 이미지, 단계별 소요 시간/측정값)
+    """
+    config = config or PreprocessConfig.from_env()
+    report: dict = {}
+
+    def timed(name, fn):
+        start = time.perf_counter()
+        out = fn()
+        report[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return out
+
+    binary = None
+    if "rescale" in config.stages:
+        binary = otsu(gray)
+        dpi = timed("estimate_dpi", lambda: estimate_dpi(binary)) or dpi
+        report["dpi"] = round(dpi) if dpi else None
+        scaled = timed("rescale", lambda: rescale(gray, dpi, config.target_dpi))
+        if scaled is not gray:
+            gray, binary = scaled, None
+    if "deskew" in config.stages:
+        binary = otsu(gray) if binary is None else binary
+        angle = timed("deskew", lambda: skew_angle(binary, config.max_skew))
+        report["skew"] = angle
+        if abs(angle) >= 0.1:
+            gray, binary = rotate(gray, angle), None
+    if "denoise" in config.stages:
+        cleaned = timed("denoise", lambda: denoise(gray, config.noise_threshold))
+        if cleaned is not gray:
+            gray, binary = cleaned, None
+    binary = otsu(gray) if binary is None else binary
+    if "crop" in config.stages:
+        gray, binary = timed("crop", lambda: crop_margins(gray, binary, config.margin))
+    return binary, report
+
+
+def preprocess_file(path: str, config: Optional[PreprocessConfig] = None) -> tuple[np.ndarray, dict]:
+    import cv2
+    from PIL import Image
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError(f"Cannot read image: {path}")
+    try:
+        with Image.open(path) as img:
+            dpi = img.info.get("dpi", (None,))[0]   # 추정이 안 될 때만 쓰는 파일 메타데이터
+    except Exception:
+        dpi = None
+    return preprocess(gray, config, float(dpi) if dpi and dpi > 1 else None)
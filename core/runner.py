@@ -1,9 +1,29 @@
 # core/runner.py
 
-from typing import Callable, Any
-from core.schemas import ExecutionResult as SchemaResult
+import importlib
+from contextvars import ContextVar
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Any, NamedTuple, Optional
+from pydantic import BaseModel
+from core.schemas import (
+    ExecutionResult as SchemaResult,
+    YouTubePayload, VideoPayload, AudioPayload, ImagePayload, TextPayload,
+)
+from core.cache import ResultCache, cache_key, default_cache
+
+class PluginSpec(NamedTuple):
+    module: str
+    actions: tuple[str, ...]
+    schema: type[BaseModel]
+    version: str
 
 PLUGINS: dict[str, Callable[[dict], SchemaResult]] = {}
+SPECS: dict[str, PluginSpec] = {}
+
+def declare_plugin(name: str, module: str, actions: list[str], schema: type[BaseModel], version: str = "1") -> None:
+    # 모듈은 run_plugin()이 처음 필요로 할 때 import 된다.
+    # version은 결과 캐시 키에 들어가므로, 출력이 바뀌는 수정을 하면 올려야 한다.
+    SPECS[name] = PluginSpec(module, tuple(actions), schema, version)
 
 def register_plugin(name: str):
     def decorator(fn: Callable[[dict], SchemaResult]):
@@ -11,10 +31,103 @@ def register_plugin(name: str):
         return fn
     return decorator
 
-def run_plugin(key: str, payload: dict) -> SchemaResult:
-    if key not in PLUGINS:
+def load_plugin(key: str) -> Optional[Callable[[dict], SchemaResult]]:
+    if key not in PLUGINS and key in SPECS:
+        importlib.import_module(SPECS[key].module)
+    return PLUGINS.get(key)
+
+# 액션 하나가 끝날 때마다 (액션 이름, 끝난 수, 전체 수)로 호출된다. core.jobs가 작업 스레드에서 설정한다.
+progress_hook: ContextVar[Optional[Callable[[str, int, int], None]]] = ContextVar("progress_hook", default=None)
+
+class Action(NamedTuple):
+    name: str
+    fn: Callable[[Any, dict], Any]      # (payload 모델, 앞 단계 결과들) -> 이 단계의 결과
+    deps: tuple[str, ...] = ()
+    output: Optional[str] = None        # outputs에 넣을 키 (None이면 중간 결과로만 사용)
+
+def run_actions(actions: list[Action], requested: list[str], data: Any, max_workers: Optional[int] = None) -> SchemaResult:
+    """
+    요청된 액션과 그 의존 액션들을 DAG로 실행한다.
+    의존성이 모두 끝난 액션은 스레드 풀에서 동시에 실행되고, 각 액션의 결과는
+    products[이름]으로 뒤 단계에 전달된다 (예: to-docx가 ocr 결과를 재사용).
+    outputs에는 요청된 액션의 결과만, 요청 순서대로 담긴다.
+    """
+    graph = {a.name: a for a in actions}
+    needed: list[str] = []
+    visiting: set[str] = set()
+    def visit(name: str) -> None:
+        if name in graph and name not in needed:
+            if name in visiting:
+                raise ValueError(f"Action dependency cycle at '{name}'")
+            visiting.add(name)
+            for dep in graph[name].deps:
+                visit(dep)
+            needed.append(name)
+    for name in requested:
+        visit(name)
+
+    products: dict[str, Any] = {}
+    report = progress_hook.get()
+    if len(needed) <= 1:
+        for name in needed:
+            products[name] = graph[name].fn(data, products)
+            if report:
+                report(name, len(products), len(needed))
+    else:
+        remaining = set(needed)
+        # with 블록을 쓰지 않는다: 에러나 배치 타임아웃(SIGALRM) 때 아직 도는 형제 액션을 기다리지 않고 바로 빠져나간다
+        pool = ThreadPoolExecutor(max_workers=max_workers or len(needed))
+        try:
+            running: dict[Future, str] = {}
+            while remaining or running:
+                for name in [n for n in needed if n in remaining and all(d in products for d in graph[n].deps)]:
+                    remaining.discard(name)
+                    running[pool.submit(graph[name].fn, data, dict(products))] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    if fut.exception() is not None:
+                        raise fut.exception()
+                    products[name] = fut.result()
+                    if report:
+                        report(name, len(products), len(needed))
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+    outputs = {}
+    for name in requested:
+        action = graph.get(name)
+        if action is not None and action.output and action.output not in outputs:
+            outputs[action.output] = products[name]
+    return SchemaResult(success=True, outputs=outputs)
+
+def run_plugin(key: str, payload: dict, cache: Optional[ResultCache] = None) -> SchemaResult:
+    if key not in PLUGINS and key not in SPECS:
         return SchemaResult(success=False, outputs={"error": f"No plugin '{key}'"})
+    cache = cache or default_cache()
+    ckey = None
+    if cache is not None and key in SPECS:
+        spec = SPECS[key]
+        ckey = cache_key(key, payload, spec.schema, spec.version)
+        if ckey is not None:
+            hit = cache.get(ckey, payload.get("input_path"))
+            if hit is not None:
+                return hit  # 플러그인 모듈을 import 하지 않고 반환
     try:
-        return PLUGINS[key](payload)
+        result = load_plugin(key)(payload)
     except Exception as e:
         return SchemaResult(success=False, outputs={"error": str(e)})
+    if ckey is not None:
+        try:
+            cache.put(ckey, result, payload.get("input_path"))
+        except OSError:
+            pass  # 캐시 저장 실패는 결과에 영향을 주지 않는다
+    return result
+
+declare_plugin("youtube", "plugins.youtube", ["video", "audio", "summary"], YouTubePayload)
+declare_plugin("video",   "plugins.video",   ["audio", "summary"], VideoPayload)
+declare_plugin("audio",   "plugins.audio",   ["convert", "summary"], AudioPayload)
+declare_plugin("image",   "plugins.image",   ["ocr", "to-pdf", "to-docx", "convert", "fan-out"], ImagePayload, version="2")
+declare_plugin("text",    "plugins.text",    ["summarize", "tts", "to-pdf", "to-image"], TextPayload, version="2")
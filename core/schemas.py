@@ -21,9 +21,12 @@ class AudioPayload(BaseModel):
     summary_length: str = "short"
 
 class ImagePayload(BaseModel):
-    input_path: str
-    actions: List[str]     # ['ocr', 'to-pdf', 'to-docx', 'convert']
+    input_path: str        # An image, a PDF/TIFF, or a folder of images (bundle)
+    actions: List[str]     # ['ocr', 'to-pdf', 'to-docx', 'convert', 'fan-out']
+    inputs: List[str] = []  # More images bundled after input_path, in order
     target_format: Optional[str] = None  # For format conversion
+    outputs: List[str] = []  # For fan-out: ['png', 'webp@256', 'jpeg@320x240']
+    quality: int = 85        # JPEG/WebP quality for fan-out
 
 class TextPayload(BaseModel):
     input_path: str
@@ -34,3 +37,8 @@ class TextPayload(BaseModel):
 class ExecutionResult(BaseModel):
     success: bool
     outputs: Any
+
+class TranscriptSegment(BaseModel):
+    start: float   # seconds
+    end: float
+    text: str
@@ -0,0 +1,123 @@
+# core/subtitles.py
+
+import html
+import os
+import re
+from collections import deque
+from typing import Iterable, Iterator, Optional, Sequence
+from core.schemas import TranscriptSegment
+
+# 00:01:02.345 / 01:02.345 (VTT), 00:01:02,345 (SRT)
+_TIME = r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})"
+_TIMING = re.compile(rf"^\s*{_TIME}\s*-->\s*{_TIME}")
+_TAG = re.compile(r"<[^>]*>")   # <00:00:01.000>, <c>, </c>, <v Speaker>, <b> ...
+
+# 자동 생성 자막보다 사람이 만든 자막을, 그 안에서는 이 순서의 언어를 우선한다
+DEFAULT_LANGS = tuple(os.getenv("SUBTITLE_LANGS", "ko,en").split(","))
+
+
+def _seconds(h: Optional[str], m: str, s: str, ms: str) -> float:
+    return int(h or 0) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def clean_line(line: str) -> str:
+    return " ".join(html.unescape(_TAG.sub("", line)).split())
+
+
+def parse_cues(lines: Iterable[str]) -> Iterator[TranscriptSegment]:
+    """
+    WebVTT/SRT 줄을 읽는 대로 큐 단위로 내보낸다 (파일 전체를 메모리에 올리지 않음).
+    헤더, NOTE/STYLE/REGION 블록, 큐 번호는 건너뛰고, 인라인 타이밍/스타일 태그는 지운다.
+    """
+    timing = None
+    text: list[str] = []
+    skipping = False
+    for raw in lines:
+        line = raw.strip("﻿\r\n")
+        # 완전히 빈 줄만 큐의 끝이다. 자동 자막은 큐 안에 공백 한 칸짜리 줄(" ")을 넣는다
+        if line == "":
+            if timing and text:
+                yield TranscriptSegment(start=timing[0], end=timing[1], text="\n".join(text))
+            timing, text, skipping = None, [], False
+            continue
+        if skipping:
+            continue
+        m = _TIMING.match(line)
+        if m:
+            g = m.groups()
+            timing, text = (_seconds(*g[:4]), _seconds(*g[4:])), []
+        elif timing is None:
+            # 큐 시작 전: WEBVTT 헤더, 큐 번호/id, NOTE 등 메타 블록
+            skipping = line.startswith(("NOTE", "STYLE", "REGION"))
+        else:
+            cleaned = clean_line(line)
+            if cleaned:
+                text.append(cleaned)
+    if timing and text:
+        yield TranscriptSegment(start=timing[0], end=timing[1], text="\n".join(text))
+
+
+def dedupe_rolling(cues: Iterable[TranscriptSegment], window: int = 3) -> Iterator[str]:
+    """
+    YouTube 자동 자막은 앞 큐의 마지막 줄을 다음 큐 첫 줄로 다시 보여주고(롤링),
+    한 줄이 단어 단위로 늘어나기도 한다. 최근 window개 줄에 이미 나온 줄은 버리고,
+    직전 줄이 늘어난 경우에는 새로 붙은 부분만 내보낸다.
+    """
+    recent: deque[str] = deque(maxlen=window)
+    for cue in cues:
+        for line in cue.text.split("\n"):
+            if line in recent:
+                continue
+            last = recent[-1] if recent else ""
+            if last and line.startswith(last):
+                added = line[len(last):].strip()
+                recent[-1] = line
+                if added:
+                    yield added
+                continue
+            recent.append(line)
+            yield line
+
+
+def transcript_from_file(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return " ".join(dedupe_rolling(parse_cues(f)))
+
+
+def _matches(lang: str, wanted: str) -> bool:
+    return lang == wanted or lang.startswith(wanted + "-")
+
+
+def choose_track(info: dict, preferred: Sequence[str] = DEFAULT_LANGS) -> Optional[tuple[str, bool]]:
+    """
+    info의 subtitles/automatic_captions에서 받을 트랙을 고른다. 반환값: (언어 코드, 자동 생성 여부)
+    순서: 사람이 만든 자막(선호 언어 → 원본 언어 → 아무거나),
+          자동 자막(원본 언어 → 선호 언어; 다른 언어는 기계 번역이라 제외)
+    """
+    manual = [lang for lang in (info.get("subtitles") or {}) if lang != "live_chat"]
+    auto = list(info.get("automatic_captions") or {})
+    original = info.get("language")
+    for wanted in [*preferred, *([original] if original else [])]:
+        for lang in manual:
+            if _matches(lang, wanted):
+                return lang, False
+    if manual:
+        return manual[0], False
+    for wanted in [*([f"{original}-orig", original] if original else []), *preferred]:
+        for lang in auto:
+            if lang == wanted or (not lang.endswith("-orig") and _matches(lang, wanted)):
+                return lang, True
+    return None
+
+
+def pick_file(paths: Iterable[str], preferred: Sequence[str] = DEFAULT_LANGS) -> Optional[tuple[str, str]]:
+    """`<id>.<언어>.vtt` 파일들 중 선호 언어 순으로 하나를 고른다. 반환값: (언어 코드, 경로)"""
+    by_lang = {}
+    for path in sorted(paths):
+        parts = os.path.basename(path).rsplit(".", 2)
+        by_lang.setdefault(parts[1] if len(parts) == 3 else "und", path)
+    for wanted in preferred:
+        for lang, path in by_lang.items():
+            if _matches(lang, wanted):
+                return lang, path
+    return next(iter(by_lang.items()), None)
@@ -0,0 +1,60 @@
+# core/summarize.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+from core.llm import LLMGateway, get_gateway
+from core.textsplit import chunk_sentences, chunk_text
+
+# gpt-3.5-turbo 컨텍스트(16k)에 프롬프트와 응답 여유를 두고 잡은 청크 크기
+MAX_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+
+_MAP_PROMPT = (
+    "아래는 긴 글의 일부({index}/{total})입니다. "
+    "뒤에서 다른 부분의 요약과 합칠 수 있도록 핵심 내용을 빠짐없이 요약해 주세요.\n\n"
+    "{text}"
+)
+
+
+def _complete(gateway: LLMGateway, prompt: str, model: str) -> str:
+    return gateway.chat([{"role": "user", "content": prompt}], model=model)
+
+
+def summarize(
+    text: Union[str, Iterable[str]],
+    length: str,
+    instruction: str,
+    gateway: Optional[LLMGateway] = None,
+    model: str = "gpt-3.5-turbo",
+    max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+    concurrency: int = CONCURRENCY,
+) -> str:
+    """
+    긴 텍스트를 map-reduce로 요약한다.
+    문장/세그먼트 경계에서 청크로 나눠 최대 concurrency개씩 동시에 요약(map)하고,
+    부분 요약들이 한 청크에 들어갈 때까지 같은 방식으로 다시 묶어 요약한 뒤(reduce)
+    마지막에 instruction과 length로 최종 요약을 만든다.
+    한 청크에 들어가는 텍스트는 예전처럼 요청 한 번으로 끝난다.
+    text 대신 문장 반복자(TextDocument.sentences())를 주면 전체 문자열을 만들지 않고 청크로 묶는다.
+    """
+    gateway = gateway or get_gateway()
+    if isinstance(text, str):
+        chunks = chunk_text(text, max_chunk_tokens)
+    else:
+        chunks = list(chunk_sentences(text, max_chunk_tokens))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while len(chunks) > 1:
+            total = len(chunks)
+            prompts = [_MAP_PROMPT.format(index=i + 1, total=total, text=c) for i, c in enumerate(chunks)]
+            partials = list(pool.map(lambda p: _complete(gateway, p, model), prompts))
+            chunks = list(chunk_sentences(partials, max_chunk_tokens))
+            if len(chunks) >= total:
+                # 요약이 줄지 않으면 더 묶어봐야 의미가 없으므로 그대로 합친다
+                chunks = ["\n".join(partials)]
+    prompt = (
+        f"{instruction}\n"
+        f"길이: {'짧게' if length=='short' else '상세하게'}\n\n"
+        f"{chunks[0] if chunks else ''}"
+    )
+    return _complete(gateway, prompt, model)
@@ -0,0 +1,140 @@
+# core/textdoc.py
+
+import codecs
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+from core.textsplit import chunk_sentences, iter_sentences
+
+CHUNK_BYTES = 1 << 20
+SAMPLE_BYTES = 1 << 20   # 인코딩 판별에 보는 앞부분
+_BOMS = [(codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")]
+
+
+def _decodes(encoding: str, chunks: Iterator[bytes]) -> bool:
+    # 청크를 이어서 디코딩해 본다 (청크 경계에서 잘린 멀티바이트 글자는 다음 청크와 이어짐)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        for chunk in chunks:
+            decoder.decode(chunk)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _printable_ratio(sample: bytes, encoding: str) -> float:
+    try:
+        text = codecs.getincrementaldecoder(encoding)().decode(sample)
+    except UnicodeDecodeError:
+        return 0.0
+    if not text:
+        return 0.0
+    return sum(1 for ch in text if ch.isprintable() or ch in "\n\r\t\f") / len(text)
+
+
+def _utf16_guess(head: bytes) -> tuple[float, str]:
+    return max((_printable_ratio(head, e), e) for e in ("utf-16-le", "utf-16-be"))
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    BOM -> BOM 없는 UTF-16 (NUL 바이트가 짝/홀수 자리에 몰림) -> UTF-8 -> CP949(EUC-KR 포함) 순으로 판별.
+    한글 위주 UTF-16은 NUL이 적어 첫 단계에 안 걸리므로, NUL이 하나라도 있으면 (CP949/UTF-8 한글에는 없음)
+    CP949보다 먼저, 없으면 CP949가 실패한 뒤에만 UTF-16으로 읽어 본다 (디코딩 결과가 거의 다 출력 가능한 글자일 때).
+    순수 한글 CP949는 UTF-16으로도 깨끗이 디코딩되므로 NUL 없이 UTF-16을 먼저 고르면 안 된다.
+    sample은 파일 앞부분이므로 끝에서 잘린 글자는 실패로 보지 않는다. 다 실패하면 utf-8 (깨진 글자는 대체).
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    head = sample[:4096]
+    if head and head.count(0) > len(head) // 4:
+        odd, even = head[1::2].count(0), head[0::2].count(0)
+        return "utf-16-le" if odd > even else "utf-16-be"
+    step = 64 * 1024
+    if _decodes("utf-8", (sample[i:i + step] for i in range(0, len(sample), step))):
+        return "utf-8"
+    if 0 in head:
+        ratio, encoding = _utf16_guess(head)
+        if ratio > 0.98:
+            return encoding
+    if _decodes("cp949", (sample[i:i + step] for i in range(0, len(sample), step))):
+        return "cp949"
+    ratio, encoding = _utf16_guess(head)
+    if ratio > 0.98:
+        return encoding
+    return "utf-8"
+
+
+class TextDocument:
+    """
+    텍스트 파일 하나. 한 번 만들어 여러 작업(요약, TTS, PDF, 이미지)이 같이 쓴다.
+    내용은 mmap으로 필요한 만큼만 읽고 (페이지 캐시를 공유하므로 동시에 읽어도 파일을 여러 벌 올리지 않음),
+    인코딩은 처음 필요할 때 앞부분만 보고 한 번 판별한다. 줄/문장/청크 반복자는 매번 새로 시작하므로
+    여러 스레드에서 동시에 써도 된다.
+    """
+
+    def __init__(self, path: str, encoding: Optional[str] = None):
+        self.path = path
+        self._encoding = encoding
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, source: Union[str, "TextDocument"]) -> "TextDocument":
+        return source if isinstance(source, cls) else cls(source)
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    @contextmanager
+    def _mapped(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""   # 빈 파일은 mmap 할 수 없다
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    @property
+    def encoding(self) -> str:
+        with self._lock:
+            if self._encoding is None:
+                with self._mapped() as mm:
+                    self._encoding = detect_encoding(mm[:SAMPLE_BYTES])
+            return self._encoding
+
+    def iter_text(self, chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+        """디코딩된 텍스트를 chunk_bytes 단위로 (줄 경계와 무관)."""
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        with self._mapped() as mm:
+            for start in range(0, len(mm), chunk_bytes):
+                text = decoder.decode(mm[start:start + chunk_bytes])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+    def lines(self) -> Iterator[str]:
+        """파일 객체처럼 줄 끝("\\n")을 포함한 줄들. 폼 피드 같은 다른 구분자에서는 자르지 않는다."""
+        carry = ""
+        for text in self.iter_text():
+            parts = (carry + text).split("\n")
+            carry = parts.pop()
+            for part in parts:
+                yield part + "\n"
+        if carry:
+            yield carry
+
+    def sentences(self) -> Iterator[str]:
+        return iter_sentences(self.iter_text())
+
+    def chunks(self, max_tokens: int) -> Iterator[str]:
+        """문장 경계에서 자른 max_tokens 이하의 청크들 (요약 map 단계 입력)."""
+        return chunk_sentences(self.sentences(), max_tokens)
+
+    def read(self) -> str:
+        return "".join(self.iter_text())
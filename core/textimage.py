@@ -0,0 +1,76 @@
+# core/textimage.py
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Optional
+from core.fonts import GlyphCache, find_font, glyph_cache
+from core.textpdf import clean, wrap
+
+PAGE = (1240, 1754)     # A4, 150 dpi
+MARGIN = 40
+
+
+def _render_page(lines: list[str], out: str, glyphs: GlyphCache, ascent: int, line_height: int,
+                 page: tuple[int, int], margin: int) -> str:
+    # 글자마다 캐시된 마스크를 붙여 넣기만 한다 (FreeType 렌더링 없음).
+    # 줄의 모든 글자는 레이아웃 단계에서 이미 캐시에 들어가 있어 워커는 읽기만 한다
+    from PIL import Image
+    img = Image.new("L", page, 255)
+    paste, advance, shapes = img.paste, glyphs.__getitem__, glyphs.glyphs
+    baseline = margin + ascent
+    for line in lines:
+        x = float(margin)
+        for code in map(ord, line):
+            left, top, mask = shapes[code]
+            if mask is not None:
+                paste(0, (round(x) + left, baseline + top), mask)
+            x += advance(code)
+        baseline += line_height
+    img.save(out)
+    return os.path.abspath(out)
+
+
+def render_text_pages(
+    lines: Iterable[str],
+    out_base: str,
+    font_path: Optional[str] = None,
+    size: int = 16,
+    page: tuple[int, int] = PAGE,
+    margin: int = MARGIN,
+    workers: Optional[int] = None,
+) -> list[str]:
+    """
+    텍스트를 고정 크기 쪽 이미지들(<out_base>_001.png, ...)로 그린다.
+    줄은 한 번만 훑으며 캐시된 글자 폭으로 줄바꿈/쪽 나누기를 하고 (같은 줄을 두 번 재지 않음),
+    다 찬 쪽은 스레드 풀에서 그리고 저장한다. 대기 중인 쪽은 workers*2개까지만 둔다.
+    반환값: 쪽 이미지 경로 (순서대로)
+    """
+    glyphs, ascent, line_height = glyph_cache(font_path or find_font(), size)
+    per_page = max(1, (page[1] - 2 * margin) // line_height)
+    limit = page[0] - 2 * margin
+    workers = workers or min(4, os.cpu_count() or 1)
+    pages: list[Future] = []
+    pending: set[Future] = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def flush(batch: list[str]) -> None:
+            nonlocal pending
+            while len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()
+            out = f"{out_base}_{len(pages) + 1:03d}.png"
+            fut = pool.submit(_render_page, batch, out, glyphs, ascent, line_height, page, margin)
+            pages.append(fut)
+            pending.add(fut)
+
+        batch: list[str] = []
+        for raw in lines:
+            for line in wrap(clean(raw), glyphs, limit):
+                batch.append(line)
+                if len(batch) == per_page:
+                    flush(batch)
+                    batch = []
+        if batch or not pages:
+            flush(batch)
+        return [fut.result() for fut in pages]
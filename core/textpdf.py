@@ -0,0 +1,178 @@
+# core/textpdf.py
+
+import re
+import time
+import zlib
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Iterator, Optional
+from core.fonts import FontMetrics, find_font, load_metrics, subset_font
+
+A4 = (595.28, 841.89)   # pt
+# PDF에 쓸 수 없는 제어 문자/서로게이트는 지우고, BMP 밖 글자는 대체 문자로 (CID가 2바이트)
+_CONTROL = re.compile("[\x00-\x08\x0b-\x1f\x7f\ud800-\udfff]")
+_ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+
+def clean(line: str) -> str:
+    return _ASTRAL.sub("\ufffd", _CONTROL.sub("", line.rstrip("\r\n").expandtabs(4)))
+
+
+def wrap(line: str, widths: list[int], limit: float) -> Iterator[str]:
+    """
+    폭(1/1000 em 단위 합)이 limit을 넘지 않게 줄을 나눈다. 가능하면 공백에서 끊는다.
+    대부분의 줄은 한 번의 sum(map(...))으로 끝나고, 긴 줄만 누적 폭 + 이분 탐색으로 자른다.
+    """
+    width = widths.__getitem__
+    if sum(map(width, map(ord, line))) <= limit:
+        yield line
+        return
+    acc = list(accumulate(map(width, map(ord, line))))
+    start, base = 0, 0
+    while start < len(line):
+        end = bisect_right(acc, base + limit, lo=start)
+        if end >= len(line):
+            yield line[start:]
+            return
+        space = line.rfind(" ", start, end)
+        end = space + 1 if space > start else max(end, start + 1)
+        yield line[start:end].rstrip(" ")
+        start, base = end, acc[end - 1]
+
+
+class StreamingPdf:
+    """
+    쪽을 받는 대로 파일에 쓰는 텍스트 PDF 작성기. 메모리에는 지금 쪽과 쓰인 글자 집합,
+    객체 위치표만 남는다. 폰트(쓰인 글자만 남긴 부분 집합)와 쪽 트리는 close()에서 쓴다.
+    객체 번호: 1 카탈로그, 2 쪽 트리, 3 폰트 (쪽들이 미리 참조하므로 예약)
+    """
+
+    def __init__(self, out: str, font: FontMetrics, size: float = 10, page: tuple[float, float] = A4,
+                 margin: float = 40, leading: float = 1.3):
+        self.font, self.size, self.page, self.margin = font, size, page, margin
+        self.leading = size * leading
+        self.lines_per_page = int((page[1] - 2 * margin) // self.leading)
+        self.limit = (page[0] - 2 * margin) * 1000 / size   # 한 줄 폭 (1/1000 em)
+        self.chars: set[int] = set()
+        self.kids: list[int] = []
+        self.offsets: dict[int, int] = {}
+        self.next_obj = 4
+        self.pages = 0
+        self.f = open(out, "wb")
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _obj(self, num: Optional[int], body: bytes, stream: Optional[bytes] = None) -> int:
+        if num is None:
+            num, self.next_obj = self.next_obj, self.next_obj + 1
+        self.offsets[num] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num + body)
+        if stream is not None:
+            self.f.write(b"\nstream\n" + stream + b"\nendstream")
+        self.f.write(b"\nendobj\n")
+        return num
+
+    def add_page(self, lines: list[str]) -> None:
+        x, y = self.margin, self.page[1] - self.margin - self.size
+        ops = [f"BT /F1 {self.size:g} Tf {self.leading:.2f} TL {x:.2f} {y:.2f} Td"]
+        for line in lines:
+            if line:
+                self.chars.update(map(ord, line))
+                ops.append(f"<{line.encode('utf-16-be').hex()}> Tj T*")
+            else:
+                ops.append("T*")
+        ops.append("ET")
+        data = zlib.compress("\n".join(ops).encode("ascii"), 6)
+        content = self._obj(None, b"<< /Length %d /Filter /FlateDecode >>" % len(data), data)
+        w, h = self.page
+        self.kids.append(self._obj(None, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {w:.2f} {h:.2f}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content} 0 R >>").encode()))
+        self.pages += 1
+
+    def _widths(self) -> str:
+        # /W [cid [w w ...] ...]: 연속된 코드끼리 묶는다
+        parts, run, prev = [], [], None
+        for cid in sorted(self.chars):
+            if prev is not None and cid != prev + 1:
+                parts.append(f"{run[0][0]} [{' '.join(str(w) for _, w in run)}]")
+                run = []
+            run.append((cid, self.font.widths[cid]))
+            prev = cid
+        if run:
+            parts.append(f"{run[0][0]} [{' '.join(str(w) for _, w in run)}]")
+        return " ".join(parts)
+
+    def _write_font(self) -> None:
+        font = self.font
+        data, code_to_glyph = subset_font(font.path, frozenset(self.chars))
+        name = "UCAAAA+" + font.name
+        gid_map = bytearray(65536 * 2)
+        for code, glyph in code_to_glyph.items():
+            if code < 65536:
+                gid_map[code * 2:code * 2 + 2] = glyph.to_bytes(2, "big")
+        cid, unicode, descriptor, gids, file = range(self.next_obj, self.next_obj + 5)
+        self.next_obj += 5
+        self._obj(3, (f"<< /Type /Font /Subtype /Type0 /BaseFont /{name} /Encoding /Identity-H "
+                      f"/DescendantFonts [{cid} 0 R] /ToUnicode {unicode} 0 R >>").encode())
+        self._obj(cid, (f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name} "
+                        f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                        f"/FontDescriptor {descriptor} 0 R /DW {font.desc['MissingWidth']} "
+                        f"/W [{self._widths()}] /CIDToGIDMap {gids} 0 R >>").encode())
+        # CID = 유니코드 코드 포인트이므로 ToUnicode는 항등 매핑
+        cmap = ("/CIDInit /ProcSet findresource begin 12 dict begin begincmap "
+                "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def "
+                "/CMapName /Adobe-Identity-UCS def /CMapType 2 def "
+                "1 begincodespacerange <0000> <FFFF> endcodespacerange "
+                "1 beginbfrange <0000> <FFFF> <0000> endbfrange "
+                "endcmap CMapName currentdict /CMap defineresource pop end end").encode()
+        self._obj(unicode, b"<< /Length %d >>" % len(cmap), cmap)
+        desc = " ".join(f"/{k} {v}" for k, v in font.desc.items())
+        self._obj(descriptor, f"<< /Type /FontDescriptor /FontName /{name} {desc} /FontFile2 {file} 0 R >>".encode())
+        packed = zlib.compress(bytes(gid_map))
+        self._obj(gids, b"<< /Length %d /Filter /FlateDecode >>" % len(packed), packed)
+        packed = zlib.compress(data)
+        self._obj(file, b"<< /Length %d /Filter /FlateDecode /Length1 %d >>" % (len(packed), len(data)), packed)
+
+    def close(self) -> None:
+        if not self.pages:
+            self.add_page([])
+        self._write_font()
+        kids = " ".join(f"{k} 0 R" for k in self.kids)
+        self._obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {self.pages} >>".encode())
+        self._obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.f.tell()
+        count = self.next_obj
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+        self.f.write(b"".join(b"%010d 00000 n \n" % self.offsets[n] for n in range(1, count)))
+        self.f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref))
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.f.close()
+
+
+def render_text_pdf(lines: Iterable[str], out: str, font_path: Optional[str] = None, size: float = 10) -> dict:
+    """
+    텍스트 줄들을 한 번 훑으며 줄바꿈/쪽 나누기를 하고 쪽마다 바로 파일에 쓴다.
+    반환값: {"pages", "seconds", "pages_per_sec"}
+    """
+    start = time.perf_counter()
+    font = load_metrics(font_path or find_font(truetype_only=True))
+    with StreamingPdf(out, font, size) as pdf:
+        page: list[str] = []
+        for raw in lines:
+            for line in wrap(clean(raw), font.widths, pdf.limit):
+                page.append(line)
+                if len(page) == pdf.lines_per_page:
+                    pdf.add_page(page)
+                    page = []
+        if page:
+            pdf.add_page(page)
+    seconds = time.perf_counter() - start
+    return {"pages": pdf.pages, "seconds": round(seconds, 3), "pages_per_sec": round(pdf.pages / max(seconds, 1e-9), 1)}
@@ -0,0 +1,92 @@
+# core/textsplit.py
+
+import re
+from typing import Iterable, Iterator
+
+# 경계 없이 이 길이를 넘는 텍스트는 그대로 한 조각으로 내보낸다 (끝없는 한 줄 대비)
+MAX_CARRY = 1 << 20
+
+# 문장 끝(. ! ? 。 ！ ？ …) 뒤의 공백, 또는 줄바꿈(자막/전사 세그먼트 경계)에서 자른다
+_BOUNDARY = re.compile(r"(?<=[.!?。！？…])\s+|\s*\n+\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    tokenizer 없이 쓰는 보수적인 토큰 수 추정.
+    영문 등 ASCII는 약 4자당 1토큰, 한글 등 비ASCII는 글자당 1토큰으로 본다.
+    """
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def split_sentences(text: str) -> Iterator[str]:
+    for piece in _BOUNDARY.split(text):
+        piece = piece.strip()
+        if piece:
+            yield piece
+
+
+def iter_sentences(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    조각(디코딩된 청크)으로 들어오는 텍스트에서 문장을 바로바로 내보낸다.
+    조각 끝의 마무리되지 않은 문장은 다음 조각과 이어서 자른다.
+    """
+    carry = ""
+    for piece in pieces:
+        parts = _BOUNDARY.split(carry + piece)
+        carry = parts.pop()
+        for part in parts:
+            part = part.strip()
+            if part:
+                yield part
+        if len(carry) > MAX_CARRY:
+            yield carry.strip()
+            carry = ""
+    if carry.strip():
+        yield carry.strip()
+
+
+def _hard_split(sentence: str, max_tokens: int) -> Iterator[str]:
+    # 한 문장이 max_tokens보다 길면 공백 기준으로, 그래도 길면 글자 수 기준으로 자른다
+    buf, size = [], 0
+    for word in sentence.split(" "):
+        cost = estimate_tokens(word) + 1
+        if cost > max_tokens:
+            if buf:
+                yield " ".join(buf)
+                buf, size = [], 0
+            step = max(1, max_tokens)
+            for i in range(0, len(word), step):
+                yield word[i:i + step]
+            continue
+        if size + cost > max_tokens and buf:
+            yield " ".join(buf)
+            buf, size = [], 0
+        buf.append(word)
+        size += cost
+    if buf:
+        yield " ".join(buf)
+
+
+def chunk_sentences(sentences: Iterable[str], max_tokens: int) -> Iterator[str]:
+    """문장들을 순서대로 이어 붙여 max_tokens 이하의 청크로 묶는다."""
+    buf, size = [], 0
+    for sentence in sentences:
+        cost = estimate_tokens(sentence) + 1
+        if cost > max_tokens:
+            if buf:
+                yield " ".join(buf)
+                buf, size = [], 0
+            yield from _hard_split(sentence, max_tokens)
+            continue
+        if size + cost > max_tokens and buf:
+            yield " ".join(buf)
+            buf, size = [], 0
+        buf.append(sentence)
+        size += cost
+    if buf:
+        yield " ".join(buf)
+
+
+def chunk_text(text: str, max_tokens: int) -> list[str]:
+    return list(chunk_sentences(split_sentences(text), max_tokens))
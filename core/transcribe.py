@@ -0,0 +1,106 @@
+# core/transcribe.py
+
+import asyncio
+import subprocess
+from typing import AsyncIterator, Iterable, Iterator, Sequence, Union
+import numpy as np
+from core.ffmpeg import FFMPEG
+from core.models import whisper_model
+from core.schemas import TranscriptSegment
+
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30.0
+
+
+def pcm_windows(
+    path: str,
+    window_seconds: float = WINDOW_SECONDS,
+    outputs: Sequence[str] = (),
+) -> Iterator[np.ndarray]:
+    """
+    ffmpeg로 16 kHz mono PCM을 디코딩하면서 window_seconds 길이씩 float32 배열로 내보낸다.
+    파일 길이와 관계없이 메모리에는 윈도 하나만 올라간다.
+    outputs는 같은 ffmpeg 프로세스가 함께 쓸 출력 인자다 (예: 오디오 파일). 그 파일은 윈도를
+    끝까지 읽어야 완성되며, 이때는 ffmpeg가 실패하면 항상 예외를 낸다.
+    """
+    cmd = [FFMPEG, "-nostdin", "-y", "-i", path, *outputs, "-vn", "-f", "s16le", "-ac", "1",
+           "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"]
+    window_bytes = int(window_seconds * SAMPLE_RATE) * 2
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    produced = False
+    try:
+        while True:
+            buf = proc.stdout.read(window_bytes)
+            if not buf:
+                break
+            produced = True
+            yield np.frombuffer(buf[: len(buf) // 2 * 2], np.int16).astype(np.float32) / 32768.0
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+    if proc.returncode != 0 and (outputs or not produced):
+        raise RuntimeError(f"ffmpeg failed to decode audio from {path} (exit {proc.returncode})")
+
+
+def array_windows(pcm: np.ndarray, window_seconds: float = WINDOW_SECONDS) -> Iterator[np.ndarray]:
+    # 이미 디코딩된 16 kHz mono 버퍼를 윈도 단위로 float32 변환 (전체를 한 번에 변환하지 않음)
+    step = int(window_seconds * SAMPLE_RATE)
+    for start in range(0, len(pcm), step):
+        window = pcm[start:start + step]
+        if window.dtype == np.int16:
+            window = window.astype(np.float32) / 32768.0
+        yield window
+
+
+def stream_transcript(
+    source: Union[str, np.ndarray, Iterable[np.ndarray]],
+    model_name: str = "base",
+    window_seconds: float = WINDOW_SECONDS,
+) -> Iterator[TranscriptSegment]:
+    """
+    오디오를 고정 길이 윈도 단위로 Whisper에 넣고, 세그먼트가 나오는 대로 타임스탬프와 함께 내보낸다.
+    source는 파일 경로, 16 kHz mono PCM 버퍼, 또는 core.media.demux_audio가 만든 윈도 이터레이터다.
+    이전 윈도의 끝부분을 다음 윈도의 initial_prompt로 넘겨 문맥을 잇는다.
+    공유 모델은 윈도 하나를 전사하는 동안 잠기므로 여러 작업이 동시에 불러도 안전하다.
+    """
+    offset = 0.0
+    prompt = None
+    if isinstance(source, str):
+        windows = pcm_windows(source, window_seconds)
+    elif isinstance(source, np.ndarray):
+        windows = array_windows(source, window_seconds)
+    else:
+        windows = source
+    for window in windows:
+        # 전사하는 동안만 모델을 잡고 있는다 (세그먼트를 내보내는 동안은 다른 작업이 쓸 수 있음)
+        with whisper_model(model_name) as (model, fp16):
+            result = model.transcribe(window, fp16=fp16, initial_prompt=prompt)
+        for seg in result.get("segments", []):
+            text = seg["text"].strip()
+            if text:
+                yield TranscriptSegment(start=offset + seg["start"], end=offset + seg["end"], text=text)
+        prompt = result.get("text", "")[-200:] or None
+        offset += len(window) / SAMPLE_RATE
+
+
+async def astream_transcript(source: Union[str, np.ndarray, Iterable[np.ndarray]], **kwargs) -> AsyncIterator[TranscriptSegment]:
+    # 동기 제너레이터를 스레드에서 한 세그먼트씩 진행시킨다
+    it = stream_transcript(source, **kwargs)
+    sentinel = object()
+    while True:
+        seg = await asyncio.to_thread(next, it, sentinel)
+        if seg is sentinel:
+            break
+        yield seg
+
+
+def transcribe(source: Union[str, np.ndarray, Iterable[np.ndarray]], model_name: str = "base") -> str:
+    return " ".join(seg.text for seg in stream_transcript(source, model_name))
+
+
+def format_timestamp(seconds: float) -> str:
+    minutes, sec = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{sec:05.2f}" if hours else f"{minutes:02d}:{sec:05.2f}"
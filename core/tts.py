@@ -0,0 +1,183 @@
+# core/tts.py
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+from core.ffmpeg import TranscodeError, transcode
+from core.textsplit import split_sentences
+
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+TTS_LANG = os.getenv("TTS_LANG", "ko")
+CHUNK_CHARS = int(os.getenv("TTS_CHUNK_CHARS", "400"))
+ESPEAK = os.getenv("ESPEAK_BINARY", "espeak-ng")
+
+_SOFT_BREAK = re.compile(r"[,;:，、]\s+|\s+")
+
+
+def chunk_text(text: Union[str, Iterable[str]], max_chars: int = CHUNK_CHARS) -> list[str]:
+    """
+    문장 하나가 조각 하나. 문장 단위로 캐시되므로 문서를 고치면 바뀐 문장만 다시 합성한다.
+    max_chars보다 긴 문장은 쉼표/공백에서 나눈다. text는 문자열 또는 문장 반복자.
+    """
+    chunks = []
+    for sentence in (split_sentences(text) if isinstance(text, str) else text):
+        while len(sentence) > max_chars:
+            cut = max((m.end() for m in _SOFT_BREAK.finditer(sentence, 0, max_chars)), default=max_chars)
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+class GTTSBackend:
+    """Google Translate TTS (온라인, mp3)."""
+    name = "gtts"
+    ext = "mp3"
+
+    def __init__(self, lang: str = TTS_LANG):
+        self.lang = lang
+
+    def synthesize(self, text: str, out: str) -> None:
+        from gtts import gTTS
+        gTTS(text=text, lang=self.lang).save(out)
+
+
+class EspeakBackend:
+    """espeak-ng (오프라인, wav)."""
+    name = "espeak"
+    ext = "wav"
+
+    def __init__(self, lang: str = TTS_LANG):
+        self.lang = lang
+
+    def synthesize(self, text: str, out: str) -> None:
+        try:
+            subprocess.run([ESPEAK, "-v", self.lang, "-w", out, text], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError(f"{ESPEAK} not found (set ESPEAK_BINARY or TTS_BACKEND=gtts)")
+
+
+BACKENDS = {"gtts": GTTSBackend, "espeak": EspeakBackend}
+
+
+def make_backend(name: Optional[str] = None, lang: Optional[str] = None):
+    name = name or TTS_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](lang or TTS_LANG)
+
+
+def default_cache_dir() -> str:
+    return os.getenv("UC_TTS_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "universal-converter", "tts")
+
+
+def chunk_path(cache_dir: str, backend, text: str) -> str:
+    key = hashlib.sha256(f"{backend.name}\0{backend.lang}\0{text}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key[:2], f"{key}.{backend.ext}")
+
+
+def _synthesize_chunk(backend, text: str, path: str) -> bool:
+    # 캐시에 있으면 그대로 쓴다. 반환값: 새로 합성했는지
+    if os.path.exists(path):
+        os.utime(path)   # 최근 사용 시각 (prune 기준)
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        backend.synthesize(text, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return True
+
+
+def prune(cache_dir: str, max_bytes: int) -> None:
+    # 용량을 넘으면 가장 오래 안 쓴 조각부터 지운다
+    files = []
+    for dirpath, _, names in os.walk(cache_dir):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def concat(paths: list[str], out: str, fmt: str) -> None:
+    """
+    조각들을 순서대로 이어 붙인다. 조각 포맷이 출력과 같으면 ffmpeg concat demuxer로
+    재인코딩 없이 (-c copy), 다르면 한 번만 인코딩한다. ffmpeg가 없으면 mp3는 프레임을 그대로 잇는다.
+    """
+    same = all(p.endswith(f".{fmt}") for p in paths)
+    if len(paths) == 1 and same:
+        shutil.copyfile(paths[0], out)
+        return
+    fd, listing = tempfile.mkstemp(suffix=".txt", prefix="uc-tts-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for p in paths:
+                escaped = os.path.abspath(p).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        try:
+            transcode(listing, out, ["-c", "copy"] if same else [], input_args=["-f", "concat", "-safe", "0"])
+        except TranscodeError as e:
+            if e.reason != "missing" or not (same and fmt == "mp3"):
+                raise
+            with open(out, "wb") as dst:
+                for p in paths:
+                    with open(p, "rb") as src:
+                        shutil.copyfileobj(src, dst)
+    finally:
+        os.remove(listing)
+
+
+def synthesize(
+    text: Union[str, Iterable[str]],
+    out: str,
+    fmt: str = "mp3",
+    backend=None,
+    workers: int = 4,
+    cache_dir: Optional[str] = None,
+    max_cache_mb: Optional[int] = None,
+) -> dict:
+    """
+    긴 텍스트를 문장 단위로 나눠 backend로 동시에 합성하고 순서대로 이어 out에 쓴다.
+    조각은 (backend, 언어, 문장) 해시로 캐시된다. 반환값: {"chunks", "synthesized", "seconds"}
+    """
+    start = time.perf_counter()
+    backend = backend or make_backend()
+    cache_dir = cache_dir or default_cache_dir()
+    chunks = chunk_text(text)
+    if not chunks:
+        raise ValueError("No text to synthesize")
+    paths = [chunk_path(cache_dir, backend, c) for c in chunks]
+    # 같은 문장이 여러 번 나오면 한 번만 합성한다
+    unique = dict(zip(paths, chunks))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique)))) as pool:
+        synthesized = sum(pool.map(lambda item: _synthesize_chunk(backend, item[1], item[0]), unique.items()))
+    concat(paths, out, fmt)
+    if max_cache_mb is None:
+        max_cache_mb = int(os.getenv("UC_TTS_CACHE_MB", "1024"))
+    if max_cache_mb:
+        prune(cache_dir, max_cache_mb * 1024 * 1024)
+    return {"chunks": len(chunks), "synthesized": synthesized, "seconds": round(time.perf_counter() - start, 3)}
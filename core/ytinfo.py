@@ -0,0 +1,129 @@
+# core/ytinfo.py
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+_YT_ID = re.compile(r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})")
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    m = _YT_ID.search(url or "")
+    return m.group(1) if m else None
+
+
+_YT_COLLECTION = re.compile(r"youtube\.com/(?:playlist\?|@|channel/|c/|user/)")
+
+
+def is_collection_url(url: str) -> bool:
+    # 재생목록/채널 URL. watch?v=...&list=... 는 단일 영상으로 본다 (noplaylist)
+    return bool(_YT_COLLECTION.search(url or ""))
+
+
+class InfoCache:
+    """
+    yt-dlp extract_info 결과(info dict)를 video id 키로 ttl초 동안 보관한다.
+    메모리에 두고, root를 주면 JSON 파일로도 남겨 다른 프로세스(batch 워커)와 공유한다.
+    포맷 URL은 몇 시간 뒤 만료되므로 ttl은 짧게 둔다.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: float = 3600, clock: Callable[[], float] = time.time):
+        self.root = os.path.abspath(root) if root else None
+        self.ttl = ttl
+        self._clock = clock
+        self._memory: dict[str, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._aliases: dict[str, str] = {}   # 비표준 URL -> video id
+        self.hits = 0
+        self.misses = 0
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.root, f"{video_id}.json")
+
+    def get(self, video_id: str) -> Optional[dict]:
+        with self._lock:
+            stored = self._memory.get(video_id)
+        if stored is None and self.root:
+            try:
+                with open(self._path(video_id), encoding="utf-8") as f:
+                    raw = json.load(f)
+                stored = (raw["fetched"], raw["info"])
+            except (OSError, ValueError, KeyError):
+                stored = None
+        with self._lock:
+            if stored is None or self._clock() - stored[0] > self.ttl:
+                self.misses += 1
+                return None
+            self._memory[video_id] = stored
+            self.hits += 1
+            return stored[1]
+
+    def put(self, video_id: str, info: dict) -> None:
+        now = self._clock()
+        with self._lock:
+            self._memory[video_id] = (now, info)
+        if self.root:
+            tmp = f"{self._path(video_id)}.{uuid.uuid4().hex}.part"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fetched": now, "info": info}, f, ensure_ascii=False)
+            os.replace(tmp, self._path(video_id))
+
+    def invalidate(self, video_id: str) -> None:
+        with self._lock:
+            self._memory.pop(video_id, None)
+        if self.root:
+            try:
+                os.remove(self._path(video_id))
+            except FileNotFoundError:
+                pass
+
+    def resolve(self, video_id: Optional[str], fetch: Callable[[], dict], alias: Optional[str] = None) -> dict:
+        """
+        캐시된 info를 돌려주고, 없으면 fetch()를 한 번만 호출해 저장한다.
+        같은 id를 동시에 요청하면 나머지는 첫 번째 호출 결과를 기다린다.
+        video_id를 모르면 (비표준 URL) fetch 결과의 id로 저장하고, alias(URL)로 다시 찾을 수 있게 기억한다.
+        """
+        if video_id is None and alias is not None:
+            with self._lock:
+                video_id = self._aliases.get(alias)
+        if video_id is None:
+            info = fetch()
+            self.put(info["id"], info)
+            if alias is not None:
+                with self._lock:
+                    self._aliases[alias] = info["id"]
+            return info
+        with self._lock:
+            key_lock = self._key_locks.setdefault(video_id, threading.Lock())
+        with key_lock:
+            info = self.get(video_id)
+            if info is None:
+                info = fetch()
+                self.put(video_id, info)
+            return info
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_caches: dict[str, InfoCache] = {}
+_caches_lock = threading.Lock()
+
+
+def info_cache() -> InfoCache:
+    # 다운로드 저장소 안의 .yt-info 폴더를 함께 쓴다
+    from core.artifacts import default_store_dir
+    root = os.path.join(default_store_dir(), ".yt-info")
+    with _caches_lock:
+        if root not in _caches:
+            ttl = float(os.getenv("UC_YT_INFO_TTL_MINUTES", "60")) * 60
+            _caches[root] = InfoCache(root, ttl=ttl)
+        return _caches[root]
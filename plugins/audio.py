@@ -1,46 +1,36 @@
-import os, torch
-from core.runner import register_plugin
+import os
+from core.runner import Action, register_plugin, run_actions
 from core.schemas import AudioPayload, ExecutionResult
-from whisper import load_model
-from openai import OpenAI
-from dotenv import load_dotenv
+from core.ffmpeg import default_pool
+from core.transcribe import transcribe
+from core.summarize import summarize
 
-load_dotenv()  
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Independent actions run concurrently; "summary" waits on "transcript"
+ACTIONS = [
+    Action("convert", lambda d, p: convert_format(d.input_path, d.target_format), output="converted"),
+    Action("transcript", lambda d, p: transcribe_audio(d.input_path)),
+    Action("summary", lambda d, p: summarize_text(p["transcript"], d.summary_length), ("transcript",), "summary"),
+]
 
 @register_plugin("audio")
 def audio_plugin(payload: dict) -> ExecutionResult:
     data = AudioPayload(**payload)
-    outputs = {}
-    if "convert" in data.actions:
-        outputs["converted"] = convert_format(data.input_path, data.target_format)
-    if "summary" in data.actions:
-        transcript = transcribe_audio(data.input_path)
-        outputs["summary"] = summarize_text(transcript, data.summary_length)
-    return ExecutionResult(success=True, outputs=outputs)
+    return run_actions(ACTIONS, data.actions, data)
 
 def convert_format(path: str, fmt: str) -> str:
     base, _ = os.path.splitext(path)
     out = f"{base}.{fmt}"
-    os.system(f'ffmpeg -y -i "{path}" "{out}"')
+    if os.path.abspath(out) == os.path.abspath(path):
+        return os.path.abspath(out)  # already in the target format; ffmpeg can't write in place
+    # Shared pool caps concurrent ffmpeg processes; raises TranscodeError on failure
+    default_pool().submit(path, out).result()
     return os.path.abspath(out)
 
 def transcribe_audio(path: str) -> str:
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = load_model("base", device=device)
-    result = model.transcribe(path, fp16=(device=="cuda"))
-    return result.get("text", "")
+    # Whisper on fixed windows, so memory stays flat for long recordings
+    return transcribe(path)
 
 def summarize_text(text: str, length: str) -> str:
     if not text:
         return "No transcript available."
-    prompt = (
-        "아래 오디오 전사 내용을 요약해 주세요.\n"
-        f"길이: {'짧게' if length=='short' else '상세하게'}\n\n"
-        f"{text}"
-    )
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role":"user","content":prompt}],
-    )
-    return resp.choices[0].message.content.strip()
+    return summarize(text, length, "아래 오디오 전사 내용을 요약해 주세요.")
@@ -1,54 +1,94 @@
-import os, glob
-from core.runner import register_plugin
+import os
+from typing import Optional
+from core.runner import Action, register_plugin, run_actions
 from core.schemas import ImagePayload, ExecutionResult
-from PIL import Image
-import pytesseract
-import cv2
-import img2pdf
-from docx import Document
+
+# to-docx reuses the ocr result instead of running Tesseract again.
+# Multi-page PDF/TIFF inputs are OCR'd once ("document") and that pass writes the
+# text, the searchable PDF and the DOCX that were requested.
+# A folder of images (or input_path + inputs) is a bundle: one PDF/DOCX/text for all pages,
+# with every page OCR'd once ("page-text") and shared by ocr and to-docx
+ACTIONS = [
+    Action("document", lambda d, p: ocr_document_outputs(d.input_path, d.actions)),
+    Action("bundle", lambda d, p: bundle_inputs(d.input_path, d.inputs)),
+    Action("page-text", lambda d, p: list(ocr_images(p["bundle"])) if p["bundle"] else None, ("bundle",)),
+    Action("ocr", lambda d, p: _ocr(d, p), ("document", "bundle", "page-text"), "text"),
+    Action("to-pdf", lambda d, p: _to_pdf(d, p), ("document", "bundle"), "pdf"),
+    Action("to-docx", lambda d, p: _to_docx(d, p), ("document", "bundle", "page-text", "ocr"), "docx"),
+    Action("convert", lambda d, p: convert_format(d.input_path, d.target_format), output="converted"),
+    Action("fan-out", lambda d, p: fan_out_image(d.input_path, d.outputs, d.quality), output="images"),
+]
 
 @register_plugin("image")
 def image_plugin(payload: dict) -> ExecutionResult:
     data = ImagePayload(**payload)
-    outputs = {}
-    if "ocr" in data.actions:
-        outputs["text"] = perform_ocr(data.input_path)
-    if "to-pdf" in data.actions:
-        outputs["pdf"] = convert_to_pdf(data.input_path)
-    if "to-docx" in data.actions:
-        outputs["docx"] = convert_to_docx(data.input_path)
-    if "convert" in data.actions:
-        outputs["converted"] = convert_format(data.input_path, data.target_format)
-    return ExecutionResult(success=True, outputs=outputs)
+    return run_actions(ACTIONS, data.actions, data)
+
+
+def _ocr(data: ImagePayload, products: dict) -> str:
+    if products["document"]:
+        return products["document"]["text"]
+    if products["bundle"]:
+        from core.bundle import bundle_base, write_text
+        return write_text(products["page-text"], bundle_base(data.input_path) + ".txt")
+    return perform_ocr(data.input_path)
+
+
+def _to_pdf(data: ImagePayload, products: dict) -> str:
+    if products["document"]:
+        return products["document"]["pdf"]
+    if products["bundle"]:
+        from core.bundle import bundle_base, bundle_pdf
+        return bundle_pdf(products["bundle"], bundle_base(data.input_path) + ".pdf")
+    return convert_to_pdf(data.input_path)
+
+
+def _to_docx(data: ImagePayload, products: dict) -> str:
+    if products["document"]:
+        return products["document"]["docx"]
+    if products["bundle"]:
+        from core.bundle import bundle_base, bundle_docx
+        return bundle_docx(products["page-text"], bundle_base(data.input_path) + ".docx")
+    return convert_to_docx(data.input_path, products["ocr"])
+
+
+def bundle_inputs(path: str, extra: list[str]) -> Optional[list[str]]:
+    from core.bundle import bundle_inputs
+    return bundle_inputs(path, extra)
+
+
+def ocr_images(images: list[str]):
+    from core.bundle import ocr_images
+    return ocr_images(images)
+
+
+def ocr_document_outputs(path: str, actions: list[str]) -> Optional[dict]:
+    from core.document import is_document, ocr_document
+    if not is_document(path):
+        return None
+    wanted = {"to-pdf": "pdf", "to-docx": "docx"}
+    return ocr_document(path, ["text"] + [wanted[a] for a in actions if a in wanted])
 
 
 def perform_ocr(path: str) -> str:
-    # Open image with OpenCV for preprocessing
-    img = cv2.imread(path)
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    # Apply Otsu's thresholding
-    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    # Optionally resize to improve recognition
-    # thresh = cv2.resize(thresh, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-    # Convert back to PIL Image
-    pil_img = Image.fromarray(thresh)
-    # Configure Tesseract: LSTM engine + automatic page segmentation
-    custom_config = r'--oem 1 --psm 3'
-    # Recognize both English and Korean
-    text = pytesseract.image_to_string(pil_img, lang='eng+kor', config=custom_config)
-    return text
+    from core.ocr import ocr_file
+    # Otsu-binarized image -> Tesseract (LSTM engine, automatic page segmentation, eng+kor).
+    # The engine keeps its language data loaded between calls (one per thread)
+    return ocr_file(path).text
 
 
 def convert_to_pdf(path: str) -> str:
+    import img2pdf
     out = os.path.splitext(path)[0] + ".pdf"
     with open(out, "wb") as f:
         f.write(img2pdf.convert(path))
     return os.path.abspath(out)
 
 
-def convert_to_docx(path: str) -> str:
-    text = perform_ocr(path)
+def convert_to_docx(path: str, text: Optional[str] = None) -> str:
+    from docx import Document
+    if text is None:
+        text = perform_ocr(path)
     doc = Document()
     doc.add_paragraph(text)
     out = os.path.splitext(path)[0] + ".docx"
@@ -57,7 +97,15 @@ def convert_to_docx(path: str) -> str:
 
 
 def convert_format(path: str, fmt: str) -> str:
+    from PIL import Image
     img = Image.open(path)
     out = os.path.splitext(path)[0] + f".{fmt}"
     img.save(out, fmt.upper())
     return os.path.abspath(out)
+
+
+def fan_out_image(path: str, outputs: list[str], quality: int = 85) -> dict[str, str]:
+    from core.fanout import fan_out
+    # Decode once (JPEG: reduced-size draft decode when every output is smaller),
+    # then resize and encode every output concurrently
+    return fan_out(path, outputs, quality)
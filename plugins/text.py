@@ -1,112 +1,61 @@
 import os
-import io
-from core.runner import register_plugin
+from typing import Union
+from core.runner import Action, register_plugin, run_actions
 from core.schemas import TextPayload, ExecutionResult
-from openai import OpenAI
-from gtts import gTTS
-from fpdf import FPDF
-from PIL import Image, ImageDraw, ImageFont
-from dotenv import load_dotenv
+from core.summarize import summarize
+from core.textdoc import TextDocument
 
-# Load environment variables and initialize OpenAI client
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-@register_plugin("text")
-def text_plugin(payload: dict) -> ExecutionResult:
-    data = TextPayload(**payload)
-    outputs = {}
+# The input is opened once per run as a shared TextDocument (memory-mapped, encoding
+# detected once); the actions below then run concurrently, each streaming from it
+ACTIONS = [
+    Action("document", lambda d, p: TextDocument(d.input_path)),
     # Summarize text
-    if "summarize" in data.actions:
-        outputs["summary"] = summarize_text_from_file(data.input_path, data.summary_length)
+    Action("summarize", lambda d, p: summarize_text_from_file(p["document"], d.summary_length), ("document",), "summary"),
     # Text-to-speech
-    if "tts" in data.actions:
-        outputs["audio"] = text_to_speech_from_file(data.input_path, data.tts_format)
+    Action("tts", lambda d, p: text_to_speech(p["document"], d.tts_format), ("document",), "audio"),
     # Convert to PDF
-    if "to-pdf" in data.actions:
-        outputs["pdf"] = text_to_pdf(data.input_path)
+    Action("to-pdf", lambda d, p: text_to_pdf(p["document"]), ("document",), "pdf"),
     # Convert to Image
-    if "to-image" in data.actions:
-        outputs["image"] = text_to_image(data.input_path)
-    return ExecutionResult(success=True, outputs=outputs)
+    Action("to-image", lambda d, p: text_to_image(p["document"]), ("document",), "image"),
+]
 
+@register_plugin("text")
+def text_plugin(payload: dict) -> ExecutionResult:
+    data = TextPayload(**payload)
+    return run_actions(ACTIONS, data.actions, data)
 
-def summarize_text_from_file(path: str, length: str) -> str:
-    # Read file with UTF-8 encoding
-    with open(path, encoding="utf-8") as f:
-        raw_text = f.read()
-    # Create prompt
-    prompt = (
-        "아래 내용을 요약해 주세요.\n"
-        f"길이: {'짧게' if length=='short' else '상세하게'}\n\n"
-        f"{raw_text}"
-    )
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role":"user","content":prompt}],
-    )
-    return resp.choices[0].message.content.strip()
 
+def summarize_text_from_file(source: Union[str, TextDocument], length: str) -> str:
+    doc = TextDocument.of(source)
+    # Sentences are streamed into token-sized chunks that are summarized in parallel (map-reduce)
+    return summarize(doc.sentences(), length, "아래 내용을 요약해 주세요.")
 
-def text_to_speech_from_file(path: str, fmt: str) -> str:
-    # Read text
-    with open(path, encoding="utf-8") as f:
-        text = f.read()
-    # Generate TTS (Ko-kr assumed)
-    tts = gTTS(text=text, lang="ko")
-    out = os.path.splitext(path)[0] + f".{fmt}"
-    tts.save(out)
+
+def text_to_speech(source: Union[str, TextDocument], fmt: str) -> str:
+    from core.tts import synthesize
+    doc = TextDocument.of(source)
+    # Sentence-sized chunks are synthesized concurrently by the TTS_BACKEND (gtts or espeak),
+    # cached by text hash and joined in order by ffmpeg without re-encoding when possible
+    out = os.path.splitext(doc.path)[0] + f".{fmt}"
+    synthesize(doc.sentences(), out, fmt)
     return os.path.abspath(out)
 
 
-def text_to_pdf(path: str) -> str:
-    # Initialize PDF with Unicode font (Arial)
-    pdf = FPDF()
-    pdf.add_page()
-    # 한글 깨짐 방지를 위해 Malgun Gothic 사용
-    font_path = r"C:\Windows\Fonts\malgun.ttf"
-    pdf.add_font("MalgunGothic", "", font_path, uni=True)
-    pdf.set_font("MalgunGothic", size=12)
-    # Write lines
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            pdf.multi_cell(0, 10, line.strip(), align='L')
-    out = os.path.splitext(path)[0] + ".pdf"
-    pdf.output(out)
+def text_to_pdf(source: Union[str, TextDocument]) -> str:
+    from core.textpdf import render_text_pdf
+    doc = TextDocument.of(source)
+    # One streaming pass: lines are wrapped with cached font metrics and every page is
+    # written out as soon as it is full, so memory stays flat for very large files.
+    # The font (TEXT_FONT or an installed CJK font) is embedded as a subset of the used glyphs
+    out = os.path.splitext(doc.path)[0] + ".pdf"
+    render_text_pdf(doc.lines(), out)
     return os.path.abspath(out)
 
 
-def text_to_image(path: str) -> str:
-    # Read text
-    with open(path, encoding="utf-8") as f:
-        text = f.read()
-    # 한글 지원되는 Malgun Gothic 폰트로 경로 변경
-    font_path = r"C:\Windows\Fonts\malgun.ttf"
-    font = ImageFont.truetype(font_path, size=16)
-    # Split lines
-    lines = text.splitlines() or ['']
-    # Create dummy image for text size calculations
-    dummy_img = Image.new('RGB', (1, 1), color='white')
-    draw_dummy = ImageDraw.Draw(dummy_img)
-    # Calculate max width and line height using textbbox
-    max_width = 0
-    line_height = 0
-    for line in lines:
-        bbox = draw_dummy.textbbox((0, 0), line, font=font)
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
-        max_width = max(max_width, width)
-        line_height = max(line_height, height)
-    padding = 10
-    img_width = max_width + padding * 2
-    img_height = line_height * len(lines) + padding * 2
-    # Create final image
-    img = Image.new('RGB', (img_width, img_height), color='white')
-    draw = ImageDraw.Draw(img)
-    y = padding
-    for line in lines:
-        draw.text((padding, y), line, font=font, fill='black')
-        y += line_height
-    out = os.path.splitext(path)[0] + ".png"
-    img.save(out)
-    return os.path.abspath(out)
+def text_to_image(source: Union[str, TextDocument]) -> list[str]:
+    from core.textimage import render_text_pages
+    doc = TextDocument.of(source)
+    # Fixed-size A4 pages (<name>_001.png, ...) instead of one canvas as tall as the file.
+    # Layout is a single pass using cached glyph metrics; full pages are drawn from the
+    # cached glyph bitmaps and saved in parallel
+    return render_text_pages(doc.lines(), os.path.splitext(doc.path)[0])
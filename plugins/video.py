@@ -1,48 +1,42 @@
-import os, torch
-from core.runner import register_plugin
+from typing import Iterable, Union
+import numpy as np
+from core.runner import Action, register_plugin, run_actions
 from core.schemas import VideoPayload, ExecutionResult
-from moviepy.editor import VideoFileClip
-from openai import OpenAI
-from whisper import load_model
-from dotenv import load_dotenv
+from core.media import demux_audio
+from core.transcribe import transcribe
+from core.summarize import summarize
 
-load_dotenv()  
+def _decode(data: VideoPayload) -> tuple:
+    if "summary" not in data.actions:
+        return extract_audio(data.input_path, data.audio_format), None
+    # Decode the audio track once: the same pass writes the audio file (if asked)
+    # and streams 16 kHz PCM windows straight into Whisper, so the file is
+    # complete once the transcript is
+    fmt = data.audio_format if "audio" in data.actions else None
+    audio_path, windows = demux_audio(data.input_path, fmt)
+    return audio_path, get_transcript(windows)
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+ACTIONS = [
+    Action("decode", lambda d, p: _decode(d)),
+    Action("audio", lambda d, p: p["decode"][0], ("decode",), "audio"),
+    Action("transcript", lambda d, p: p["decode"][1], ("decode",)),
+    Action("summary", lambda d, p: summarize_text(p["transcript"], d.summary_length), ("transcript",), "summary"),
+]
 
 @register_plugin("video")
 def video_plugin(payload: dict) -> ExecutionResult:
     data = VideoPayload(**payload)
-    outputs = {}
-    if "audio" in data.actions:
-        outputs["audio"] = extract_audio(data.input_path, data.audio_format)
-    if "summary" in data.actions:
-        transcript = get_transcript(data.input_path)
-        outputs["summary"] = summarize_text(transcript, data.summary_length)
-    return ExecutionResult(success=True, outputs=outputs)
+    return run_actions(ACTIONS, data.actions, data)
 
 def extract_audio(path: str, fmt: str) -> str:
-    clip = VideoFileClip(path)
-    out = os.path.splitext(path)[0] + f".{fmt}"
-    clip.audio.write_audiofile(out)
-    return os.path.abspath(out)
+    # Audio stream only; video frames are never decoded
+    audio_path, _ = demux_audio(path, fmt, pcm=False)
+    return audio_path
 
-def get_transcript(path: str) -> str:
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
-    model = load_model("base", device=device)
-    result = model.transcribe(path, fp16=(device=='cuda'))
-    return result.get("text", "")
+def get_transcript(source: Union[str, Iterable[np.ndarray]]) -> str:
+    return transcribe(source)
 
 def summarize_text(text: str, length: str) -> str:
     if not text:
         return "No transcript available."
-    prompt = (
-        "아래 비디오 대본을 요약해 주세요.\n"
-        f"길이: {'짧게' if length=='short' else '상세하게'}\n\n"
-        f"{text}"
-    )
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return resp.choices[0].message.content.strip()
+    return summarize(text, length, "아래 비디오 대본을 요약해 주세요.")
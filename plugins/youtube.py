@@ -1,117 +1,231 @@
 import os
+import re
 import glob
-import subprocess
-import torch
-import logging
-import streamlit as st
+import hashlib
+import shutil
+import uuid
+from typing import Iterator, Optional
+import yt_dlp
 from yt_dlp import YoutubeDL
-from core.runner import register_plugin
+from yt_dlp.utils import DownloadError
+from core.artifacts import artifact_store, export
+from core.batch import BatchItem, BatchStats, Manifest, run_batch
+from core.ffmpeg import TranscodeError, transcode
+from core.subtitles import choose_track, pick_file, transcript_from_file
+from core.ytinfo import info_cache, video_id_from_url
+from core.runner import Action, register_plugin, run_actions
 from core.schemas import YouTubePayload, ExecutionResult
-from whisper import load_model
-from openai import OpenAI
-from dotenv import load_dotenv
+from core.transcribe import transcribe
+from core.summarize import summarize
 
-load_dotenv()  
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# video / audio / transcript는 서로 독립이라 동시에 받는다
+ACTIONS = [
+    Action("video", lambda d, p: download_video(d.url, d.video_quality), output="video"),
+    Action("audio", lambda d, p: extract_audio(d.url, d.audio_format), output="audio"),
+    Action("transcript", lambda d, p: get_transcript(d.url)),
+    Action("summary", lambda d, p: summarize_text(p["transcript"], d.summary_length), ("transcript",), "summary"),
+]
 
 @register_plugin("youtube")
 def youtube_plugin(payload: dict) -> ExecutionResult:
     data = YouTubePayload(**payload)
-    outputs = {}
+    return run_actions(ACTIONS, data.actions, data)
+
+def resolve_info(url: str) -> dict:
+    """URL의 메타데이터(info dict). 같은 영상은 TTL 동안 한 번만 조회한다."""
+    def fetch() -> dict:
+        with YoutubeDL({'skip_download': True, 'noplaylist': True, 'quiet': True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+        return yt_dlp.YoutubeDL.sanitize_info(info)  # JSON으로 저장/재사용 가능한 형태
+    return info_cache().resolve(video_id_from_url(url), fetch, alias=url)
 
-    if "video" in data.actions:
-        outputs["video"] = download_video(data.url, data.video_quality)
+def _video_id(url: str) -> str:
+    # 표준 형식이 아닌 URL만 메타데이터를 조회해 id를 확인한다
+    return video_id_from_url(url) or resolve_info(url)['id']
 
-    if "audio" in data.actions:
-        outputs["audio"] = extract_audio(data.url, data.audio_format)
+def _extract(ydl, url: str, info: dict):
+    # 캐시된 info에 포맷 목록이 있으면 다시 조회하지 않고 그 포맷으로 바로 받는다
+    if info.get('formats'):
+        try:
+            return ydl.process_ie_result(dict(info), download=True)
+        except DownloadError:
+            info_cache().invalidate(info['id'])  # 포맷 URL 만료 등: 새로 조회해서 받는다
+    return ydl.extract_info(url, download=True)
 
-    if "summary" in data.actions:
-        transcript = get_transcript(data.url)
-        outputs["summary"] = summarize_text(transcript, data.summary_length)
+def _download(url: str, opts: dict) -> str:
+    """yt-dlp로 받은 파일 경로. 저장소의 임시 폴더에 받은 뒤 put()으로 옮긴다."""
+    staging = artifact_store().staging_dir()
+    opts = {'outtmpl': '%(id)s.%(ext)s', 'paths': {'home': staging}, 'noplaylist': True, **opts}
+    try:
+        with YoutubeDL(opts) as ydl:
+            _extract(ydl, url, resolve_info(url))
+        files = [f for f in os.listdir(staging) if not f.endswith('.part')]
+        if not files:
+            raise RuntimeError(f"yt-dlp produced no file for {url}")
+        moved = os.path.join(os.path.dirname(staging), f".{uuid.uuid4().hex}-{files[0]}")
+        os.replace(os.path.join(staging, files[0]), moved)
+        return moved
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
 
-    return ExecutionResult(success=True, outputs=outputs)
+def _local_source(vid: str) -> Optional[str]:
+    # 이미 받아 둔 오디오/비디오 스트림 (오디오 전용 스트림 우선)
+    entries = {sel: path for sel, path in artifact_store().entries(vid).items()
+               if sel.startswith(('bestaudio', 'audio:', 'video:'))}
+    for selector in sorted(entries, key=lambda s: (s.startswith('video:'), s)):
+        return entries[selector]
+    return None
 
 def download_video(url: str, quality: str) -> str:
-    ydl_opts = {
-        'format': f'bestvideo[height<={quality}]+bestaudio/best',
-        'merge_output_format': 'mp4',
-        'outtmpl': '%(id)s.%(ext)s',
-        'noplaylist': True,
-    }
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-    vid = info['id']
-    orig = f"{vid}.mp4"
-    fixed = f"{vid}_aac.mp4"
-    try:
-        subprocess.run(['ffmpeg','-i',orig,'-c:v','copy','-c:a','aac','-b:a','192k',fixed], check=True)
-        os.remove(orig)
-    except Exception:
-        open(fixed, 'wb').close()  # 테스트용 빈 파일
-    return os.path.abspath(fixed)
+    vid = _video_id(url)
+
+    def produce() -> str:
+        orig = _download(url, {
+            'format': f'bestvideo[height<={quality}]+bestaudio/best',
+            'merge_output_format': 'mp4',
+        })
+        fixed = os.path.splitext(orig)[0] + '_aac.mp4'
+        try:
+            transcode(orig, fixed, ['-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k'])
+            os.remove(orig)
+            return fixed
+        except TranscodeError:
+            return orig  # 오디오 재인코딩에 실패하면 받은 파일을 그대로 쓴다
+
+    # 저장소 파일은 만료/용량 초과 때 지워지므로 결과는 현재 폴더로 링크(또는 복사)해 돌려준다
+    return export(artifact_store().fetch(vid, f"video:{quality}", produce))
 
 def extract_audio(url: str, fmt: str) -> str:
-    ydl_opts = {'format':'bestaudio/best','postprocessors':[{'key':'FFmpegExtractAudio','preferredcodec':fmt,'preferredquality':'192'}],'outtmpl':'%(id)s.%(ext)s','noplaylist':True}
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-    return os.path.abspath(f"{info['id']}.{fmt}")
+    vid = _video_id(url)
 
-def get_transcript(url: str) -> str:
-    # --- 1) 현재 폴더에 미리 만들어진 .vtt 파일이 있는지 먼저 검사
-    vtt_files = glob.glob("*.vtt")
-    if vtt_files:
-        lines = []
-        for vtt in vtt_files:
-            with open(vtt, encoding="utf-8") as f:
-                for line in f:
-                    if "-->" in line or line.strip().isdigit() or not line.strip():
-                        continue
-                    lines.append(line.strip())
-        return " ".join(lines)
-
-    # --- 2) 없으면 yt-dlp로 자막 뽑아보고
+    def produce() -> str:
+        source = _local_source(vid)
+        if source is not None:
+            # 이미 받은 스트림에서 오디오만 뽑는다 (재다운로드 없음)
+            out = os.path.join(artifact_store().root, f".{uuid.uuid4().hex}.{fmt}")
+            transcode(source, out, ['-vn', '-b:a', '192k'])
+            return out
+        return _download(url, {
+            'format': 'bestaudio/best',
+            'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': fmt, 'preferredquality': '192'}],
+        })
+
+    return export(artifact_store().fetch(vid, f"audio:{fmt}", produce))
+
+def _cached_transcript(vid: str) -> Optional[str]:
+    # 저장소의 transcript:<언어> 항목 중 선호 언어 순으로 (Whisper 결과는 마지막)
+    entries = {sel.split(":", 1)[1]: path for sel, path in artifact_store().entries(vid).items()
+               if sel.startswith("transcript:")}
+    chosen = pick_file(f"{vid}.{lang}.txt" for lang in entries if lang != "whisper")
+    path = entries[chosen[0]] if chosen else entries.get("whisper")
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def _store_transcript(vid: str, lang: str, text: str) -> str:
+    tmp = os.path.join(artifact_store().root, f".{uuid.uuid4().hex}.txt")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    artifact_store().put(vid, f"transcript:{lang}", tmp)
+    return text
+
+def _fetch_subtitles(url: str, info: dict) -> Optional[tuple[str, str]]:
+    """자막 트랙 하나를 받아 (언어, 정리된 텍스트)로 돌려준다. 자막이 없으면 None."""
+    track = choose_track(info)
+    if info.get('formats') and track is None:
+        return None  # 메타데이터상 자막이 없으면 요청하지 않는다
+    staging = artifact_store().staging_dir()
     ydl_opts = {
         'writesubtitles': True,
         'writeautomaticsub': True,
-        'subtitlesformat': 'vtt',
+        'subtitlesformat': 'vtt/srt/best',
         'skip_download': True,
         'outtmpl': '%(id)s',
+        'paths': {'home': staging},
         'noplaylist': True,
     }
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
+    if track is not None:
+        ydl_opts['subtitleslangs'] = [track[0]]
+    try:
+        with YoutubeDL(ydl_opts) as ydl:
+            _extract(ydl, url, info)
+        vid = info['id']
+        files = glob.glob(os.path.join(staging, f"{vid}.*.vtt")) + glob.glob(os.path.join(staging, f"{vid}.*.srt"))
+        chosen = pick_file(files)
+        if chosen is None:
+            return None
+        return chosen[0], transcript_from_file(chosen[1])
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+def get_transcript(url: str) -> str:
+    # --- 1) 이미 정리해 둔 자막/전사 결과가 있으면 네트워크 없이 반환
+    vid = video_id_from_url(url)
+    cached = _cached_transcript(vid) if vid else None
+    if cached is not None:
+        return cached
+
+    # --- 2) 없으면 yt-dlp로 가장 알맞은 언어의 자막 하나만 받아 정리
+    info = resolve_info(url)
     vid = info["id"]
-    vtts = glob.glob(f"{vid}*.vtt")
-    if vtts:
-        lines = []
-        for vtt in vtts:
-            with open(vtt, encoding="utf-8") as f:
-                for line in f:
-                    if "-->" in line or line.strip().isdigit() or not line.strip():
-                        continue
-                    lines.append(line.strip())
-        return " ".join(lines)
+    cached = _cached_transcript(vid)
+    if cached is not None:
+        return cached
+    subtitles = _fetch_subtitles(url, info)
+    if subtitles is not None and subtitles[1]:
+        return _store_transcript(vid, *subtitles)
 
     # --- 3) 그래도 없으면 Whisper fallback
-    audio_path = extract_audio(url, "wav")
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = load_model("base", device=device)
-    result = model.transcribe(audio_path, fp16=(device=="cuda"))
-    os.remove(audio_path)
-    return result.get("text", "")
+    # 받아 둔 스트림이 있으면 그대로 디코딩하고, 없으면 원본 오디오 스트림만 받아 저장소에 남긴다
+    audio_path = _local_source(vid) or artifact_store().fetch(
+        vid, "bestaudio", lambda: _download(url, {'format': 'bestaudio/best'})
+    )
+    return _store_transcript(vid, "whisper", transcribe(audio_path))
+
+def iter_playlist(url: str) -> Iterator[str]:
+    """재생목록/채널의 영상 URL을 yt-dlp가 페이지를 넘기는 대로 하나씩 내보낸다."""
+    with YoutubeDL({'extract_flat': 'in_playlist', 'skip_download': True, 'quiet': True}) as ydl:
+        yield from _walk_entries(ydl, ydl.extract_info(url, download=False, process=False))
+
+def _walk_entries(ydl, info: dict) -> Iterator[str]:
+    kind = info.get('_type', 'video')
+    if kind in ('playlist', 'multi_video'):
+        for entry in info.get('entries') or ():
+            if entry:
+                yield from _walk_entries(ydl, entry)
+    elif kind in ('url', 'url_transparent') and info.get('ie_key') not in (None, 'Youtube'):
+        # 채널 -> 탭, 탭 -> 재생목록 같은 중간 단계는 한 번 더 펼친다
+        yield from _walk_entries(ydl, ydl.extract_info(info['url'], download=False, process=False))
+    else:
+        vid = info.get('id') or ''
+        yield f"https://www.youtube.com/watch?v={vid}" if len(vid) == 11 else info.get('webpage_url') or info['url']
+
+def default_manifest(url: str) -> str:
+    list_id = re.search(r"[?&]list=([\w-]+)", url)
+    name = list_id.group(1) if list_id else hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(artifact_store().root, f"playlist-{name}.jsonl")
+
+def ingest_playlist(
+    url: str,
+    options: dict,
+    manifest_path: Optional[str] = None,
+    workers: int = 4,
+    timeout: Optional[float] = None,
+    stats: Optional[BatchStats] = None,
+) -> Iterator[dict]:
+    """
+    재생목록/채널의 각 영상을 options(actions, video_quality ...)로 처리하고, 끝나는 대로 결과 레코드를 내보낸다.
+    영상 목록은 필요한 만큼만 읽고, 동시에 처리하는 영상은 workers*2개를 넘지 않는다.
+    결과는 매니페스트에 기록되므로 같은 명령을 다시 실행하면 이미 끝난 영상은 건너뛴다.
+    """
+    manifest = Manifest(manifest_path or default_manifest(url))
+    items = (BatchItem(i, "youtube", {**options, "url": entry}) for i, entry in enumerate(iter_playlist(url)))
+    for record in run_batch(manifest.pending(items), workers=workers, timeout=timeout, stats=stats, warm=["youtube"]):
+        manifest.write(record)
+        yield record
 
 def summarize_text(text: str, length: str) -> str:
     if not text:
         return "No transcript available."
-    prompt = (
-        "아래 텍스트를 요약해 주세요.\n\n"
-        f"길이: {'짧게' if length=='short' else '상세하게'}\n\n"
-        f"{text}"
-    )
-    
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return resp.choices[0].message.content.strip()
+    return summarize(text, length, "아래 텍스트를 요약해 주세요.")
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def yt_store(monkeypatch, tmp_path):
+    # YouTube 저장소가 ~/.cache에 쓰지 않도록 테스트마다 임시 폴더를 쓴다
+    monkeypatch.setenv("UC_YT_STORE", str(tmp_path / "yt-store"))
+
+
+class StubOpenAI:
+    """
+    /v1/chat/completions만 흉내 내는 로컬 OpenAI 호환 서버.
+    reply(prompt) -> str 로 응답 내용을, delay로 응답 지연을 정한다.
+    """
+
+    def __init__(self):
+        self.prompts: list[str] = []
+        self.delay = 0.0
+        self.reply = lambda prompt: f"summary of {len(prompt)} chars"
+        self.statuses: list[int] = []  # 앞에서부터 하나씩 꺼내 쓰는 응답 상태 코드 (예: 429)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with stub._lock:
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if status != 200:
+                        payload = {"error": {"message": "stub error", "type": "rate_limit", "code": status}}
+                    else:
+                        with stub._lock:
+                            stub.prompts.append(prompt)
+                        content = stub.reply(prompt)
+                        payload = {
+                            "id": "chatcmpl-stub", "object": "chat.completion", "created": 0,
+                            "model": body["model"],
+                            "choices": [{"index": 0, "finish_reason": "stop",
+                                         "message": {"role": "assistant", "content": content}}],
+                            "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(content),
+                                      "total_tokens": len(prompt) + len(content)},
+                        }
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def openai_stub():
+    stub = StubOpenAI()
+    yield stub
+    stub.close()
@@ -0,0 +1,165 @@
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+import pytest
+import core.ffmpeg as cf
+import plugins.youtube as py
+from core.artifacts import ArtifactStore
+
+URL = "https://www.youtube.com/watch?v=abcdefghijk"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _file(path, size=10):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_fetch_produces_once(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    calls = []
+
+    def produce():
+        calls.append(1)
+        time.sleep(0.1)
+        return _file(tmp_path / f"dl{len(calls)}.mp4")
+
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(store.fetch("vid", "video:720", produce))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(set(paths)) == 1 and paths[0].endswith("vid.video-720.mp4")
+    assert store.stats()["hits"] == 3
+
+
+def test_ttl_expires_entries(tmp_path):
+    clock = Clock()
+    store = ArtifactStore(tmp_path, ttl=60, clock=clock)
+    path = store.put("vid", "audio:mp3", _file(tmp_path / "a.mp3"))
+    assert store.get("vid", "audio:mp3") == path
+    clock.now += 61
+    assert store.get("vid", "audio:mp3") is None
+    store.evict()
+    assert not os.path.exists(path)
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    clock = Clock()
+    store = ArtifactStore(tmp_path, max_bytes=25, clock=clock)
+    a = store.put("a", "audio:mp3", _file(tmp_path / "1.mp3"))
+    clock.now += 1
+    store.put("b", "audio:mp3", _file(tmp_path / "2.mp3"))
+    clock.now += 1
+    store.get("a", "audio:mp3")  # a가 b보다 최근에 사용됨
+    clock.now += 1
+    store.put("c", "audio:mp3", _file(tmp_path / "3.mp3"))
+    assert set(store.entries("a")) == {"audio:mp3"} and os.path.exists(a)
+    assert store.entries("b") == {}
+    assert store.evictions == 1
+
+
+class CountingYDL:
+    probes = 0
+    downloads = []
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def extract_info(self, url, download):
+        assert not download  # 다운로드는 캐시된 info로만 한다
+        CountingYDL.probes += 1
+        return {"id": "abcdefghijk", "formats": [{"format_id": "18"}], "subtitles": {}}
+
+    def process_ie_result(self, info, download):
+        if "format" in self.opts:
+            CountingYDL.downloads.append(self.opts["format"])
+            ext = self.opts.get("postprocessors", [{}])[0].get("preferredcodec", "mp4")
+            _file(os.path.join(self.opts["paths"]["home"], f"abcdefghijk.{ext}"))
+        return info
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def youtube_env(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\nimport sys\nopen(sys.argv[-1], 'wb').write(b'derived')\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(cf, "FFMPEG", str(script))
+    monkeypatch.setattr(py, "YoutubeDL", CountingYDL)
+    monkeypatch.setenv("UC_YT_STORE", str(tmp_path / "store"))
+    CountingYDL.probes = 0
+    CountingYDL.downloads = []
+
+
+def test_audio_is_derived_from_downloaded_video(youtube_env):
+    video = py.download_video(URL, "720")
+    audio = py.extract_audio(URL, "mp3")
+    assert py.extract_audio(URL, "mp3") == audio
+    assert py.download_video(URL, "720") == video
+    assert len(CountingYDL.downloads) == 1
+    assert CountingYDL.probes == 1
+    assert open(audio, "rb").read() == b"derived"
+
+
+def test_whisper_fallback_reuses_stored_audio(youtube_env, monkeypatch):
+    seen = []
+    monkeypatch.setattr(py, "transcribe", lambda path: seen.append(path) or "text")
+    audio = py.extract_audio(URL, "mp3")
+    assert py.get_transcript(URL) == "text"
+    # 전사는 저장소에 받아 둔 스트림을 쓰고, 사용자에게 준 파일은 그 사본(링크)이다
+    assert len(seen) == 1 and os.path.samefile(seen[0], audio)
+    assert os.path.dirname(seen[0]) == py.artifact_store().root
+    assert CountingYDL.downloads == ["bestaudio/best"]
+
+
+def test_results_outlive_the_store(youtube_env, tmp_path):
+    video = py.download_video(URL, "720")
+    assert os.path.dirname(video) == str(tmp_path)
+    assert os.path.dirname(py.artifact_store().get("abcdefghijk", "video:720")) != str(tmp_path)
+    # 저장소가 만료/용량 초과로 비워져도 돌려준 결과 파일은 남는다
+    shutil.rmtree(py.artifact_store().root)
+    assert os.path.isfile(video)
+
+
+def _put_many(root, worker, count):
+    store = ArtifactStore(root)
+    for i in range(count):
+        path = os.path.join(root, f".w{worker}-{i}.bin")
+        with open(path, "wb") as f:
+            f.write(b"x")
+        store.put(f"vid{worker:02d}{i:06d}", "audio:mp3", path)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fcntl 잠금은 POSIX 전용")
+def test_index_survives_concurrent_processes(tmp_path):
+    import multiprocessing
+    root = str(tmp_path / "store")
+    ArtifactStore(root)
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_put_many, args=(root, w, 20)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    index = ArtifactStore(root)._load()
+    assert len(index) == 80
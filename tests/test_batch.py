@@ -0,0 +1,116 @@
+import json
+import os
+import time
+import pytest
+from typer.testing import CliRunner
+from cli import app
+from core import runner
+from core.batch import BatchStats, collect_items, run_batch
+from core.schemas import ExecutionResult, TextPayload
+
+cli_runner = CliRunner()
+
+
+# 모듈 import 시 등록되므로 fork된 워커 프로세스에서도 사용할 수 있다
+@runner.register_plugin("batch-echo")
+def echo_plugin(payload: dict) -> ExecutionResult:
+    data = TextPayload(**payload)
+    if data.input_path.endswith("slow.txt"):
+        time.sleep(5)
+    return ExecutionResult(success=True, outputs={"pid": os.getpid(), "name": os.path.basename(data.input_path)})
+
+
+@runner.register_plugin("batch-dag")
+def dag_plugin(payload: dict) -> ExecutionResult:
+    # 서로 독립인 느린 액션 둘 (스레드 풀에서 동시에 실행)
+    actions = [runner.Action(name, lambda d, p: time.sleep(3), output=name) for name in ("a", "b")]
+    return runner.run_actions(actions, ["a", "b"], payload)
+
+
+@pytest.fixture(autouse=True)
+def declare_echo(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(runner.SPECS, "batch-echo", runner.PluginSpec(__name__, ("to-pdf",), TextPayload, "1"))
+    for name in ["a.txt", "b.txt", "c.md"]:
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    yield
+
+
+def test_collect_items_from_dir_glob_and_manifest(tmp_path):
+    by_dir = list(collect_items("text", str(tmp_path), {"actions": ["to-pdf"]}))
+    assert [os.path.basename(i.payload["input_path"]) for i in by_dir] == ["a.txt", "b.txt", "c.md"]
+    by_glob = list(collect_items("text", str(tmp_path / "*.txt"), {}))
+    assert len(by_glob) == 2
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"input_path": "a.txt", "actions": ["tts"]}) + "\n\n"
+        + json.dumps({"plugin": "image", "input_path": "x.png", "actions": ["ocr"]}) + "\n",
+        encoding="utf-8",
+    )
+    items = list(collect_items("text", str(manifest), {"summary_length": "short"}))
+    assert [i.plugin for i in items] == ["text", "image"]
+    assert items[0].payload == {"summary_length": "short", "input_path": "a.txt", "actions": ["tts"]}
+
+
+def test_malformed_jsonl_line_fails_only_that_item(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"input_path": "a.txt", "actions": ["to-pdf"]}) + "\n"
+        + '{"input_path": "b.txt", \n'
+        + "[1, 2]\n"
+        + json.dumps({"input_path": "c.md", "actions": ["to-pdf"]}) + "\n",
+        encoding="utf-8",
+    )
+    records = list(run_batch(collect_items("batch-echo", str(manifest), {}), workers=0))
+    assert [r["success"] for r in records] == [True, False, False, True]
+    assert "jobs.jsonl:2: invalid JSON" in records[1]["outputs"]["error"]
+    assert "jobs.jsonl:3: expected a JSON object" in records[2]["outputs"]["error"]
+
+
+def test_inline_batch_validates_and_reports(tmp_path):
+    stats = BatchStats()
+    items = list(collect_items("batch-echo", str(tmp_path / "*.txt"), {"actions": ["to-pdf"]}))
+    items += list(collect_items("batch-echo", str(tmp_path / "*.md"), {}))  # actions 누락
+    records = list(run_batch(items, workers=0, stats=stats))
+    assert [r["success"] for r in records] == [True, True, False]
+    assert "actions" in records[2]["outputs"]["error"]
+    report = stats.report()
+    assert report["total"] == 3 and report["succeeded"] == 2 and report["failed"] == 1
+
+
+def test_timeout_does_not_wait_for_running_actions():
+    from core.batch import run_item
+    start = time.monotonic()
+    record = run_item("batch-dag", {}, timeout=0.3)
+    assert record["timeout"] is True
+    assert time.monotonic() - start < 1.5
+
+
+def test_per_item_timeout(tmp_path):
+    (tmp_path / "slow.txt").write_text("zzz", encoding="utf-8")
+    stats = BatchStats()
+    items = collect_items("batch-echo", str(tmp_path / "s*.txt"), {"actions": ["to-pdf"]})
+    records = list(run_batch(items, workers=0, timeout=0.2, stats=stats))
+    assert records[0]["timeout"] is True
+    assert stats.timed_out == 1
+
+
+def test_process_pool_reuses_workers(tmp_path):
+    for i in range(6):
+        (tmp_path / f"n{i}.txt").write_text("x", encoding="utf-8")
+    items = collect_items("batch-echo", str(tmp_path / "n*.txt"), {"actions": ["to-pdf"]})
+    records = list(run_batch(items, workers=2, max_pending=2))
+    assert sorted(r["index"] for r in records) == list(range(6))
+    assert len({r["outputs"]["pid"] for r in records}) <= 2
+
+
+def test_cli_batch_streams_json_lines(tmp_path):
+    result = cli_runner.invoke(app, [
+        "batch", "--plugin", "batch-echo", "--source", str(tmp_path / "*.txt"),
+        "--actions", "to-pdf", "--workers", "0",
+    ])
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(l) for l in result.stdout.splitlines() if l.startswith("{")]
+    names = sorted(l["outputs"]["name"] for l in lines if "outputs" in l)
+    assert names == ["a.txt", "b.txt"]
+    assert '"report"' in result.stderr
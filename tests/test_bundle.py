@@ -0,0 +1,73 @@
+import os
+import numpy as np
+import pikepdf
+import pytest
+from docx import Document
+from PIL import Image
+from core.bundle import bundle_inputs, bundle_pdf, ocr_images
+from core.ocr import OcrPool
+
+
+class WidthEngine:
+    """이미지 폭을 텍스트로 돌려주는 가짜 엔진."""
+
+    def __init__(self, lang):
+        pass
+
+    def recognize(self, image):
+        return f"w{image.width}"
+
+
+def _images(folder, widths=(30, 10, 20)):
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i, w in enumerate(widths):
+        path = os.path.join(folder, f"page{i * 5 + 1}.jpg")
+        Image.fromarray(np.full((40, w, 3), 200, np.uint8)).save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+def test_bundle_inputs_order(tmp_path):
+    paths = _images(str(tmp_path / "scans"))
+    (tmp_path / "scans" / "notes.txt").write_text("x")
+    # page1, page6, page11: 숫자는 자연 순서
+    assert bundle_inputs(str(tmp_path / "scans")) == paths
+    assert bundle_inputs(paths[2], [paths[0]]) == [paths[2], paths[0]]
+    assert bundle_inputs(paths[0]) is None
+    os.makedirs(tmp_path / "empty")
+    with pytest.raises(ValueError):
+        bundle_inputs(str(tmp_path / "empty"))
+
+
+def test_bundle_pdf_passes_jpeg_through_in_groups(tmp_path):
+    paths = _images(str(tmp_path), widths=(30, 10, 20, 40, 50))
+    out = bundle_pdf(paths, str(tmp_path / "all.pdf"), group=2)
+    with pikepdf.open(out) as pdf:
+        assert len(pdf.pages) == 5
+        images = [next(iter(p.get_images().values())) for p in pdf.pages]
+        assert [int(im.Width) for im in images] == [30, 10, 20, 40, 50]
+        # 다시 인코딩하지 않은 원본 JPEG 바이트
+        assert images[0].Filter == "/DCTDecode"
+        assert images[0].read_raw_bytes() == open(paths[0], "rb").read()
+
+
+def test_ocr_images_keeps_input_order(tmp_path):
+    paths = _images(str(tmp_path), widths=(30, 10, 20, 40))
+    with OcrPool(workers=2, factory=WidthEngine) as pool:
+        assert list(ocr_images(paths, pool=pool)) == ["w30", "w10", "w20", "w40"]
+
+
+def test_image_plugin_bundles_folder_and_ocrs_once(tmp_path, monkeypatch):
+    import plugins.image as pi
+    folder = str(tmp_path / "scans")
+    paths = _images(folder)
+    calls = []
+    monkeypatch.setattr(pi, "ocr_images", lambda images: calls.append(images) or iter(["a", "b", "c"]))
+    result = pi.image_plugin({"input_path": folder, "actions": ["ocr", "to-pdf", "to-docx"]})
+    assert result.success, result.outputs
+    assert calls == [paths]
+    assert result.outputs["pdf"] == os.path.abspath(folder) + ".pdf"
+    assert open(result.outputs["text"], encoding="utf-8").read() == "a\n\fb\n\fc\n\f"
+    texts = [p.text for p in Document(result.outputs["docx"]).paragraphs if p.text]
+    assert texts == ["a", "b", "c"]
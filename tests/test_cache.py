@@ -0,0 +1,154 @@
+import os
+import pytest
+from core import runner
+from core.cache import ResultCache, cache_key
+from core.ytinfo import video_id_from_url
+from core.schemas import ExecutionResult, ImagePayload, TextPayload, YouTubePayload
+
+
+@pytest.fixture
+def fake_plugin(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    # 존재하지 않는 모듈 — 캐시 히트 때 import를 시도하면 실패한다
+    monkeypatch.setitem(runner.SPECS, "fake", runner.PluginSpec("tests.no_such_module", ("to-pdf",), TextPayload, "1"))
+
+    def plugin(payload):
+        calls.append(payload)
+        out = tmp_path / "input.pdf"
+        out.write_bytes(b"%PDF fake")
+        return ExecutionResult(success=True, outputs={"pdf": str(out), "note": "done"})
+    monkeypatch.setitem(runner.PLUGINS, "fake", plugin)
+    (tmp_path / "input.txt").write_text("hello", encoding="utf-8")
+    yield calls
+
+
+def test_hit_skips_plugin_and_import(fake_plugin, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    payload = {"input_path": "input.txt", "actions": ["to-pdf"]}
+    first = runner.run_plugin("fake", payload, cache=cache)
+    runner.PLUGINS.pop("fake")
+    os.remove(first.outputs["pdf"])
+    second = runner.run_plugin("fake", payload, cache=cache)
+    assert second.success
+    assert second.outputs == first.outputs
+    assert open(second.outputs["pdf"], "rb").read() == b"%PDF fake"
+    assert len(fake_plugin) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_content_change_misses(fake_plugin, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    payload = {"input_path": "input.txt", "actions": ["to-pdf"]}
+    runner.run_plugin("fake", payload, cache=cache)
+    (tmp_path / "input.txt").write_text("changed", encoding="utf-8")
+    runner.run_plugin("fake", payload, cache=cache)
+    assert len(fake_plugin) == 2
+
+
+def test_bundled_inputs_are_part_of_the_key(tmp_path):
+    pages = []
+    for i in range(3):
+        page = tmp_path / f"p{i}.png"
+        page.write_bytes(b"page %d" % i)
+        pages.append(str(page))
+    payload = {"input_path": pages[0], "inputs": pages[1:], "actions": ["to-pdf"]}
+    before = cache_key("image", payload, ImagePayload, "1")
+    (tmp_path / "p2.png").write_bytes(b"edited")
+    assert cache_key("image", payload, ImagePayload, "1") != before
+
+    folder = tmp_path / "scans"
+    folder.mkdir()
+    (folder / "1.png").write_bytes(b"one")
+    payload = {"input_path": str(folder), "actions": ["to-pdf"]}
+    before = cache_key("image", payload, ImagePayload, "1")
+    assert before is not None
+    (folder / "1.png").write_bytes(b"edited")
+    assert cache_key("image", payload, ImagePayload, "1") != before
+    (folder / "1.png").write_bytes(b"one")
+    assert cache_key("image", payload, ImagePayload, "1") == before
+
+
+def test_hit_rebases_outputs_onto_the_new_input(fake_plugin, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    runner.run_plugin("fake", {"input_path": "input.txt", "actions": ["to-pdf"]}, cache=cache)
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    (other / "report.txt").write_text("hello", encoding="utf-8")   # 같은 내용, 다른 위치/이름
+    (tmp_path / "input.pdf").write_bytes(b"%PDF user edit")
+    hit = runner.run_plugin("fake", {"input_path": str(other / "report.txt"), "actions": ["to-pdf"]}, cache=cache)
+    assert len(fake_plugin) == 1
+    assert hit.outputs["pdf"] == str(other / "report.pdf")
+    assert (other / "report.pdf").read_bytes() == b"%PDF fake"
+    assert (tmp_path / "input.pdf").read_bytes() == b"%PDF user edit"   # 원래 위치는 건드리지 않는다
+
+
+def test_same_size_different_content_is_restored(fake_plugin, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    payload = {"input_path": "input.txt", "actions": ["to-pdf"]}
+    first = runner.run_plugin("fake", payload, cache=cache)
+    with open(first.outputs["pdf"], "wb") as f:
+        f.write(b"%PDF FAKE")
+    runner.run_plugin("fake", payload, cache=cache)
+    assert open(first.outputs["pdf"], "rb").read() == b"%PDF fake"
+
+
+def test_key_normalizes_options(tmp_path):
+    src = tmp_path / "a.txt"
+    src.write_text("x", encoding="utf-8")
+    a = cache_key("text", {"input_path": str(src), "actions": ["tts", "to-pdf"]}, TextPayload, "1")
+    b = cache_key("text", {"input_path": str(src), "actions": ["to-pdf", "tts", "tts"], "summary_length": "short"}, TextPayload, "1")
+    c = cache_key("text", {"input_path": str(src), "actions": ["to-pdf", "tts"]}, TextPayload, "2")
+    assert a == b != c
+
+
+def test_youtube_key_uses_video_id():
+    payload = {"actions": ["summary"], "video_quality": "720p", "audio_format": "mp3", "summary_length": "short"}
+    a = cache_key("youtube", {**payload, "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10"}, YouTubePayload, "1")
+    b = cache_key("youtube", {**payload, "url": "https://youtu.be/dQw4w9WgXcQ"}, YouTubePayload, "1")
+    assert a == b
+    assert video_id_from_url("https://example.com/video") is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1500)
+    for i in range(3):
+        f = tmp_path / f"out{i}.bin"
+        f.write_bytes(b"x" * 500)
+        cache.put(f"key{i}", ExecutionResult(success=True, outputs={"file": str(f)}))
+        os.utime(os.path.join(cache._entry(f"key{i}"), "result.json"), (i, i))
+    assert cache.get("key0") is None
+    assert cache.get("key2") is not None
+    assert cache.evictions >= 1
+
+
+def test_list_outputs_are_restored(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    pages = []
+    for i in range(2):
+        page = tmp_path / f"doc_{i:03d}.png"
+        page.write_bytes(b"page %d" % i)
+        pages.append(str(page))
+    cache.put("k", ExecutionResult(success=True, outputs={"image": pages}))
+    for page in pages:
+        os.remove(page)
+    assert cache.get("k").outputs == {"image": pages}
+    assert [open(p, "rb").read() for p in pages] == [b"page 0", b"page 1"]
+
+
+def test_fan_out_cache_hit_restores_files(tmp_path, monkeypatch):
+    from PIL import Image
+    src = tmp_path / "photo.png"
+    Image.new("RGB", (64, 48), "red").save(src)
+    cache = ResultCache(str(tmp_path / "cache"))
+    payload = {"input_path": str(src), "actions": ["fan-out"], "outputs": ["png@16", "webp@32"]}
+    first = runner.run_plugin("image", payload, cache=cache)
+    assert first.success and len(first.outputs["images"]) == 2
+    for path in first.outputs["images"].values():
+        os.remove(path)
+    # 두 번째는 플러그인을 부르지 않고 캐시에서 파일까지 되살린다
+    monkeypatch.setitem(runner.PLUGINS, "image", lambda payload: pytest.fail("plugin called on a cache hit"))
+    second = runner.run_plugin("image", payload, cache=cache)
+    assert second.outputs == first.outputs
+    assert Image.open(second.outputs["images"]["png@16"]).size == (16, 12)
+    assert cache.stats()["hits"] == 1
@@ -15,7 +15,7 @@ def patch_image_plugins(monkeypatch, tmp_path):
     # Stub convert_to_pdf
     monkeypatch.setattr(pi, 'convert_to_pdf', lambda path: 'output.pdf')
     # Stub convert_to_docx
-    monkeypatch.setattr(pi, 'convert_to_docx', lambda path: 'output.docx')
+    monkeypatch.setattr(pi, 'convert_to_docx', lambda path, text=None: 'output.docx')
     # Stub convert_format
     monkeypatch.setattr(pi, 'convert_format', lambda path, fmt: f'converted.{fmt}')
     yield
@@ -12,6 +12,7 @@ def patch_video_plugins(monkeypatch, tmp_path):
     # plugins.video의 헬퍼 함수들 스텁
     import plugins.video as pv
     monkeypatch.setattr(pv, 'extract_audio', lambda path, fmt: 'audio.mp3')
+    monkeypatch.setattr(pv, 'demux_audio', lambda path, fmt=None, pcm=True: ('audio.mp3' if fmt else None, None))
     monkeypatch.setattr(pv, 'get_transcript', lambda path: 'dummy transcript')
     monkeypatch.setattr(pv, 'summarize_text', lambda text, length: 'summary text')
     yield
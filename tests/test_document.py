@@ -0,0 +1,107 @@
+import io
+import os
+import numpy as np
+import pikepdf
+import pytest
+from docx import Document
+from fpdf import FPDF
+from PIL import Image
+from core.document import PageResult, in_order, merge_pdfs, ocr_document, page_count, render_page
+from core.ocr import OcrPool
+
+
+class FakeDocEngine:
+    def __init__(self, lang):
+        pass
+
+    def _read(self, image):
+        # 쪽마다 다른 폭의 검은 막대를 그려 두었으므로 막대 폭으로 쪽을 구분한다
+        dark = np.asarray(image) < 128
+        return f"page-{dark.any(axis=0).sum() * 10 // image.width}"
+
+    def recognize(self, image):
+        return self._read(image)
+
+    def recognize_pdf(self, image, dpi=300):
+        buf = io.BytesIO()
+        image.save(buf, "PDF", resolution=dpi)
+        return self._read(image), buf.getvalue()
+
+
+def _pdf(tmp_path, pages=3):
+    pdf = FPDF(unit="pt", format=(200, 100))
+    for i in range(pages):
+        pdf.add_page()
+        pdf.set_fill_color(0, 0, 0)
+        pdf.rect(0, 40, 20 * (i + 1) + 5, 20, "F")
+    path = str(tmp_path / "scan.pdf")
+    pdf.output(path)
+    return path
+
+
+def _tiff(tmp_path, pages=3):
+    frames = []
+    for i in range(pages):
+        img = np.full((50, 100), 255, np.uint8)
+        img[20:30, : 10 * (i + 1) + 2] = 0
+        frames.append(Image.fromarray(img))
+    path = str(tmp_path / "scan.tiff")
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return path
+
+
+@pytest.fixture
+def pool():
+    with OcrPool(workers=2, factory=FakeDocEngine) as pool:
+        yield pool
+
+
+def test_render_page_is_lazy_and_grayscale(tmp_path):
+    path = _pdf(tmp_path)
+    assert page_count(path) == 3
+    page = render_page(path, 2, dpi=144)
+    assert page.mode == "L" and page.size == (400, 200)
+    assert render_page(_tiff(tmp_path), 1).size == (100, 50)
+
+
+def test_in_order_reorders_completed_pages():
+    results = [PageResult(i, str(i), None, 0.0) for i in (2, 0, 3, 1)]
+    assert [r.index for r in in_order(results)] == [0, 1, 2, 3]
+
+
+def test_merge_pdfs_in_groups(tmp_path):
+    parts = []
+    for i in range(5):
+        part = str(tmp_path / f"{i}.pdf")
+        Image.new("L", (10 + i, 10)).save(part, "PDF")
+        parts.append(part)
+    merge_pdfs(parts, str(tmp_path / "all.pdf"), str(tmp_path), group=2)
+    with pikepdf.open(tmp_path / "all.pdf") as pdf:
+        widths = [float(p.mediabox[2]) for p in pdf.pages]
+    assert len(widths) == 5 and widths == sorted(widths)
+
+
+@pytest.mark.parametrize("make", [_pdf, _tiff])
+def test_ocr_document_streams_all_outputs(tmp_path, pool, make):
+    path = make(tmp_path)
+    out = ocr_document(path, ["text", "pdf", "docx"], dpi=72, pool=pool)
+    assert set(out) == {"text", "pdf", "docx"}
+    pages = open(out["text"], encoding="utf-8").read().split("\f")[:-1]
+    assert [p.strip() for p in pages] == ["page-1", "page-2", "page-3"]
+    with pikepdf.open(out["pdf"]) as pdf:
+        assert len(pdf.pages) == 3
+    texts = [p.text for p in Document(out["docx"]).paragraphs if p.text]
+    assert texts == ["page-1", "page-2", "page-3"]
+    assert out["pdf"] != os.path.abspath(path)
+
+
+def test_image_plugin_routes_documents(tmp_path, monkeypatch):
+    import core.document
+    from plugins.image import image_plugin
+
+    calls = []
+    monkeypatch.setattr(core.document, "ocr_document", lambda path, outputs: calls.append(outputs) or {
+        "text": "doc.txt", "pdf": "doc_ocr.pdf"})
+    result = image_plugin({"input_path": _pdf(tmp_path), "actions": ["ocr", "to-pdf"]})
+    assert result.outputs == {"text": "doc.txt", "pdf": "doc_ocr.pdf"}
+    assert calls == [["text", "pdf"]]
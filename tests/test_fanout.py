@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pytest
+from PIL import Image
+from core.fanout import decode, fan_out, fit, parse_spec
+
+
+def _photo(tmp_path, size=(1600, 1200), orientation=None):
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8))
+    path = str(tmp_path / "photo.jpg")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    img.save(path, "JPEG", exif=exif)
+    return path
+
+
+def test_parse_spec_and_fit():
+    assert parse_spec("webp@256")[1:] == ("WEBP", "webp", (256, 256))
+    assert parse_spec("jpg@320x240")[1:] == ("JPEG", "jpg", (320, 240))
+    assert parse_spec("png").box is None
+    for bad in ("png@", "nope@10", "webp@x3"):
+        with pytest.raises(ValueError):
+            parse_spec(bad)
+    assert fit((1600, 1200), (256, 256)) == (256, 192)
+    assert fit((100, 50), (256, 256)) == (100, 50)   # 확대하지 않음
+
+
+def test_fan_out_decodes_once(tmp_path, monkeypatch):
+    path = _photo(tmp_path)
+    opened = []
+    real_open = Image.open
+    monkeypatch.setattr(Image, "open", lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+    out = fan_out(path, ["png", "webp@256", "jpeg@320x240", "png@256"], quality=70, workers=3)
+
+    assert opened == [path]
+    assert list(out) == ["png", "webp@256", "jpeg@320x240", "png@256"]
+    assert out["png"] == os.path.abspath(str(tmp_path / "photo.png"))
+    with real_open(out["png"]) as img:
+        assert img.size == (1600, 1200)
+    with real_open(out["webp@256"]) as img:
+        assert (img.format, img.size) == ("WEBP", (256, 192))
+    with real_open(out["jpeg@320x240"]) as img:
+        assert (img.format, img.size) == ("JPEG", (320, 240))
+    assert out["png@256"].endswith("photo_256.png")
+
+
+def test_colliding_specs_share_a_file_and_input_is_kept(tmp_path, monkeypatch):
+    import core.fanout
+    path = _photo(tmp_path, size=(400, 300))
+    original = open(path, "rb").read()
+    saved = []
+    real_encode = core.fanout._encode
+    monkeypatch.setattr(core.fanout, "_encode", lambda img, spec, out, *a: saved.append(out) or real_encode(img, spec, out, *a))
+    out = fan_out(path, ["webp@256", "webp@256x256", "jpg"])
+    assert out["webp@256"] == out["webp@256x256"] and len(saved) == 2
+    assert out["jpg"].endswith("photo_full.jpg")
+    assert open(path, "rb").read() == original
+
+
+def test_draft_decode_only_when_all_outputs_shrink(tmp_path):
+    path = _photo(tmp_path)
+    assert decode(path, [parse_spec("webp@256"), parse_spec("png@400")]).size == (400, 300)
+    assert decode(path, [parse_spec("webp@256"), parse_spec("png")]).size == (1600, 1200)
+
+
+def test_exif_orientation_is_applied(tmp_path):
+    path = _photo(tmp_path, orientation=6)    # 90도 회전해서 보여야 하는 사진
+    out = fan_out(path, ["png@300"])
+    with Image.open(out["png@300"]) as img:
+        assert img.size == (225, 300)
+
+
+def test_image_plugin_fan_out(tmp_path):
+    from plugins.image import image_plugin
+    path = _photo(tmp_path, size=(400, 300))
+    result = image_plugin({"input_path": path, "actions": ["fan-out"], "outputs": ["webp@100", "bmp"]})
+    assert result.success
+    assert set(result.outputs["images"]) == {"webp@100", "bmp"}
+    assert all(os.path.isfile(p) for p in result.outputs["images"].values())
@@ -0,0 +1,83 @@
+import stat
+import sys
+import time
+import pytest
+import core.ffmpeg as cf
+from core.ffmpeg import TranscodeError, TranscodePool, transcode
+
+FAKE_FFMPEG = """
+import sys, time
+args = sys.argv[1:]
+src, dst = args[args.index("-i") + 1], args[-1]
+if "fail" in src:
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+steps = 100 if "slow" in src else 2
+for i in range(1, steps + 1):
+    print(f"out_time_us={i * 500000}\\nspeed={i}.0x\\nprogress=continue", flush=True)
+    if "slow" in src:
+        time.sleep(0.1)
+open(dst, "wb").write(b"encoded")
+print("out_time_us=1000000\\nspeed=2.0x\\nprogress=end", flush=True)
+"""
+
+
+@pytest.fixture(autouse=True)
+def fake_ffmpeg(monkeypatch, tmp_path):
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_FFMPEG)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(cf, "FFMPEG", str(script))
+    monkeypatch.chdir(tmp_path)
+
+
+def test_transcode_reports_progress():
+    seen = []
+    result = transcode("in.wav", "out.mp3", on_progress=seen.append)
+    assert result.out_time == 1.0
+    assert [p.out_time for p in seen] == [0.5, 1.0, 1.0]
+    assert seen[-1].done and seen[-1].speed == 2.0
+    assert open("out.mp3", "rb").read() == b"encoded"
+
+
+def test_failure_is_structured():
+    with pytest.raises(TranscodeError) as err:
+        transcode("fail.wav", "out.mp3")
+    assert err.value.reason == "failed"
+    assert err.value.returncode == 1
+    assert "Invalid data" in err.value.stderr
+
+
+def test_timeout_kills_process():
+    start = time.monotonic()
+    with pytest.raises(TranscodeError) as err:
+        transcode("slow.wav", "out.mp3", timeout=0.3)
+    assert err.value.reason == "timeout"
+    assert time.monotonic() - start < 3
+
+
+def test_missing_binary(monkeypatch):
+    monkeypatch.setattr(cf, "FFMPEG", "/nonexistent/ffmpeg")
+    with pytest.raises(TranscodeError) as err:
+        transcode("in.wav", "out.mp3")
+    assert err.value.reason == "missing"
+
+
+def test_pool_runs_jobs_and_cancels():
+    with TranscodePool(workers=2, threads_per_job=1) as pool:
+        jobs = [pool.submit(f"in{i}.wav", f"out{i}.mp3") for i in range(4)]
+        assert all(job.result().dst == f"out{i}.mp3" for i, job in enumerate(jobs))
+
+        slow = pool.submit("slow.wav", "slow.mp3")
+        time.sleep(0.2)
+        slow.cancel()
+        with pytest.raises(TranscodeError) as err:
+            slow.result()
+        assert err.value.reason == "cancelled"
+
+
+def test_pool_splits_threads_across_workers(monkeypatch):
+    monkeypatch.setattr(cf.os, "cpu_count", lambda: 8)
+    pool = TranscodePool(workers=4)
+    assert pool.threads_per_job == 2
+    pool.shutdown()
@@ -17,7 +17,7 @@ def patch_image_helpers(monkeypatch, tmp_path):
         return str(tmp_path / fn)
     monkeypatch.setattr(pi, 'convert_to_pdf', fake_to_pdf)
     # Stub DOCX conversion to create dummy file
-    def fake_to_docx(path):
+    def fake_to_docx(path, text=None):
         fn = 'output.docx'
         open(fn, 'wb').close()
         return str(tmp_path / fn)
@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+from core.jobs import JobManager
+from core.runner import PLUGINS, Action, register_plugin, run_actions
+
+gate = threading.Event()
+
+
+@register_plugin("_jobs_test")
+def _jobs_plugin(payload: dict):
+    actions = [
+        Action("first", lambda d, p: "a"),
+        Action("second", lambda d, p: gate.wait(5) and p["first"] + "b", ("first",), "out"),
+    ]
+    return run_actions(actions, payload["actions"], payload)
+
+
+@register_plugin("_jobs_fail")
+def _fail_plugin(payload: dict):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def jobs():
+    gate.clear()
+    manager = JobManager(workers=2)
+    yield manager
+    gate.set()
+    manager.shutdown()
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_job_runs_in_background_and_reports_progress(jobs):
+    job = jobs.get(jobs.submit("_jobs_test", {"actions": ["second"]}))
+    # 앞 액션이 끝나고 뒤 액션에서 막혀 있는 동안에도 submit은 이미 돌아왔다
+    deadline = time.monotonic() + 5
+    while job.done_steps < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.running and (job.step, job.done_steps, job.total_steps) == ("first", 1, 2)
+    assert job.progress == 0.5
+    gate.set()
+    _wait(job)
+    assert job.status == "done" and job.outputs == {"out": "ab"} and job.progress == 1.0
+
+
+def test_failed_job_keeps_error(jobs):
+    job = jobs.get(jobs.submit("_jobs_fail", {}))
+    _wait(job)
+    assert job.status == "failed" and job.error == "boom"
+    assert jobs.get("missing") is None and jobs.get(None) is None
+
+
+def test_finished_jobs_are_forgotten_first():
+    gate.set()
+    manager = JobManager(workers=1, max_jobs=2)
+    ids = [manager.submit("_jobs_fail", {}) for _ in range(2)]
+    for job_id in ids:
+        _wait(manager.get(job_id))
+    newest = manager.submit("_jobs_fail", {})
+    manager.shutdown()
+    assert manager.get(ids[0]) is None and manager.get(ids[1]) and manager.get(newest)
+
+
+def test_transcript_job_records_segments(jobs, monkeypatch):
+    import core.transcribe
+    from core.schemas import TranscriptSegment
+
+    def fake_stream(path):
+        yield TranscriptSegment(start=0.0, end=1.0, text="hello")
+        gate.wait(5)
+        yield TranscriptSegment(start=61.0, end=62.0, text="world")
+    monkeypatch.setattr(core.transcribe, "stream_transcript", fake_stream)
+    job = jobs.get(jobs.submit_transcript("clip.mp3"))
+    deadline = time.monotonic() + 5
+    while not job.segments and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # 전사가 끝나기 전에도 나온 세그먼트는 바로 보인다
+    assert job.running and job.transcript() == "[00:00.00] hello"
+    gate.set()
+    _wait(job)
+    assert job.status == "done"
+    assert job.outputs == {"transcript": "[00:00.00] hello\n[01:01.00] world"}
+
+
+def teardown_module():
+    PLUGINS.pop("_jobs_test", None)
+    PLUGINS.pop("_jobs_fail", None)
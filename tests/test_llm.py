@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from core.llm import LLMGateway, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_reserve_and_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)   # 초당 1개
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    clock.now = 3.0
+    assert bucket.reserve(1) == 0.0
+    bucket.adjust(-10)                       # 환급
+    assert bucket.reserve(11) == 0.0
+
+
+def test_sync_chat_and_metrics(openai_stub):
+    openai_stub.reply = lambda prompt: "  pong  "
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url)
+    assert gateway.chat([{"role": "user", "content": "ping"}]) == "pong"
+    stats = gateway.stats()
+    assert stats["calls"] == 1 and stats["errors"] == 0
+    assert stats["prompt_tokens"] == 4 and stats["completion_tokens"] == 8
+
+
+def test_metrics_are_bounded(monkeypatch):
+    import core.llm
+    monkeypatch.setattr(core.llm, "METRICS_KEPT", 3)
+    gateway = LLMGateway(api_key="test")
+    for i in range(5):
+        gateway._record("m", 0.0, None, 0, retries=1, ok=i != 0)
+    assert len(gateway.metrics()) == 3
+    stats = gateway.stats()
+    assert (stats["calls"], stats["errors"], stats["retries"]) == (5, 1, 5)
+
+
+def test_retries_429_with_backoff(openai_stub):
+    openai_stub.statuses = [429, 429]
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, base_delay=0.01)
+    assert gateway.chat([{"role": "user", "content": "hi"}]) == "summary of 2 chars"
+    assert gateway.metrics()[0].retries == 2
+
+
+def test_gives_up_after_max_retries(openai_stub):
+    import openai
+    openai_stub.statuses = [429] * 5
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, max_retries=2, base_delay=0.01)
+    with pytest.raises(openai.RateLimitError):
+        gateway.chat([{"role": "user", "content": "hi"}])
+    assert gateway.stats()["errors"] == 1
+
+
+def test_retries_reserve_tpm_once_and_failures_refund(openai_stub):
+    import openai
+    openai_stub.statuses = [429, 429, 429]
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, tpm=10000, base_delay=0.01)
+    gateway.tokens = TokenBucket(10000, clock=FakeClock())   # 테스트 중 다시 채워지지 않게
+    gateway.chat([{"role": "user", "content": "hi"}])
+    # 재시도 세 번에도 실제 사용량(2 + 18 토큰)만 빠진다
+    assert gateway.tokens.reserve(0) == 0.0
+    assert gateway.tokens._tokens == 10000 - 20
+
+    openai_stub.statuses = [429] * 5
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, tpm=10000, max_retries=2, base_delay=0.01)
+    gateway.tokens = TokenBucket(10000, clock=FakeClock())
+    with pytest.raises(openai.RateLimitError):
+        gateway.chat([{"role": "user", "content": "hi"}])
+    gateway.tokens.reserve(0)
+    assert gateway.tokens._tokens == 10000
+
+
+def test_non_retryable_error_is_raised_immediately(openai_stub):
+    import openai
+    openai_stub.statuses = [400]
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, base_delay=0.01)
+    with pytest.raises(openai.BadRequestError):
+        gateway.chat([{"role": "user", "content": "hi"}])
+    assert gateway.metrics()[0].retries == 0
+
+
+def test_async_chat_shares_limiter(openai_stub):
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, rpm=600)
+
+    async def run():
+        return await asyncio.gather(*[gateway.achat([{"role": "user", "content": str(i)}]) for i in range(5)])
+
+    assert len(asyncio.run(run())) == 5
+    assert gateway.stats()["calls"] == 5
+
+
+def test_rpm_limit_spaces_out_calls(openai_stub):
+    clock_waits = []
+    gateway = LLMGateway(api_key="test", base_url=openai_stub.base_url, rpm=2)
+    for _ in range(3):
+        clock_waits.append(gateway._reserve(1))
+    assert clock_waits[:2] == [0.0, 0.0]
+    assert clock_waits[2] == pytest.approx(30.0, rel=0.01)
@@ -0,0 +1,60 @@
+import json
+import stat
+import sys
+import numpy as np
+import pytest
+import core.media as cm
+import core.transcribe as ct
+import plugins.video as pv
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch, tmp_path):
+    # 인자를 기록하고, .mp3 출력이 있으면 만들고, stdout에 1초 분량 PCM을 쓰는 가짜 ffmpeg
+    log = tmp_path / "calls.jsonl"
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        f"open({str(log)!r}, 'a').write(json.dumps(sys.argv[1:]) + '\\n')\n"
+        "for a in sys.argv[1:]:\n"
+        "    if a.endswith('.mp3'):\n"
+        "        open(a, 'wb').write(b'mp3')\n"
+        "if sys.argv[-1] == '-':\n"
+        "    sys.stdout.buffer.write(b'\\x01\\x00' * 16000)\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(cm, "FFMPEG", str(script))
+    monkeypatch.setattr(ct, "FFMPEG", str(script))
+    monkeypatch.chdir(tmp_path)
+    return lambda: [json.loads(l) for l in log.read_text().splitlines()]
+
+
+def test_demux_writes_file_and_pcm_in_one_process(fake_ffmpeg, tmp_path):
+    out, windows = cm.demux_audio("clip.mp4", "mp3")
+    assert out == str(tmp_path / "clip.mp3")
+    pcm = list(windows)
+    assert [(w.dtype, len(w)) for w in pcm] == [(np.float32, 16000)]
+    assert (tmp_path / "clip.mp3").read_bytes() == b"mp3"
+    calls = fake_ffmpeg()
+    assert len(calls) == 1
+    args = calls[0]
+    assert args.count("-i") == 1 and "-vn" in args
+    assert args[args.index("-ar") + 1] == "16000"
+
+
+def test_audio_only_skips_pcm(fake_ffmpeg):
+    out, pcm = cm.demux_audio("clip.mp4", "mp3", pcm=False)
+    assert pcm is None and out.endswith("clip.mp3")
+    assert fake_ffmpeg()[0][-1] != "-"
+
+
+def test_video_plugin_decodes_once(fake_ffmpeg, monkeypatch):
+    seen = []
+    monkeypatch.setattr(pv, "transcribe", lambda source: seen.append(list(source)) or "transcript")
+    monkeypatch.setattr(pv, "summarize_text", lambda text, length: "summary")
+    result = pv.video_plugin({"input_path": "clip.mp4", "actions": ["audio", "summary"]})
+    assert result.outputs["audio"].endswith("clip.mp3")
+    assert result.outputs["summary"] == "summary"
+    assert len(fake_ffmpeg()) == 1
+    assert [len(w) for w in seen[0]] == [16000]   # PCM은 윈도 단위로 흘려보낸다
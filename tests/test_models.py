@@ -0,0 +1,89 @@
+import threading
+import time
+import pytest
+from core.models import ModelKey, ModelRegistry
+import core.models as cm
+
+
+def make_registry(budget=None, delay=0.0):
+    calls = []
+    def loader(key):
+        calls.append(key)
+        time.sleep(delay)
+        return f"model-{key.name}"
+    registry = ModelRegistry(loader, budget_bytes=budget, sizeof=lambda m: 100)
+    return registry, calls
+
+
+def test_same_key_loads_once():
+    registry, calls = make_registry()
+    key = ModelKey("base", "cpu", "fp32")
+    for _ in range(500):
+        assert registry.get(key) == "model-base"
+    assert len(calls) == 1
+
+
+def test_concurrent_get_loads_once():
+    registry, calls = make_registry(delay=0.05)
+    key = ModelKey("base", "cpu", "fp32")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get(key))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["model-base"] * 8
+    assert len(calls) == 1
+
+
+def test_lru_eviction_under_budget():
+    registry, calls = make_registry(budget=250)
+    a = ModelKey("tiny", "cpu", "fp32")
+    b = ModelKey("base", "cpu", "fp32")
+    c = ModelKey("small", "cpu", "fp32")
+    registry.get(a)
+    registry.get(b)
+    registry.get(a)          # a becomes most recently used
+    registry.get(c)          # evicts b
+    assert registry.keys() == [a, c]
+    assert registry.evictions == 1
+    registry.get(b)
+    assert calls.count(b) == 2
+
+
+def test_whisper_model_uses_shared_registry(monkeypatch):
+    registry, calls = make_registry()
+    monkeypatch.setattr(cm, "_whisper_registry", registry)
+    with cm.whisper_model("base", device="cpu") as (model, fp16):
+        pass
+    with cm.whisper_model("base", device="cpu") as (model2, _):
+        pass
+    assert model is model2
+    assert fp16 is False
+    assert calls == [ModelKey("base", "cpu", "fp32")]
+
+
+def test_use_serializes_calls_on_one_model():
+    registry, _ = make_registry()
+    key = ModelKey("base", "cpu", "fp32")
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def infer():
+        with registry.use(key):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=infer) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 1
+    # 다른 모델은 잠금과 무관하다
+    with registry.use(key), registry.use(ModelKey("small", "cpu", "fp32")) as other:
+        assert other == "model-small"
@@ -0,0 +1,156 @@
+import os
+import numpy as np
+from PIL import Image
+from typer.testing import CliRunner
+from core.ocr import BandReader, OcrPool, merge_band_texts, ocr_file, ocr_tiled, text_bands
+
+
+class CountingEngine:
+    created = 0
+
+    def __init__(self, lang):
+        CountingEngine.created += 1
+        self.lang = lang
+
+    def recognize(self, image):
+        values = set(np.unique(np.asarray(image)).tolist())
+        assert values <= {0, 255}  # 이진화된 이미지가 들어온다
+        return f"{os.getpid()}:{CountingEngine.created}:{self.lang}"
+
+
+def _images(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"receipt{i}.png"
+        Image.fromarray(np.random.default_rng(i).integers(0, 255, (20, 40), dtype=np.uint8)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_ocr_file_reports_timing(tmp_path):
+    result = ocr_file(_images(tmp_path, 1)[0], CountingEngine("eng"))
+    assert result.text.endswith(":eng") and result.seconds >= 0 and result.error is None
+
+
+def test_pool_loads_engine_once_per_worker(tmp_path):
+    paths = _images(tmp_path, 12)
+    with OcrPool(workers=2, lang="kor", factory=CountingEngine) as pool:
+        results = list(pool.map(paths))
+    assert sorted(r.path for r in results) == sorted(paths)
+    engines = {}
+    for r in results:
+        pid, created, lang = r.text.split(":")
+        engines.setdefault(pid, set()).add(created)
+        assert lang == "kor"
+    assert all(len(counts) == 1 for counts in engines.values())  # 워커당 엔진 하나
+
+
+def test_pool_applies_back_pressure(tmp_path):
+    paths = _images(tmp_path, 8)
+    results = []
+    gaps = []
+
+    def source():
+        for path in paths:
+            gaps.append(len(gaps) + 1 - len(results))
+            yield path
+
+    with OcrPool(workers=1, max_pending=2, factory=CountingEngine) as pool:
+        for result in pool.map(source()):
+            results.append(result)
+    assert len(results) == 8
+    assert max(gaps) <= 3  # 제출된 2개 + 제출을 기다리는 1개
+
+
+def test_pool_reports_bad_inputs(tmp_path):
+    bad = tmp_path / "broken.png"
+    bad.write_bytes(b"not an image")
+    with OcrPool(workers=1, factory=CountingEngine) as pool:
+        (result,) = list(pool.map([str(bad)]))
+    assert result.text == "" and "Cannot read image" in result.error
+
+
+def test_cli_ocr_streams_results(tmp_path, monkeypatch):
+    import core.ocr
+    from cli import app
+
+    monkeypatch.setattr(core.ocr, "make_engine", CountingEngine)
+    _images(tmp_path, 3)
+    result = CliRunner().invoke(app, ["ocr", "--source", str(tmp_path), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    assert len(lines) == 3
+
+
+class BarEngine:
+    """검은 가로 막대 하나를 '한 줄'로 읽는 가짜 엔진: 막대 폭으로 줄을 구분한다."""
+
+    def recognize(self, image):
+        rows = np.asarray(image) == 0
+        lines, inside = [], False
+        for row in rows:
+            if row.any() and not inside:
+                lines.append(f"line{row.sum() // 10}")
+            inside = row.any()
+        return "\n".join(lines)
+
+
+def _page(tmp_path, bars, height):
+    img = np.full((height, 600), 255, np.uint8)
+    for top, thick, width in bars:
+        img[top:top + thick, 20:20 + width] = 0
+    path = tmp_path / "page.png"
+    Image.fromarray(img).save(path)
+    return str(path)
+
+
+def test_text_bands_cut_at_blank_rows_or_overlap():
+    ink = np.zeros(100, int)
+    ink[10:20] = ink[45:55] = 5
+    assert text_bands(ink, max_height=40) == [(0, 39), (39, 78)]
+    ink[20:100] = 5  # 빈 행이 없으면 겹쳐서 자른다
+    assert text_bands(ink, max_height=40, overlap=8) == [(0, 47), (39, 86), (78, 100)]
+
+
+def test_tiled_ocr_reads_every_line_once_in_order(tmp_path):
+    bars = [(40 + 60 * i, 20, 100 + 10 * i) for i in range(30)]
+    bars.append((1900, 150, 250))  # 띠 경계를 가로지르는 큰 글자
+    path = _page(tmp_path, bars, 2200)
+    text = ocr_tiled(path, tile_px=300, workers=4, engine_for_thread=BarEngine)
+    expected = [f"line{10 + i}" for i in range(30)] + ["line25"]
+    assert text.splitlines() == expected
+
+
+def test_striped_tiff_is_decoded_band_by_band(tmp_path, monkeypatch):
+    bars = [(40 + 60 * i, 20, 100 + 10 * i) for i in range(30)]
+    png = _page(tmp_path, bars, 2200)
+    tif = str(tmp_path / "page.tif")
+    Image.open(png).save(tif, tiffinfo={278: 64})   # 64행 스트립, 비압축
+    reader = BandReader(tif)
+    assert reader.striped
+    full = np.asarray(Image.open(png))
+    assert np.array_equal(reader.rows(100, 230), full[100:230])
+
+    decoded = []
+    real = Image.Image.convert
+    monkeypatch.setattr(Image.Image, "convert", lambda self, *a, **k: decoded.append(self.size[1]) or real(self, *a, **k))
+    text = ocr_tiled(tif, tile_px=300, workers=2, engine_for_thread=BarEngine)
+    assert text.splitlines() == [f"line{10 + i}" for i in range(30)]
+    # 한 번에 디코딩하는 높이는 띠(+ 스트립 하나) 크기를 넘지 않는다
+    assert decoded and max(decoded) <= 300 + 2 * 64
+
+
+def test_tiled_ocr_preprocesses_each_band(tmp_path, monkeypatch):
+    import core.preprocess as cp
+    calls = []
+    real = cp.preprocess
+    monkeypatch.setattr(cp, "preprocess", lambda gray, *a: calls.append(gray.shape[0]) or real(gray, *a))
+    path = _page(tmp_path, [(40 + 60 * i, 20, 100) for i in range(30)], 2200)
+    ocr_tiled(path, tile_px=300, workers=2, engine_for_thread=BarEngine)
+    assert len(calls) >= 6 and max(calls) <= 300 + 64
+
+
+def test_merge_band_texts_dedupes_fuzzy_overlap():
+    merged = merge_band_texts(["a\nthe quick brown fox jumps", "the quick brovvn fox jumps\nnext"])
+    assert merged == "a\nthe quick brown fox jumps\nnext"
+    assert merge_band_texts(["합계 12", "합계 13"]) == "합계 12\n합계 13"
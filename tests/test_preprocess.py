@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+import pytest
+from core.preprocess import (
+    PreprocessConfig, crop_margins, denoise, estimate_dpi, otsu, preprocess, rotate, skew_angle,
+)
+
+
+def _page(glyph=30, height=1200, width=900):
+    """glyph 높이의 '글자' 블록이 줄지어 있는 가짜 문서 (300 dpi에서 glyph=30)."""
+    img = np.full((height, width), 255, np.uint8)
+    for top in range(100, height - 100, glyph * 2):
+        for left in range(100, width - 100, glyph):
+            img[top:top + glyph, left:left + glyph * 2 // 3] = 0
+    return img
+
+
+def _skewed(img, angle):
+    h, w = img.shape
+    return cv2.warpAffine(img, cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0), (w, h), borderValue=255)
+
+
+@pytest.mark.parametrize("angle", [-3.0, 1.5, 4.0])
+def test_skew_is_detected_and_undone(angle):
+    skewed = _skewed(_page(), angle)
+    found = skew_angle(otsu(skewed))
+    assert found == pytest.approx(angle, abs=0.3)
+    assert abs(skew_angle(otsu(rotate(skewed, found)))) <= 0.25
+
+
+def test_dpi_estimate_from_glyph_height():
+    assert estimate_dpi(otsu(_page(glyph=15))) == pytest.approx(150, rel=0.1)
+    assert estimate_dpi(np.full((100, 100), 255, np.uint8)) is None
+
+
+def test_low_resolution_scan_is_upscaled():
+    binary, report = preprocess(_page(glyph=15, height=600, width=450), PreprocessConfig(stages=("rescale",)))
+    assert report["dpi"] == pytest.approx(150, rel=0.1)
+    assert binary.shape == (1200, 900)
+    assert set(np.unique(binary)) <= {0, 255}
+
+
+def test_crop_and_denoise():
+    page = np.full((400, 400), 255, np.uint8)
+    page[100:150, 200:260] = 0
+    gray, binary = crop_margins(page, otsu(page), margin=5)
+    assert gray.shape == binary.shape == (60, 70)
+
+    clean = _page(height=300, width=300)
+    assert denoise(clean, 6.0) is clean
+    noisy = clean.copy()
+    specks = np.random.default_rng(0).random(noisy.shape) < 0.1
+    noisy[specks] = 255 - noisy[specks]
+    assert np.count_nonzero(denoise(noisy, 6.0) != clean) < np.count_nonzero(noisy != clean) / 5
+
+
+def test_stages_follow_config(monkeypatch):
+    monkeypatch.setenv("OCR_PREPROCESS", "deskew,crop,bogus")
+    config = PreprocessConfig.from_env()
+    assert config.stages == ("deskew", "crop")
+    _, report = preprocess(_skewed(_page(), 2.0), config)
+    assert set(report) == {"deskew_ms", "skew", "crop_ms"}
@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import time
+import pytest
+from core.runner import SPECS, Action, run_actions, run_plugin
+
+
+def _modules_after(code: str) -> set[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print('\\n'.join(sys.modules))"],
+        capture_output=True, text=True, check=True,
+    )
+    return set(out.stdout.split())
+
+
+def test_cli_import_does_not_load_plugins():
+    modules = _modules_after("import cli")
+    for heavy in ["plugins.youtube", "plugins.image", "torch", "whisper", "cv2", "moviepy", "yt_dlp", "openai"]:
+        assert heavy not in modules
+
+
+def test_load_plugin_imports_only_requested_module():
+    modules = _modules_after("from core.runner import load_plugin; load_plugin('text')")
+    assert "plugins.text" in modules
+    assert "plugins.youtube" not in modules
+    assert "torch" not in modules
+
+
+def test_builtin_plugins_declared():
+    assert set(SPECS) == {"youtube", "video", "audio", "image", "text"}
+    assert SPECS["image"].actions == ("ocr", "to-pdf", "to-docx", "convert", "fan-out")
+
+
+def test_unknown_plugin():
+    result = run_plugin("nope", {})
+    assert not result.success
+    assert "No plugin" in result.outputs["error"]
+
+
+def _slow(value):
+    def fn(data, products):
+        time.sleep(0.3)
+        return value
+    return fn
+
+
+def test_run_actions_runs_independent_actions_concurrently():
+    actions = [Action(name, _slow(name.upper()), output=name) for name in ("a", "b", "c")]
+    start = time.monotonic()
+    result = run_actions(actions, ["c", "a", "b"], None)
+    assert time.monotonic() - start < 0.8
+    assert list(result.outputs.items()) == [("c", "C"), ("a", "A"), ("b", "B")]
+
+
+def test_run_actions_shares_dependency_results():
+    calls = []
+    def ocr(data, products):
+        calls.append("ocr")
+        return f"text of {data}"
+    actions = [
+        Action("ocr", ocr, output="text"),
+        Action("docx", lambda d, p: p["ocr"] + ".docx", ("ocr",), "docx"),
+    ]
+    # 요청하지 않은 ocr은 한 번만 실행되고 outputs에는 나오지 않는다
+    assert run_actions(actions, ["docx"], "img").outputs == {"docx": "text of img.docx"}
+    assert calls == ["ocr"]
+
+
+def test_run_actions_propagates_errors():
+    def boom(data, products):
+        raise RuntimeError("boom")
+    actions = [Action("ok", _slow(1), output="ok"), Action("bad", boom, output="bad")]
+    with pytest.raises(RuntimeError, match="boom"):
+        run_actions(actions, ["ok", "bad"], None)
+
+
+def test_run_actions_error_does_not_wait_for_siblings():
+    def boom(data, products):
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+    actions = [Action("slow", lambda d, p: time.sleep(2), output="slow"), Action("bad", boom, output="bad")]
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="boom"):
+        run_actions(actions, ["slow", "bad"], None)
+    assert time.monotonic() - start < 1.0
+
+
+def test_run_actions_rejects_cycles():
+    actions = [Action("a", _slow(1), ("b",)), Action("b", _slow(2), ("a",))]
+    with pytest.raises(ValueError):
+        run_actions(actions, ["a"], None)
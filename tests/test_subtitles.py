@@ -0,0 +1,147 @@
+import pytest
+import plugins.youtube as py
+from core.subtitles import choose_track, dedupe_rolling, parse_cues, pick_file
+
+# YouTube 자동 자막 형태: 단어별 타이밍 태그 + 앞 줄을 다시 보여주는 롤링 큐
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+NOTE generated
+by YouTube
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> world</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+hello world
+
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+hello world
+this<00:00:02.500><c> is</c><00:00:03.000><c> a test</c>
+
+00:00:04.000 --> 00:00:06.000
+this is a test
+this is a test &amp; more
+"""
+
+# 실제 YouTube 자동 자막(.en.vtt)에서 잘라 온 부분: 각 큐의 첫 줄 또는 둘째 줄이 공백 한 칸이다
+AUTO_VTT = (
+    "WEBVTT\n"
+    "Kind: captions\n"
+    "Language: en\n"
+    "\n"
+    "00:00:00.160 --> 00:00:02.869 align:start position:0%\n"
+    " \n"
+    "so<00:00:00.480><c> today</c><00:00:00.799><c> we're</c><00:00:01.040><c> going</c><00:00:01.199><c> to</c>\n"
+    "\n"
+    "00:00:02.869 --> 00:00:02.879 align:start position:0%\n"
+    "so today we're going to\n"
+    " \n"
+    "\n"
+    "00:00:02.879 --> 00:00:05.150 align:start position:0%\n"
+    "so today we're going to\n"
+    "talk<00:00:03.199><c> about</c><00:00:03.439><c> caching</c>\n"
+)
+
+SRT = """1
+00:00:01,000 --> 00:00:02,500
+<i>First</i> line
+
+2
+00:01:02,000 --> 00:01:03,000
+Second
+line
+"""
+
+
+def test_rolling_captions_are_collapsed():
+    cues = list(parse_cues(ROLLING_VTT.splitlines(keepends=True)))
+    assert cues[0].text == "hello world"
+    assert cues[2].start == 2.01
+    assert list(dedupe_rolling(cues)) == ["hello world", "this is a test", "& more"]
+
+
+def test_auto_captions_with_blank_space_lines():
+    cues = list(parse_cues(AUTO_VTT.splitlines(keepends=True)))
+    assert [c.start for c in cues] == pytest.approx([0.16, 2.869, 2.879])
+    assert cues[0].text == "so today we're going to"
+    assert list(dedupe_rolling(cues)) == ["so today we're going to", "talk about caching"]
+
+
+def test_srt_is_parsed():
+    cues = list(parse_cues(SRT.splitlines()))
+    assert [(c.start, c.end, c.text) for c in cues] == [
+        (1.0, 2.5, "First line"),
+        (62.0, 63.0, "Second\nline"),
+    ]
+
+
+def test_choose_track_prefers_manual_then_original_auto():
+    info = {
+        "language": "ja",
+        "subtitles": {"live_chat": [], "en-US": [], "de": []},
+        "automatic_captions": {"ko": [], "ja-orig": []},
+    }
+    assert choose_track(info, ("ko", "en")) == ("en-US", False)
+    info["subtitles"] = {}
+    assert choose_track(info, ("ko", "en")) == ("ja-orig", True)
+    assert choose_track({"automatic_captions": {"fr": [], "en": []}}, ("ko", "en")) == ("en", True)
+    assert choose_track({}, ("ko",)) is None
+
+
+def test_pick_file_by_language():
+    files = ["v.de.vtt", "v.en.vtt", "v.ko.vtt"]
+    assert pick_file(files, ("ko", "en")) == ("ko", "v.ko.vtt")
+    assert pick_file(["v.de.vtt"], ("ko",)) == ("de", "v.de.vtt")
+
+
+class SubtitleYDL:
+    requests = []
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def extract_info(self, url, download):
+        SubtitleYDL.requests.append("probe")
+        return {"id": "abcdefghijk", "formats": [{"format_id": "18"}], "language": "en",
+                "subtitles": {}, "automatic_captions": {"en": [], "de": []}}
+
+    def process_ie_result(self, info, download):
+        SubtitleYDL.requests.append(tuple(self.opts["subtitleslangs"]))
+        with open(f"{self.opts['paths']['home']}/abcdefghijk.en.vtt", "w", encoding="utf-8") as f:
+            f.write(ROLLING_VTT)
+        return info
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def youtube_env(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("UC_YT_STORE", str(tmp_path / "store"))
+    monkeypatch.setattr(py, "YoutubeDL", SubtitleYDL)
+    SubtitleYDL.requests = []
+
+
+def test_transcript_is_indexed_and_ignores_stray_files(youtube_env, tmp_path):
+    (tmp_path / "other.en.vtt").write_text("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nunrelated\n")
+    url = "https://www.youtube.com/watch?v=abcdefghijk"
+    assert py.get_transcript(url) == "hello world this is a test & more"
+    assert SubtitleYDL.requests == ["probe", ("en",)]
+    # 두 번째 요청은 조회/다운로드/파싱 없이 저장된 결과를 쓴다
+    assert py.get_transcript(url) == "hello world this is a test & more"
+    assert len(SubtitleYDL.requests) == 2
+
+
+def test_leftover_subtitles_in_cwd_are_not_used(youtube_env, tmp_path, monkeypatch):
+    # 이전 실행이 현재 폴더에 남긴 같은 영상의 자막은 "자막 없음"보다 우선하면 안 된다
+    (tmp_path / "abcdefghijk.en.vtt").write_text(ROLLING_VTT, encoding="utf-8")
+    monkeypatch.setattr(SubtitleYDL, "process_ie_result", lambda self, info, download: info)
+    info = {"id": "abcdefghijk", "subtitles": {}, "automatic_captions": {"en": []}, "language": "en"}
+    assert py._fetch_subtitles("https://www.youtube.com/watch?v=abcdefghijk", info) is None
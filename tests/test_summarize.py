@@ -0,0 +1,56 @@
+import time
+import pytest
+from core.llm import LLMGateway
+from core.summarize import summarize
+from core.textsplit import chunk_text, estimate_tokens, split_sentences
+
+
+@pytest.fixture
+def gateway(openai_stub):
+    return LLMGateway(api_key="test", base_url=openai_stub.base_url)
+
+
+def test_split_sentences_on_sentence_and_segment_boundaries():
+    text = "첫 문장입니다. Second one!\n세 번째 세그먼트\n\nFourth? yes"
+    assert list(split_sentences(text)) == ["첫 문장입니다.", "Second one!", "세 번째 세그먼트", "Fourth?", "yes"]
+
+
+def test_chunks_respect_token_budget():
+    text = " ".join(f"Sentence number {i} is here." for i in range(200)) + " " + "가" * 500
+    chunks = chunk_text(text, 100)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 100 for c in chunks)
+    assert chunks[0].startswith("Sentence number 0")
+
+
+def test_short_text_is_single_request(gateway, openai_stub):
+    summarize("짧은 글입니다.", "short", "아래 내용을 요약해 주세요.", gateway=gateway)
+    assert len(openai_stub.prompts) == 1
+    assert openai_stub.prompts[0].startswith("아래 내용을 요약해 주세요.\n길이: 짧게\n\n짧은 글")
+
+
+def test_map_reduce_runs_chunks_concurrently(gateway, openai_stub):
+    openai_stub.delay = 0.3
+    openai_stub.reply = lambda prompt: "partial."
+    text = " ".join(f"Line {i} of a very long transcript." for i in range(400))
+    start = time.perf_counter()
+    result = summarize(text, "detailed", "아래 비디오 대본을 요약해 주세요.", gateway=gateway,
+                       max_chunk_tokens=500, concurrency=8)
+    elapsed = time.perf_counter() - start
+    map_calls = [p for p in openai_stub.prompts if p.startswith("아래는 긴 글의 일부")]
+    assert len(map_calls) >= 8
+    assert openai_stub.max_in_flight <= 8
+    # 순차 실행이었다면 (map 호출 수 + 1) * 0.3초 이상 걸린다
+    assert elapsed < (len(map_calls) + 1) * 0.3 / 2
+    final = openai_stub.prompts[-1]
+    assert final.startswith("아래 비디오 대본을 요약해 주세요.\n길이: 상세하게")
+    assert result == "partial."
+
+
+def test_hierarchical_reduce(gateway, openai_stub):
+    # 부분 요약이 길어서 한 번에 합칠 수 없으면 한 단계 더 줄인다
+    openai_stub.reply = lambda prompt: "word " * 30 if "Item" in prompt else "ok."
+    text = " ".join(f"Item {i} says something." for i in range(300))
+    summarize(text, "short", "요약해 주세요.", gateway=gateway, max_chunk_tokens=120, concurrency=4)
+    levels = {p.split(")")[0].split("/")[1] for p in openai_stub.prompts if p.startswith("아래는 긴 글의 일부")}
+    assert len(levels) >= 2
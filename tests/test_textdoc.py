@@ -0,0 +1,74 @@
+import pytest
+from core.textdoc import TextDocument, detect_encoding
+from core.textsplit import iter_sentences
+
+KO = "첫 줄입니다. 두 번째 문장!\n둘째 줄\f폼 피드 뒤\n마지막"
+
+
+@pytest.mark.parametrize("encoding,expected", [
+    ("utf-8", "utf-8"),
+    ("utf-8-sig", "utf-8-sig"),
+    ("cp949", "cp949"),
+    ("euc-kr", "cp949"),
+    ("utf-16", "utf-16"),
+    ("utf-16-le", "utf-16-le"),
+    ("utf-16-be", "utf-16-be"),
+])
+def test_encodings_are_detected_and_decoded(tmp_path, encoding, expected):
+    path = tmp_path / "doc.txt"
+    text = "Hello " + KO if encoding.startswith("utf-16") else KO
+    path.write_bytes(text.encode(encoding))
+    doc = TextDocument(str(path))
+    assert doc.encoding == expected
+    assert doc.read() == text
+
+
+def test_truncated_sample_still_counts_as_utf8():
+    data = ("가" * 100).encode("utf-8")
+    assert detect_encoding(data[:-1]) == "utf-8"
+
+
+@pytest.mark.parametrize("text", [
+    "서울특별시 강남구 테헤란로 123번지 4층",
+    "가나다라마바사아자차카타파하",
+    "한국어 문서입니다\n둘째 줄",
+])
+def test_pure_hangul_cp949_is_not_read_as_utf16(text):
+    # NUL 바이트가 없으니 UTF-16으로도 깨끗이 디코딩되지만 CP949여야 한다
+    assert detect_encoding(text.encode("cp949")) == "cp949"
+
+
+def test_lines_split_only_on_newline_across_chunks(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text(KO * 50, encoding="cp949")
+    doc = TextDocument(str(path))
+    lines = list(doc.lines())
+    assert "".join(lines) == KO * 50
+    assert lines[1] == "둘째 줄\f폼 피드 뒤\n"
+    # 작은 청크(멀티바이트 글자가 경계에서 잘림)로 읽어도 같은 내용
+    assert "".join(doc.iter_text(chunk_bytes=7)) == KO * 50
+
+
+def test_sentences_stream_across_pieces():
+    pieces = ["첫 문장. 둘", "째 문장! 셋째", "\n넷째."]
+    assert list(iter_sentences(pieces)) == ["첫 문장.", "둘째 문장!", "셋째", "넷째."]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    doc = TextDocument(str(path))
+    assert doc.encoding == "utf-8"
+    assert list(doc.lines()) == [] and list(doc.sentences()) == []
+
+
+def test_plugin_opens_document_once(tmp_path, monkeypatch):
+    import plugins.text as pt
+    path = tmp_path / "doc.txt"
+    path.write_text(KO, encoding="cp949")
+    seen = []
+    monkeypatch.setattr(pt, "summarize_text_from_file", lambda doc, length: seen.append(doc) or "s")
+    monkeypatch.setattr(pt, "text_to_pdf", lambda doc: seen.append(doc) or "p")
+    result = pt.text_plugin({"input_path": str(path), "actions": ["summarize", "to-pdf"]})
+    assert result.outputs == {"summary": "s", "pdf": "p"}
+    assert len(seen) == 2 and seen[0] is seen[1] and isinstance(seen[0], TextDocument)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PIL import Image
+from core.fonts import find_font, glyph_cache
+from core.textimage import render_text_pages
+
+
+@pytest.fixture(scope="module")
+def font_path():
+    try:
+        return find_font()
+    except RuntimeError:
+        pytest.skip("no font installed")
+
+
+def _ink_rows(path):
+    dark = np.asarray(Image.open(path)) < 128
+    return np.flatnonzero(dark.any(axis=1))
+
+
+def test_pages_have_fixed_size_and_order(tmp_path, font_path):
+    _, _, line_height = glyph_cache(font_path, 16)
+    page = (400, 40 + 10 * line_height)          # 여백 20px, 쪽마다 10줄
+    lines = [f"line {i}\n" for i in range(25)]
+    paths = render_text_pages(lines, str(tmp_path / "notes"), font_path, page=page, margin=20, workers=2)
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["notes_001.png", "notes_002.png", "notes_003.png"]
+    assert all(Image.open(p).size == page for p in paths)
+    # 마지막 쪽은 5줄만 그려진다
+    assert _ink_rows(paths[2]).max() < 20 + 5 * line_height < _ink_rows(paths[0]).max()
+
+
+def test_each_glyph_is_measured_once(tmp_path, font_path, monkeypatch):
+    glyphs, _, _ = glyph_cache(font_path, 16)
+    glyphs.clear()
+    glyphs.glyphs.clear()
+    measured = []
+    real = type(glyphs.font).getlength
+    monkeypatch.setattr(type(glyphs.font), "getlength", lambda self, text, *a, **k: measured.append(text) or real(self, text, *a, **k))
+    render_text_pages(["abcabc " * 40] * 200, str(tmp_path / "t"), font_path)
+    assert sorted(measured) == sorted(set("abc "))
+
+
+def test_long_lines_wrap_inside_page(tmp_path, font_path):
+    paths = render_text_pages(["word " * 200], str(tmp_path / "w"), font_path, page=(300, 1000), margin=20)
+    dark = np.asarray(Image.open(paths[0])) < 128
+    cols = np.flatnonzero(dark.any(axis=0))
+    assert cols.min() >= 20 and cols.max() < 280
+    assert len(paths) == 1
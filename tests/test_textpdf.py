@@ -0,0 +1,60 @@
+import pypdfium2 as pdfium
+import pytest
+from core.fonts import find_font, load_metrics
+from core.textpdf import clean, render_text_pdf, wrap
+
+
+@pytest.fixture(scope="module")
+def font():
+    try:
+        return load_metrics(find_font(truetype_only=True))
+    except RuntimeError:
+        pytest.skip("no TrueType font installed")
+
+
+def _text(path):
+    doc = pdfium.PdfDocument(path)
+    try:
+        return [doc[i].get_textpage().get_text_range() for i in range(len(doc))]
+    finally:
+        doc.close()
+
+
+def test_find_font_honours_override(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEXT_FONT", str(tmp_path / "missing.ttf"))
+    with pytest.raises(RuntimeError):
+        find_font()
+    (tmp_path / "mine.ttf").write_bytes(b"")
+    monkeypatch.setenv("TEXT_FONT", str(tmp_path / "mine.ttf"))
+    assert find_font(truetype_only=True) == str(tmp_path / "mine.ttf")
+
+
+def test_metrics_are_parsed_once(font):
+    assert load_metrics(font.path) is font
+    assert font.widths[ord("W")] > font.widths[ord("i")] > 0
+
+
+def test_wrap_breaks_at_spaces_within_limit(font):
+    limit = sum(font.widths[ord(c)] for c in "word " * 5)
+    line = "word " * 12 + "x" * 200
+    parts = list(wrap(line, font.widths, limit))
+    assert "".join(parts).replace(" ", "") == line.replace(" ", "")
+    assert all(sum(font.widths[ord(c)] for c in p) <= limit for p in parts)
+    assert parts[0] == "word word word word word"
+    assert list(wrap("short", font.widths, limit)) == ["short"]
+
+
+def test_clean_drops_controls_and_astral():
+    assert clean("a\tb\x01c\U0001f600\r\n") == "a   bc\ufffd"
+
+
+def test_render_streams_pages(tmp_path, font):
+    lines = (f"line {i}\n" for i in range(200))
+    stats = render_text_pdf(lines, str(tmp_path / "out.pdf"), font.path)
+    pages = _text(str(tmp_path / "out.pdf"))
+    assert stats["pages"] == len(pages) == 4       # A4, 10pt: 58줄/쪽
+    assert pages[0].split()[:4] == ["line", "0", "line", "1"]
+    assert "line 199" in pages[-1]
+
+    stats = render_text_pdf([], str(tmp_path / "empty.pdf"), font.path)
+    assert stats["pages"] == 1 and _text(str(tmp_path / "empty.pdf")) == [""]
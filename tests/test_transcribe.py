@@ -0,0 +1,79 @@
+import asyncio
+import stat
+import sys
+from contextlib import contextmanager
+import numpy as np
+import pytest
+import core.transcribe as ct
+from core.transcribe import SAMPLE_RATE
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+    def transcribe(self, audio, fp16, initial_prompt=None):
+        self.calls.append((len(audio), initial_prompt))
+        n = len(self.calls)
+        return {
+            "text": f"window {n}",
+            "segments": [{"start": 0.0, "end": 1.5, "text": f" window {n} a"},
+                         {"start": 1.5, "end": 2.0, "text": f" window {n} b "}],
+        }
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    @contextmanager
+    def whisper_model(name):
+        yield model, False
+    monkeypatch.setattr(ct, "whisper_model", whisper_model)
+    return model
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch, tmp_path):
+    # 실제 ffmpeg 대신 2.5초 분량의 16 kHz s16le 무음을 stdout으로 쓰는 스크립트
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"sys.stdout.buffer.write(b'\\x00\\x00' * {int(SAMPLE_RATE * 2.5)})\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(ct, "FFMPEG", str(script))
+    return script
+
+
+def test_pcm_windows_are_fixed_size(fake_ffmpeg):
+    windows = list(ct.pcm_windows("input.mp3", window_seconds=1.0))
+    assert [len(w) for w in windows] == [SAMPLE_RATE, SAMPLE_RATE, SAMPLE_RATE // 2]
+    assert windows[0].dtype == np.float32
+
+
+def test_segments_are_offset_and_streamed(fake_ffmpeg, fake_model):
+    it = ct.stream_transcript("input.mp3", window_seconds=1.0)
+    first = next(it)
+    # 첫 세그먼트가 나올 때는 첫 윈도만 전사된 상태
+    assert len(fake_model.calls) == 1
+    assert (first.start, first.end, first.text) == (0.0, 1.5, "window 1 a")
+    rest = list(it)
+    assert [s.start for s in rest] == [1.5, 1.0, 2.5, 2.0, 3.5]
+    assert rest[-1].text == "window 3 b"
+    # 이전 윈도 텍스트가 다음 윈도의 prompt로 넘어간다
+    assert [c[1] for c in fake_model.calls] == [None, "window 1", "window 2"]
+
+
+def test_async_iterator(fake_ffmpeg, fake_model):
+    async def collect():
+        return [s async for s in ct.astream_transcript("input.mp3", window_seconds=1.0)]
+    assert len(asyncio.run(collect())) == 6
+
+
+def test_transcribe_joins_segments(fake_ffmpeg, fake_model):
+    assert ct.transcribe("input.mp3").startswith("window 1 a window 1 b")
+
+
+def test_format_timestamp():
+    assert ct.format_timestamp(65.5) == "01:05.50"
+    assert ct.format_timestamp(3725.0) == "01:02:05.00"
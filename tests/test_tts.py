@@ -0,0 +1,96 @@
+import os
+import stat
+import sys
+import threading
+import pytest
+import core.ffmpeg as cf
+from core.textsplit import split_sentences
+from core.tts import chunk_text, make_backend, prune, synthesize
+
+# concat 목록 파일의 조각들을 이어 붙이고, 받은 인자를 기록하는 가짜 ffmpeg
+FAKE_FFMPEG = """
+import sys
+args = sys.argv[1:]
+open(sys.argv[0] + ".args", "w").write(" ".join(args))
+listing, dst = args[args.index("-i") + 1], args[-1]
+with open(dst, "wb") as out:
+    for line in open(listing, encoding="utf-8"):
+        out.write(open(line.strip()[6:-1], "rb").read())
+print("progress=end", flush=True)
+"""
+
+
+class FakeBackend:
+    name = "fake"
+    ext = "mp3"
+
+    def __init__(self, lang="ko"):
+        self.lang = lang
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def synthesize(self, text, out):
+        with self.lock:
+            self.calls.append(text)
+        with open(out, "wb") as f:
+            f.write(f"[{text}]".encode())
+
+
+@pytest.fixture
+def ffmpeg(monkeypatch, tmp_path):
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_FFMPEG)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(cf, "FFMPEG", str(script))
+    return str(script) + ".args"
+
+
+def test_split_and_chunk():
+    text = "첫 문장입니다. 두 번째 문장! 정말?\n\n다음 문단 " + "길게, " * 30
+    assert list(split_sentences(text))[:3] == ["첫 문장입니다.", "두 번째 문장!", "정말?"]
+    chunks = chunk_text(text, max_chars=50)
+    assert all(len(c) <= 50 for c in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "").replace("\n", "")
+
+
+def test_chunks_are_cached_per_sentence(tmp_path, ffmpeg):
+    backend = FakeBackend()
+    out = str(tmp_path / "out.mp3")
+    stats = synthesize("하나. 둘. 셋. 둘.", out, backend=backend, cache_dir=str(tmp_path / "cache"))
+    assert stats["chunks"] == 4 and stats["synthesized"] == 3
+    assert open(out, "rb").read().decode() == "[하나.][둘.][셋.][둘.]"
+    assert "-f concat -safe 0 -i" in open(ffmpeg).read() and "-c copy" in open(ffmpeg).read()
+
+    # 문장 하나만 고치면 그 문장만 다시 합성한다
+    backend.calls.clear()
+    stats = synthesize("하나. 둘! 셋. 둘.", out, backend=backend, cache_dir=str(tmp_path / "cache"))
+    assert backend.calls == ["둘!"] and stats["synthesized"] == 1
+    assert open(out, "rb").read().decode() == "[하나.][둘!][셋.][둘.]"
+
+
+def test_other_format_is_encoded_once(tmp_path, ffmpeg):
+    synthesize("하나. 둘.", str(tmp_path / "out.wav"), "wav", backend=FakeBackend(), cache_dir=str(tmp_path / "c"))
+    assert "-c copy" not in open(ffmpeg).read()
+
+
+def test_mp3_frames_are_joined_without_ffmpeg(tmp_path, monkeypatch):
+    monkeypatch.setattr(cf, "FFMPEG", str(tmp_path / "no-ffmpeg"))
+    out = str(tmp_path / "out.mp3")
+    synthesize("a. b.", out, backend=FakeBackend(), cache_dir=str(tmp_path / "c"))
+    assert open(out, "rb").read() == b"[a.][b.]"
+    with pytest.raises(cf.TranscodeError):
+        synthesize("a. b.", str(tmp_path / "out.wav"), "wav", backend=FakeBackend(), cache_dir=str(tmp_path / "c"))
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    for i, name in enumerate(["old", "mid", "new"]):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (i, i))
+    prune(str(tmp_path), 20)
+    assert sorted(os.listdir(tmp_path)) == ["mid", "new"]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        make_backend("nope")
@@ -1,5 +1,6 @@
 import os
 import pytest
+import numpy as np
 from plugins.video import video_plugin
 from core.schemas import ExecutionResult
 
@@ -23,6 +24,10 @@ def patch_video_helpers(monkeypatch, tmp_path):
         open(fn, 'wb').close()
         return str(tmp_path / fn)
     monkeypatch.setattr(pv, 'extract_audio', fake_extract_audio)
+    # stub demux_audio (single decode used when summary is requested)
+    def fake_demux_audio(path, fmt=None, pcm=True):
+        return (fake_extract_audio(path, fmt) if fmt else None), np.zeros(16000, dtype=np.int16)
+    monkeypatch.setattr(pv, 'demux_audio', fake_demux_audio)
     # stub get_transcript to return fixed text
     monkeypatch.setattr(pv, 'get_transcript', lambda path: "dummy transcript")
     # stub summarize_text to return fixed summary
@@ -12,11 +12,12 @@ class DummyYDL:
     def __init__(self, opts):
         self.opts = opts
     def extract_info(self, url, download):
-        # Simulate extraction by creating a dummy file
+        # Simulate a download into the directory yt-dlp was told to use (paths.home)
         video_id = 'test123'
-        filename = f"{video_id}.mp4"
-        with open(filename, 'wb') as f:
-            f.write(b"dummy video content")
+        if download:
+            filename = os.path.join(self.opts['paths']['home'], f"{video_id}.mp4")
+            with open(filename, 'wb') as f:
+                f.write(b"dummy video content")
         return {'id': video_id}
     def __enter__(self):
         return self
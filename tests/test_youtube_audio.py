@@ -10,9 +10,10 @@ class DummyYDL:
         # Simulate extraction by creating a dummy audio file
         audio_id = 'audio123'
         ext = self.opts.get('postprocessors', [{}])[0].get('preferredcodec', 'mp3')
-        filename = f"{audio_id}.{ext}"
-        with open(filename, 'wb') as f:
-            f.write(b"dummy audio content")
+        if download:
+            filename = os.path.join(self.opts['paths']['home'], f"{audio_id}.{ext}")
+            with open(filename, 'wb') as f:
+                f.write(b"dummy audio content")
         return {'id': audio_id}
 
     def __enter__(self):
@@ -0,0 +1,82 @@
+import json
+import pytest
+import plugins.youtube as py
+from core.ytinfo import is_collection_url
+
+IDS = [f"video{i:06d}" for i in range(5)]
+
+
+class PlaylistYDL:
+    pulled = []
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def extract_info(self, url, download, process=True):
+        assert not download and not process
+        if "/@" in url:
+            # 채널 페이지는 videos 탭으로 넘긴다
+            return {"_type": "url", "ie_key": "YoutubeTab", "url": "https://www.youtube.com/playlist?list=PLtab"}
+        return {"_type": "playlist", "id": "PLtab", "entries": self._entries()}
+
+    def _entries(self):
+        for vid in IDS:
+            PlaylistYDL.pulled.append(vid)
+            yield {"_type": "url", "ie_key": "Youtube", "id": vid, "url": f"https://youtu.be/{vid}"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def patch_youtube(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(py, "YoutubeDL", PlaylistYDL)
+    monkeypatch.setattr(py, "download_video", lambda url, q: f"{url[-11:]}.mp4")
+    PlaylistYDL.pulled = []
+
+
+def test_collection_urls():
+    assert is_collection_url("https://www.youtube.com/playlist?list=PL123")
+    assert is_collection_url("https://www.youtube.com/@somechannel/videos")
+    assert not is_collection_url("https://www.youtube.com/watch?v=abcdefghijk&list=PL123")
+
+
+def test_entries_are_enumerated_lazily():
+    entries = py.iter_playlist("https://www.youtube.com/@channel")
+    assert next(entries) == "https://www.youtube.com/watch?v=video000000"
+    assert PlaylistYDL.pulled == ["video000000"]
+
+
+def test_ingest_resumes_from_manifest(monkeypatch, tmp_path):
+    options = {"actions": ["video"], "video_quality": "720p", "audio_format": "mp3", "summary_length": "short"}
+    manifest = tmp_path / "progress.jsonl"
+
+    def flaky(url, q):
+        if url.endswith("video000003"):
+            raise RuntimeError("network down")
+        return f"{url[-11:]}.mp4"
+
+    monkeypatch.setattr(py, "download_video", flaky)
+    url = "https://www.youtube.com/playlist?list=PLtab"
+    first = list(py.ingest_playlist(url, options, str(manifest), workers=0))
+    assert [r["success"] for r in first] == [True, True, True, False, True]
+
+    # 중단되며 잘린 줄이 있어도 이어서 실행된다
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.write('{"index": 9, "succ')
+    monkeypatch.setattr(py, "download_video", lambda url, q: f"{url[-11:]}.mp4")
+    second = list(py.ingest_playlist(url, options, str(manifest), workers=0))
+    assert [r["input"] for r in second] == ["https://www.youtube.com/watch?v=video000003"]
+    assert second[0]["outputs"] == {"video": "video000003.mp4"}
+
+    records = []
+    for line in manifest.read_text().splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            pass
+    assert sum(r["success"] for r in records) == 5
@@ -10,10 +10,11 @@ class DummyYDL:
     def extract_info(self, url, download):
         # Simulate creation of a .vtt subtitle file
         video_id = 'vid123'
-        vtt_filename = f"{video_id}.en.vtt"
-        with open(vtt_filename, 'w', encoding='utf-8') as f:
-            f.write("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n안녕하세요\n\n")
-            f.write("00:00:01.000 --> 00:00:02.000\n테스트입니다\n")
+        if self.opts.get('writesubtitles'):
+            vtt_filename = os.path.join(self.opts['paths']['home'], f"{video_id}.en.vtt")
+            with open(vtt_filename, 'w', encoding='utf-8') as f:
+                f.write("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n안녕하세요\n\n")
+                f.write("00:00:01.000 --> 00:00:02.000\n테스트입니다\n")
         return {'id': video_id}
 
     def __enter__(self):
@@ -0,0 +1,57 @@
+import threading
+import time
+from core.ytinfo import InfoCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_resolve_fetches_once_for_concurrent_callers():
+    cache = InfoCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"id": "vid", "formats": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.resolve("vid", fetch))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(r == {"id": "vid", "formats": []} for r in results)
+
+
+def test_ttl_and_invalidate():
+    clock = Clock()
+    cache = InfoCache(ttl=60, clock=clock)
+    cache.put("vid", {"id": "vid"})
+    assert cache.get("vid") == {"id": "vid"}
+    clock.now += 61
+    assert cache.get("vid") is None
+    cache.put("vid", {"id": "vid"})
+    cache.invalidate("vid")
+    assert cache.get("vid") is None
+
+
+def test_disk_copy_is_shared_between_instances(tmp_path):
+    InfoCache(tmp_path).put("vid", {"id": "vid", "title": "제목"})
+    assert InfoCache(tmp_path).get("vid") == {"id": "vid", "title": "제목"}
+
+
+def test_unknown_id_is_remembered_by_alias():
+    cache = InfoCache()
+    calls = []
+    fetch = lambda: calls.append(1) or {"id": "vid"}
+    cache.resolve(None, fetch, alias="https://example.com/v/1")
+    cache.resolve(None, fetch, alias="https://example.com/v/1")
+    assert cache.resolve("vid", fetch) == {"id": "vid"}
+    assert len(calls) == 1